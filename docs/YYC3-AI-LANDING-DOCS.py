@@ -13,12 +13,21 @@
 
 import os
 import re
+import sys
 import json
+import posixpath
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from urllib.parse import unquote
+
+# 剖析模块与闭环脚本工具放在一起
+sys.path.insert(0, str(Path(__file__).resolve().parent / "YYC3-CP-文档闭环" / "YYC3-Cater-脚本工具"))
+
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args
 
 
 @dataclass
@@ -46,14 +55,86 @@ class ModuleInfo:
     completed_docs: int = 0
 
 
+class DocumentPathIndex:
+    """文档路径索引：一次性建立规范化相对路径和全部路径后缀的映射，只有索引中找不到的引用才访问文件系统"""
+    
+    def __init__(self, docs_path: Path, document_paths):
+        self.docs_path = Path(docs_path)
+        self.paths: Dict[str, str] = {}  # 相对 docs 目录的规范化路径 -> document_map 中的键
+        self.suffixes: Dict[str, Set[str]] = defaultdict(set)  # 路径后缀（按目录层级）-> 文档键
+        
+        for doc_key in document_paths:
+            relative = self.relative_path(doc_key)
+            self.paths[relative] = doc_key
+            parts = relative.split("/")
+            for i in range(len(parts)):
+                self.suffixes["/".join(parts[i:])].add(doc_key)
+    
+    def relative_path(self, file_path) -> str:
+        """文件相对 docs 目录的规范化路径"""
+        path = Path(file_path)
+        try:
+            path = path.relative_to(self.docs_path)
+        except ValueError:
+            pass
+        return posixpath.normpath(path.as_posix())
+    
+    def _target(self, reference: str) -> Optional[str]:
+        """去掉锚点和查询参数后的引用路径（外部链接返回None）"""
+        target = unquote(reference.split("#", 1)[0].split("?", 1)[0].strip())
+        if not target or re.match(r'^[a-zA-Z][a-zA-Z0-9+.-]*:', target):
+            return None
+        return target
+    
+    def resolve(self, source: str, reference: str) -> Optional[str]:
+        """
+        解析文档 source 中的引用，返回被引用的文档键（无法解析时为None）
+        
+        按引用所在文档的目录解析，再按 docs 目录解析；不在索引中的路径再检查文件系统
+        """
+        target = self._target(reference)
+        if target is None:
+            return None
+        
+        if target.startswith("/"):
+            candidates = [posixpath.normpath(target.lstrip("/"))]
+        else:
+            source_dir = posixpath.dirname(self.relative_path(source))
+            candidates = [posixpath.normpath(posixpath.join(source_dir, target)),
+                          posixpath.normpath(target)]
+        for candidate in candidates:
+            if candidate in self.paths:
+                return self.paths[candidate]
+        for candidate in candidates:
+            if not candidate.startswith("../") and (self.docs_path / candidate).is_file():
+                return str(self.docs_path / candidate)
+        return None
+    
+    def match_suffix(self, reference: str) -> Optional[str]:
+        """
+        按路径后缀唯一匹配被引用的文档（只用于孤立文档判断，不用于校验引用）
+        
+        去掉开头的 ../ 和 ./ 后匹配，匹配到多个文档时返回None
+        """
+        target = self._target(reference)
+        if target is None:
+            return None
+        suffix = "/".join(part for part in posixpath.normpath(target).split("/") if part not in ("..", ".", ""))
+        matches = self.suffixes.get(suffix, ())
+        return next(iter(matches)) if len(matches) == 1 else None
+
+
 class YYC3DocumentLanding:
     """YYC³文档闭环主处理器"""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, max_workers: Optional[int] = None):
         self.base_path = Path(base_path)
         self.docs_path = self.base_path / "docs"
+        # 读取文档的线程数：文档在网络共享盘上时，单个文件的读取延迟远大于解析耗时
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
         self.modules = []
         self.document_map = {}
+        self.readme_paths = set()  # README 不参与分析，但可以被其他文档引用
         self.reference_graph = defaultdict(set)
         
         # 项目实际信息
@@ -214,6 +295,7 @@ class YYC3DocumentLanding:
             }
         }
     
+    @profiled("scan_documents")
     def scan_documents(self) -> List[ModuleInfo]:
         """扫描所有文档"""
         print("=" * 80)
@@ -222,29 +304,59 @@ class YYC3DocumentLanding:
         print(f"文档根目录: {self.docs_path}")
         print()
         
-        for module_name in self.core_modules:
-            module_path = self.docs_path / module_name
-            
-            if not module_path.exists():
-                print(f"⚠ 模块不存在: {module_name}")
-                continue
-            
-            module_info = self.scan_module(module_path, module_name)
-            self.modules.append(module_info)
+        # 所有模块的文档先一起提交到线程池读取，再按模块顺序收集结果，
+        # 前面的模块汇总输出时后面模块的文件仍在读取
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = []
+            for module_name in self.core_modules:
+                module_path = self.docs_path / module_name
+                if not module_path.exists():
+                    pending.append((module_name, module_path, None))
+                    continue
+                pending.append((module_name, module_path, self.submit_module(executor, module_path, module_name)))
             
-            self.print_module_summary(module_info)
+            for module_name, module_path, futures in pending:
+                if futures is None:
+                    print(f"⚠ 模块不存在: {module_name}")
+                    continue
+                
+                module_info = self.collect_module(module_path, module_name, futures)
+                self.modules.append(module_info)
+                
+                self.print_module_summary(module_info)
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
         
         return self.modules
     
     def scan_module(self, module_path: Path, module_name: str) -> ModuleInfo:
         """扫描单个模块"""
-        module_info = ModuleInfo(name=module_name, path=module_path)
-        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return self.collect_module(module_path, module_name,
+                                       self.submit_module(executor, module_path, module_name))
+    
+    def submit_module(self, executor: ThreadPoolExecutor, module_path: Path,
+                      module_name: str) -> List[Tuple[Path, Future]]:
+        """把模块中的文档提交到线程池分析（按目录遍历顺序）"""
+        futures = []
         for md_file in module_path.glob("*.md"):
             if md_file.name == "README.md":
+                self.readme_paths.add(str(md_file))
                 continue
             
-            doc_info = self.analyze_document(md_file, module_name)
+            futures.append((md_file, executor.submit(self.analyze_document_profiled, md_file, module_name)))
+        return futures
+    
+    def collect_module(self, module_path: Path, module_name: str,
+                       futures: List[Tuple[Path, Future]]) -> ModuleInfo:
+        """按提交顺序收集文档分析结果，每个文档完成后即加入模块"""
+        module_info = ModuleInfo(name=module_name, path=module_path)
+        
+        for md_file, future in futures:
+            doc_info = future.result()
             module_info.documents.append(doc_info)
             self.document_map[str(md_file)] = doc_info
         
@@ -255,6 +367,11 @@ class YYC3DocumentLanding:
         
         return module_info
     
+    def analyze_document_profiled(self, file_path: Path, category: str) -> DocumentInfo:
+        """分析单个文档（剖析时按文档计时）"""
+        with document(file_path):
+            return self.analyze_document(file_path, category)
+    
     def analyze_document(self, file_path: Path, category: str) -> DocumentInfo:
         """分析单个文档"""
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -331,6 +448,7 @@ class YYC3DocumentLanding:
         print(f"   模板文档: {module_info.template_docs}")
         print()
     
+    @profiled("fill_placeholders")
     def fill_placeholders(self) -> Dict[str, int]:
         """填充预留文档位"""
         print("=" * 80)
@@ -451,6 +569,7 @@ class YYC3DocumentLanding:
         
         return header + body + footer
     
+    @profiled("build_reference_graph")
     def build_reference_graph(self):
         """构建文档引用关系图"""
         print("=" * 80)
@@ -466,6 +585,7 @@ class YYC3DocumentLanding:
         print(f"✓ 已构建引用关系图，包含 {len(self.reference_graph)} 个文档的引用信息")
         print()
     
+    @profiled("validate_consistency")
     def validate_consistency(self) -> Dict:
         """验证文档一致性"""
         print("=" * 80)
@@ -480,25 +600,27 @@ class YYC3DocumentLanding:
             "format_inconsistencies": []
         }
         
+        # 引用按所在文档的目录（或 docs 目录）解析，路径索引只建立一次
+        path_index = DocumentPathIndex(self.docs_path, list(self.document_map) + sorted(self.readme_paths))
+        referenced = set()
+        
         # 检查失效引用
         for doc_path, refs in self.reference_graph.items():
             for ref in refs:
-                ref_path = self.docs_path / ref
-                if not ref_path.exists():
+                target = path_index.resolve(doc_path, ref)
+                if target is None:
                     issues["broken_references"].append({
                         "document": doc_path,
                         "reference": ref
                     })
+                    # 失效引用仍可能指向某个文档（路径写错），唯一匹配时不把该文档算作孤立
+                    target = path_index.match_suffix(ref)
+                if target is not None:
+                    referenced.add(target)
         
         # 检查孤立文档
-        all_referenced = set()
-        for refs in self.reference_graph.values():
-            all_referenced.update(refs)
-        
         for doc_path in self.document_map.keys():
-            if doc_path not in self.reference_graph and not any(
-                doc_path.endswith(ref) for ref in all_referenced
-            ):
+            if doc_path not in self.reference_graph and doc_path not in referenced:
                 issues["orphan_documents"].append(doc_path)
         
         # 输出结果
@@ -508,6 +630,7 @@ class YYC3DocumentLanding:
         
         return issues
     
+    @profiled("generate_report")
     def generate_report(self) -> str:
         """生成处理报告"""
         report = []
@@ -1158,19 +1281,23 @@ def main():
                        help='仅扫描文档，不进行填充')
     parser.add_argument('--fill-only', action='store_true',
                        help='仅填充预留文档位')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='并发读取文档的线程数（默认 CPU 数 + 4，最多 32）')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
     # 初始化处理器
-    landing = YYC3DocumentLanding(args.base_path)
+    landing = YYC3DocumentLanding(args.base_path, max_workers=args.workers)
     
     # 执行处理
-    if args.scan_only:
-        landing.scan_documents()
-    elif args.fill_only:
-        landing.fill_placeholders()
-    else:
-        landing.run()
+    with profiling_from_args(args):
+        if args.scan_only:
+            landing.scan_documents()
+        elif args.fill_only:
+            landing.fill_placeholders()
+        else:
+            landing.run()
 
 
 if __name__ == "__main__":
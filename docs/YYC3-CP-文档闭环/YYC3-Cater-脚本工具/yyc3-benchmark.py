@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3-benchmark.py
+@description: YYC³文档工具基准测试 - 在固定种子生成的合成语料上测量各工具的耗时、峰值内存和吞吐量，并与基线对比
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from yyc3_synthetic_corpus import (
+    CATEGORIES, CONCEPT_TERMS, DOC_TYPES, SUBJECTS, TECHNOLOGIES, CorpusSpec, ensure_corpus
+)
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_WORK_DIR = SCRIPT_DIR / ".yyc3-cache" / "benchmark"
+
+BASELINE_VERSION = 1
+
+# 子进程输出结果的行前缀
+RESULT_MARKER = "YYC3-BENCHMARK-RESULT "
+
+
+def load_tool(file_name: str):
+    """按文件名加载带连字符的脚本模块"""
+    spec = importlib.util.spec_from_file_location(file_name.replace('-', '_')[:-3], SCRIPT_DIR / file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb() -> float:
+    """当前进程的峰值常驻内存（MB）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以KB为单位，macOS 以字节为单位
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class BenchmarkContext:
+    """单个基准测试的运行环境"""
+
+    def __init__(self, size: int, work_dir: Path, queries: int, warm: bool):
+        self.size = size
+        self.work_dir = work_dir
+        self.corpus_dir = work_dir / f"corpus-{size}"
+        self.graph_dir = work_dir / f"graph-{size}"
+        self.cache_file = work_dir / f"corpus-cache-{size}.sqlite3"
+        self.manifest_file = work_dir / f"quality-manifest-{size}.json"
+        self.link_graph_file = work_dir / f"link-graph-{size}.json"
+        self.queries = queries
+        self.extra: Dict = {}
+
+        if not warm:
+            # 冷启动：每个基准都重新解析文档
+            for path in (self.cache_file, self.manifest_file, self.link_graph_file):
+                if path.exists():
+                    path.unlink()
+
+    def corpus(self):
+        from yyc3_doc_corpus import DocumentCorpus
+        return DocumentCorpus(self.cache_file)
+
+    def latest_graph(self) -> Optional[Path]:
+        graphs = sorted(self.graph_dir.glob("YYC3-文档知识图谱_*.json")) if self.graph_dir.exists() else []
+        return graphs[-1] if graphs else None
+
+    def type_dirs(self) -> List[Path]:
+        return [self.corpus_dir / category / doc_type
+                for category in CATEGORIES for doc_type in DOC_TYPES
+                if (self.corpus_dir / category / doc_type).is_dir()]
+
+
+# ---- 各基准测试：返回处理的条目数 ----
+
+def bench_quality_assessor(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-phase3-quality-assessor.py')
+    assessor = tool.DocumentQualityAssessor(str(ctx.corpus_dir), corpus=ctx.corpus(),
+                                            manifest_file=ctx.manifest_file)
+    return len(assessor.assess_all_documents(ctx.corpus_dir))
+
+
+def bench_knowledge_graph(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-phase3-knowledge-graph.py')
+    builder = tool.DocumentKnowledgeGraphBuilder(str(ctx.corpus_dir), corpus=ctx.corpus())
+    builder.build_graph()
+    for old_graph in ctx.graph_dir.glob("YYC3-文档知识图谱_*") if ctx.graph_dir.exists() else []:
+        old_graph.unlink()
+    ctx.graph_dir.mkdir(parents=True, exist_ok=True)
+    builder.save_graph(ctx.graph_dir)
+    ctx.extra.update(edges=builder.graph.total_edges, concepts=builder.graph.total_concepts)
+    return builder.graph.total_documents
+
+
+def bench_recommender(ctx: BenchmarkContext) -> int:
+    graph_file = ctx.latest_graph()
+    if graph_file is None:
+        raise FileNotFoundError("没有可用的知识图谱，需要先运行 knowledge-graph 基准")
+
+    tool = load_tool('yyc3-phase3-document-recommender.py')
+    start = time.perf_counter()
+    recommender = tool.IntelligentDocumentRecommender(str(graph_file))
+    ctx.extra['load_seconds'] = round(time.perf_counter() - start, 4)
+
+    rng = random.Random(ctx.size)
+    names = [recommender.graph.doc_names[i] for i in
+             rng.sample(range(recommender.num_documents), min(ctx.queries, recommender.num_documents))]
+    categories = list(recommender.graph.categories)
+    queries: List[Callable] = []
+    for index in range(ctx.queries):
+        name = names[index % len(names)] if names else ''
+        kind = index % 5
+        if kind == 0:
+            queries.append(lambda: recommender.search_by_keywords([rng.choice(SUBJECTS), rng.choice(TECHNOLOGIES)]))
+        elif kind == 1:
+            queries.append(lambda: recommender.recommend_by_concepts([rng.choice(CONCEPT_TERMS)]))
+        elif kind == 2:
+            queries.append(lambda name=name: recommender.recommend_by_document(name))
+        elif kind == 3:
+            queries.append(lambda: recommender.recommend_by_category(rng.choice(categories)))
+        else:
+            queries.append(lambda name=name: recommender.hybrid_recommend(
+                f"{rng.choice(SUBJECTS)} {rng.choice(CONCEPT_TERMS)}", tool.UserContext(current_document=name)))
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        query()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    if latencies:
+        ctx.extra['p50_ms'] = round(latencies[len(latencies) // 2] * 1000, 3)
+        ctx.extra['p99_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000, 3)
+    return len(queries)
+
+
+def bench_context_analyzer(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-phase2-context-improvement.py')
+    analyzer = tool.DocumentContextAnalyzer(str(ctx.corpus_dir), corpus=ctx.corpus())
+    analyzer.load_documents()
+
+    paths = sorted(analyzer.documents)
+    sample = random.Random(ctx.size).sample(paths, min(ctx.queries, len(paths)))
+    start = time.perf_counter()
+    for doc_path in sample:
+        analyzer.find_related_documents(doc_path)
+    ctx.extra['related_queries'] = len(sample)
+    ctx.extra['related_seconds'] = round(time.perf_counter() - start, 4)
+    return len(analyzer.documents)
+
+
+def bench_check_content(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-check-document-content.py')
+    auditor = tool.DocumentContentAuditor(str(ctx.corpus_dir), corpus=ctx.corpus())
+    auditor.audit_all_categories()
+    return auditor.stats['total_docs']
+
+
+def bench_check_format(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-check-document-format.py')
+    corpus = ctx.corpus()
+    return sum(tool.check_directory_format(type_dir, corpus)['total'] for type_dir in ctx.type_dirs())
+
+
+def bench_check_context(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-check-document-context.py')
+    auditor = tool.DocumentContextAuditor(str(ctx.corpus_dir), corpus=ctx.corpus(),
+                                          link_cache=ctx.link_graph_file)
+    auditor.audit_all_categories()
+    return auditor.stats['total_docs']
+
+
+def bench_check_name_content(ctx: BenchmarkContext) -> int:
+    tool = load_tool('yyc3-check-document-name-content.py')
+    checker = tool.DocumentNameContentChecker(str(ctx.corpus_dir))
+    return len(checker.check_all_documents())
+
+
+# 按运行顺序排列，recommender 使用 knowledge-graph 保存的图谱
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], int]] = {
+    'quality-assessor': bench_quality_assessor,
+    'knowledge-graph': bench_knowledge_graph,
+    'recommender': bench_recommender,
+    'context-analyzer': bench_context_analyzer,
+    'check-content': bench_check_content,
+    'check-format': bench_check_format,
+    'check-context': bench_check_context,
+    'check-name-content': bench_check_name_content,
+}
+
+
+def run_child(args):
+    """子进程：运行单个基准并输出结果（每个基准独立进程，峰值内存互不影响）"""
+    ctx = BenchmarkContext(args.size, Path(args.work_dir), args.queries, args.warm)
+    result = {"benchmark": args.benchmark, "size": args.size}
+
+    logging.disable(logging.CRITICAL)
+    start_cpu = time.process_time()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            items = BENCHMARKS[args.benchmark](ctx)
+    except Exception as e:
+        result.update(status="error", error=f"{type(e).__name__}: {e}")
+    else:
+        wall = time.perf_counter() - start
+        result.update(
+            status="ok",
+            wall_seconds=round(wall, 4),
+            cpu_seconds=round(time.process_time() - start_cpu, 4),
+            items=items,
+            throughput=round(items / wall, 2) if wall > 0 else None,
+            peak_rss_mb=round(peak_rss_mb(), 1),
+        )
+    result["extra"] = ctx.extra
+    print(RESULT_MARKER + json.dumps(result, ensure_ascii=False))
+
+
+def run_benchmark(benchmark: str, size: int, args) -> Dict:
+    """在子进程中运行单个基准"""
+    command = [
+        sys.executable, str(Path(__file__).resolve()), '_child',
+        '--benchmark', benchmark, '--size', str(size),
+        '--work-dir', str(args.work_dir), '--queries', str(args.queries),
+    ]
+    if args.warm:
+        command.append('--warm')
+
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=args.timeout)
+    except subprocess.TimeoutExpired:
+        return {"benchmark": benchmark, "size": size, "status": "timeout", "timeout_seconds": args.timeout}
+
+    for line in reversed(completed.stdout.splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    return {"benchmark": benchmark, "size": size, "status": "error",
+            "error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "无输出"}
+
+
+def corpus_spec(size: int, args) -> CorpusSpec:
+    return CorpusSpec(num_docs=size, seed=args.seed, link_density=args.link_density,
+                      broken_link_ratio=args.broken_link_ratio)
+
+
+def environment() -> Dict:
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": numpy_version,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    与基线对比，返回回归项说明
+
+    耗时或峰值内存超过基线的 (1 + tolerance) 倍，或基线中成功的基准本次失败，都算作回归
+    """
+    previous = {(r["benchmark"], r["size"]): r for r in baseline.get("results", [])}
+    regressions = []
+
+    print(f"{'基准':<20} {'规模':>8} {'耗时(s)':>10} {'基线(s)':>10} {'变化':>8} {'内存(MB)':>10} {'基线(MB)':>10}")
+    for result in current.get("results", []):
+        key = (result["benchmark"], result["size"])
+        old = previous.get(key)
+        name = f"{result['benchmark']:<20} {result['size']:>8}"
+        if old is None:
+            print(f"{name} {'(基线中无此项)':>20}")
+            continue
+        if result["status"] != "ok" or old["status"] != "ok":
+            print(f"{name} {result['status']:>10} {old['status']:>10}")
+            if old["status"] == "ok":
+                regressions.append(f"{key[0]}@{key[1]}: 基线成功，本次 {result['status']}")
+            continue
+
+        ratio = result["wall_seconds"] / old["wall_seconds"] if old["wall_seconds"] else 1.0
+        memory_ratio = result["peak_rss_mb"] / old["peak_rss_mb"] if old["peak_rss_mb"] else 1.0
+        mark = "✗" if ratio > 1 + tolerance or memory_ratio > 1 + tolerance else "✓"
+        print(f"{name} {result['wall_seconds']:>10.3f} {old['wall_seconds']:>10.3f} {ratio - 1:>+7.1%} "
+              f"{result['peak_rss_mb']:>10.1f} {old['peak_rss_mb']:>10.1f} {mark}")
+        if ratio > 1 + tolerance:
+            regressions.append(f"{key[0]}@{key[1]}: 耗时 {old['wall_seconds']:.3f}s -> {result['wall_seconds']:.3f}s")
+        if memory_ratio > 1 + tolerance:
+            regressions.append(f"{key[0]}@{key[1]}: 峰值内存 {old['peak_rss_mb']:.1f}MB -> {result['peak_rss_mb']:.1f}MB")
+    return regressions
+
+
+def cmd_generate(args):
+    for size in args.sizes:
+        output_dir = Path(args.work_dir) / f"corpus-{size}"
+        start = time.perf_counter()
+        generated = ensure_corpus(corpus_spec(size, args), output_dir)
+        status = f"已生成 ({time.perf_counter() - start:.1f}s)" if generated else "已是最新"
+        print(f"✓ {size} 个文档: {output_dir} {status}")
+
+
+def cmd_run(args):
+    benchmarks = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in benchmarks if name not in BENCHMARKS]
+    if unknown:
+        print(f"✗ 未知的基准: {', '.join(unknown)}（可选: {', '.join(BENCHMARKS)}）")
+        return 2
+    # 保持规定的运行顺序
+    benchmarks = [name for name in BENCHMARKS if name in benchmarks]
+
+    print("=" * 80)
+    print("YYC³ 文档工具基准测试")
+    print("=" * 80)
+    print(f"规模: {', '.join(str(size) for size in args.sizes)}")
+    print(f"基准: {', '.join(benchmarks)}")
+    print(f"工作目录: {args.work_dir}")
+    print("=" * 80)
+
+    report = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now().isoformat(),
+        "environment": environment(),
+        "settings": {"queries": args.queries, "warm": args.warm, "timeout": args.timeout},
+        "corpora": {},
+        "results": [],
+    }
+
+    for size in args.sizes:
+        spec = corpus_spec(size, args)
+        start = time.perf_counter()
+        generated = ensure_corpus(spec, Path(args.work_dir) / f"corpus-{size}")
+        print(f"\n语料 {size} 个文档{'（已生成，%.1fs）' % (time.perf_counter() - start) if generated else ''}")
+        report["corpora"][str(size)] = spec.to_dict()
+
+        for benchmark in benchmarks:
+            result = run_benchmark(benchmark, size, args)
+            report["results"].append(result)
+            if result["status"] == "ok":
+                print(f"  ✓ {benchmark:<20} {result['wall_seconds']:>9.3f}s  {result['throughput']:>10.1f}/s  "
+                      f"{result['peak_rss_mb']:>8.1f}MB")
+            elif result["status"] == "timeout":
+                print(f"  ⚠ {benchmark:<20} 超时（{args.timeout}s）")
+            else:
+                print(f"  ✗ {benchmark:<20} {result.get('error', '')}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n✓ 结果已保存: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        regressions = compare_results(report, baseline, args.tolerance)
+        return report_regressions(regressions)
+    return 0
+
+
+def cmd_compare(args):
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    return report_regressions(compare_results(current, baseline, args.tolerance))
+
+
+def report_regressions(regressions: List[str]) -> int:
+    if regressions:
+        print(f"\n✗ 发现 {len(regressions)} 项回归:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\n✓ 未发现回归")
+    return 0
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='YYC³ 文档工具基准测试')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_corpus_arguments(sub):
+        sub.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                         help='语料规模（文档数）')
+        sub.add_argument('--work-dir', type=str, default=str(DEFAULT_WORK_DIR),
+                         help='语料、缓存和中间结果目录')
+        sub.add_argument('--seed', type=int, default=CorpusSpec.seed, help='语料随机种子')
+        sub.add_argument('--link-density', type=float, default=CorpusSpec.link_density,
+                         help='每个文档平均的文档间链接数')
+        sub.add_argument('--broken-link-ratio', type=float, default=CorpusSpec.broken_link_ratio,
+                         help='失效链接比例')
+
+    generate_parser = subparsers.add_parser('generate', help='只生成合成语料')
+    add_corpus_arguments(generate_parser)
+
+    run_parser = subparsers.add_parser('run', help='生成语料并运行基准测试')
+    add_corpus_arguments(run_parser)
+    run_parser.add_argument('--benchmarks', type=str, nargs='+',
+                            help=f"要运行的基准（默认全部: {', '.join(BENCHMARKS)}）")
+    run_parser.add_argument('--queries', type=int, default=200, help='推荐和相关文档查询次数')
+    run_parser.add_argument('--warm', action='store_true', help='复用文档解析缓存（默认每个基准冷启动）')
+    run_parser.add_argument('--timeout', type=int, default=1800, help='单个基准的超时秒数')
+    run_parser.add_argument('--output', type=str,
+                            default=f"yyc3-benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                            help='结果JSON路径')
+    run_parser.add_argument('--compare', type=str, help='与该基线JSON对比')
+    run_parser.add_argument('--tolerance', type=float, default=0.2, help='允许的相对退化比例')
+
+    compare_parser = subparsers.add_parser('compare', help='对比两次基准测试结果')
+    compare_parser.add_argument('current', type=str, help='本次结果JSON')
+    compare_parser.add_argument('baseline', type=str, help='基线JSON')
+    compare_parser.add_argument('--tolerance', type=float, default=0.2, help='允许的相对退化比例')
+
+    child_parser = subparsers.add_parser('_child')
+    child_parser.add_argument('--benchmark', required=True, choices=list(BENCHMARKS))
+    child_parser.add_argument('--size', type=int, required=True)
+    child_parser.add_argument('--work-dir', type=str, required=True)
+    child_parser.add_argument('--queries', type=int, default=200)
+    child_parser.add_argument('--warm', action='store_true')
+
+    args = parser.parse_args()
+
+    if args.command == 'generate':
+        cmd_generate(args)
+    elif args.command == 'run':
+        sys.exit(cmd_run(args))
+    elif args.command == 'compare':
+        sys.exit(cmd_compare(args))
+    else:
+        run_child(args)
+
+
+if __name__ == "__main__":
+    main()
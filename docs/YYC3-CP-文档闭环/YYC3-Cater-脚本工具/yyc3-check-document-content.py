@@ -16,15 +16,19 @@ YYC³ 文档内容完整性审核脚本
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 
+from yyc3_doc_corpus import DocumentCorpus
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
+
 
 class DocumentContentAuditor:
     """文档内容审核器"""
 
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, corpus: Optional[DocumentCorpus] = None):
         self.base_dir = Path(base_dir)
+        self.corpus = corpus or DocumentCorpus()
         self.issues = []
         self.stats = {
             'total_docs': 0,
@@ -37,9 +41,8 @@ class DocumentContentAuditor:
     def check_document_content(self, file_path: Path) -> Dict:
         """检查单个文档的内容完整性"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                lines = content.split('\n')
+            parsed = self.corpus.get(file_path)
+            content = self.corpus.text(parsed)
         except Exception as e:
             return {
                 'file': file_path,
@@ -48,8 +51,8 @@ class DocumentContentAuditor:
             }
 
         # 检查文档长度
-        total_lines = len(lines)
-        content_lines = len([l for l in lines if l.strip() and not l.strip().startswith('#')])
+        total_lines = parsed.line_count
+        content_lines = parsed.content_lines
 
         issues = []
 
@@ -85,7 +88,7 @@ class DocumentContentAuditor:
             self.stats['missing_sections'] += 1
 
         # 检查是否有代码示例（技术文档）
-        if '```' not in content and ('架构' in file_path.name or '设计' in file_path.name):
+        if not parsed.code_blocks and ('架构' in file_path.name or '设计' in file_path.name):
             issues.append({
                 'type': 'missing_examples',
                 'severity': 'low',
@@ -127,8 +130,10 @@ class DocumentContentAuditor:
             if '审核报告' in md_file.name or md_file.name.startswith('yyc3-') or md_file.name == 'YYC3-文档索引.md':
                 continue
             self.stats['total_docs'] += 1
-            result = self.check_document_content(md_file)
+            with document(md_file):
+                result = self.check_document_content(md_file)
             results.append(result)
+        self.corpus.commit()
         return results
 
     def audit_all_categories(self) -> Dict:
@@ -159,7 +164,9 @@ class DocumentContentAuditor:
             for doc_type in ['架构类', '技巧类']:
                 type_path = category_path / doc_type
                 if type_path.exists():
-                    results = self.audit_directory(type_path)
+                    with stage("audit_directory", directory=str(type_path)) as record:
+                        results = self.audit_directory(type_path)
+                        record.items = len(results)
                     if results:
                         category_results[doc_type] = results
 
@@ -168,6 +175,7 @@ class DocumentContentAuditor:
 
         return all_results
 
+    @profiled("generate_report")
     def generate_report(self, results: Dict) -> str:
         """生成审核报告"""
         report_lines = [
@@ -242,23 +250,30 @@ class DocumentContentAuditor:
 
 def main():
     """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文档内容完整性审核工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     # 文档根目录
     base_dir = Path('/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环')
 
-    # 创建审核器
-    auditor = DocumentContentAuditor(base_dir)
+    with profiling_from_args(args):
+        # 创建审核器
+        auditor = DocumentContentAuditor(base_dir)
 
-    # 执行审核
-    print("开始审核文档内容完整性...")
-    results = auditor.audit_all_categories()
+        # 执行审核
+        print("开始审核文档内容完整性...")
+        results = auditor.audit_all_categories()
 
-    # 生成报告
-    report = auditor.generate_report(results)
+        # 生成报告
+        report = auditor.generate_report(results)
 
-    # 保存报告
-    report_path = base_dir / 'YYC3-文档内容审核报告.md'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+        # 保存报告
+        report_path = base_dir / 'YYC3-文档内容审核报告.md'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
 
     print(f"✅ 审核完成！")
     print(f"📊 总文档数: {auditor.stats['total_docs']}")
@@ -16,21 +16,42 @@ YYC³ 文档间上下文衔接有序性审核脚本
 import os
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Dict, List, Optional, Tuple, Set
 from datetime import datetime
 
+from yyc3_doc_corpus import DocumentCorpus
+from yyc3_link_graph import MISSING_DOCUMENT, ROOT_RELATIVE_LINK, LinkGraph
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
+
 
 class DocumentContextAuditor:
     """文档上下文审核器"""
 
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, corpus: Optional[DocumentCorpus] = None,
+                 link_cache: Optional[Path] = None, rebuild: bool = False):
+        """
+        Args:
+            base_dir: 文档根目录
+            corpus: 文档语料库（解析缓存）
+            link_cache: 链接图缓存文件，默认按根目录保存在 .yyc3-cache 中
+            rebuild: 忽略链接图缓存，重新解析全部文档
+        """
         self.base_dir = Path(base_dir)
+        self.corpus = corpus or DocumentCorpus()
+        self.link_cache = Path(link_cache) if link_cache else LinkGraph.default_cache_file(self.base_dir)
+        self.rebuild = rebuild
+        self.graph: Optional[LinkGraph] = None
+        self.orphans: Set[str] = set()
+        self.unreachable: Set[str] = set()
         self.issues = []
         self.stats = {
             'total_docs': 0,
             'reference_issues': 0,
+            'anchor_issues': 0,
+            'root_relative_links': 0,
             'numbering_gaps': 0,
             'orphan_docs': 0,
+            'unreachable_docs': 0,
             'passed': 0
         }
         self.doc_index = {}  # 文档索引映射
@@ -40,6 +61,46 @@ class DocumentContextAuditor:
         match = re.match(r'^(\d{2,3})-', file_name)
         return int(match.group(1)) if match else 0
 
+    def is_entry_document(self, rel_path: str) -> bool:
+        """入口文档：根目录下的文档、索引文档和README"""
+        name = Path(rel_path).name
+        return '/' not in rel_path or '索引' in name or 'README' in name
+
+    def collect_link_documents(self) -> List[Path]:
+        """链接图覆盖的文档：根目录下全部Markdown文件（跳过隐藏目录）"""
+        files = []
+        for root, dirs, names in os.walk(self.base_dir):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            files.extend(Path(root) / name for name in sorted(names) if name.endswith('.md'))
+        return files
+
+    def build_link_graph(self) -> LinkGraph:
+        """
+        建立（或增量更新）整个目录树的链接图
+
+        失效链接、孤立文档和不可达文档都由这一张图得出；有缓存时只重新解析变化的文件，
+        只重新校验链接指向变化文件的文档。
+        """
+        if self.graph is not None:
+            return self.graph
+
+        with stage("build_link_graph", directory=str(self.base_dir)) as record:
+            if self.rebuild:
+                graph = LinkGraph(self.base_dir, self.corpus)
+            else:
+                graph = LinkGraph.load(self.base_dir, self.link_cache, self.corpus)
+            graph.refresh(self.collect_link_documents())
+            if graph.modified:
+                graph.save(self.link_cache)
+            record.items = len(graph.nodes)
+
+        entries = [path for path in graph.nodes if self.is_entry_document(path)]
+        self.orphans = {path for path in graph.orphans() if not self.is_entry_document(path)}
+        # 孤立文档单独报告，不可达只报告有引用但入口文档到不了的文档；没有入口文档时不检查
+        self.unreachable = graph.unreachable(entries) - self.orphans if entries else set()
+        self.graph = graph
+        return graph
+
     def check_numbering_sequence(self, files: List[Path]) -> List[Dict]:
         """检查文档编号的连续性"""
         issues = []
@@ -69,56 +130,59 @@ class DocumentContextAuditor:
 
         return issues
 
-    def check_document_references(self, file_path: Path, all_docs: Set[str]) -> List[Dict]:
-        """检查文档中的引用是否有效"""
+    def check_document_references(self, file_path: Path) -> List[Dict]:
+        """检查文档中的引用是否有效（按相对路径解析，并校验 #锚点）"""
         issues = []
+        graph = self.build_link_graph()
 
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            return [{
-                'type': 'read_error',
-                'severity': 'high',
-                'message': f'无法读取文件: {e}'
-            }]
-
-        # 查找文档引用（Markdown链接格式）
-        # 格式: [文本](../目录/文件名.md) 或 [文本](文件名.md)
-        ref_pattern = r'\[([^\]]+)\]\(([^)]+\.md)\)'
-        references = re.findall(ref_pattern, content)
-
-        for text, ref_path in references:
-            # 提取引用的文件名
-            ref_file_name = Path(ref_path).name
-
-            # 检查引用的文件是否存在
-            if ref_file_name not in all_docs:
+        for problem in graph.broken_links(graph.relative(file_path)):
+            if problem.kind == MISSING_DOCUMENT:
                 issues.append({
                     'type': 'invalid_reference',
                     'severity': 'high',
-                    'message': f'无效的文档引用: [{text}]({ref_path})',
-                    'reference': ref_file_name
+                    'message': f'无效的文档引用: [{problem.text}]({problem.target}) (第{problem.line}行)',
+                    'reference': problem.target
                 })
                 self.stats['reference_issues'] += 1
+            elif problem.kind == ROOT_RELATIVE_LINK:
+                issues.append({
+                    'type': 'root_relative_link',
+                    'severity': 'low',
+                    'message': f'链接按文档根目录书写，应相对所在文档: [{problem.text}]({problem.target}) (第{problem.line}行)',
+                    'reference': problem.target
+                })
+                self.stats['root_relative_links'] += 1
+            else:
+                issues.append({
+                    'type': 'invalid_anchor',
+                    'severity': 'medium',
+                    'message': f'锚点不存在: [{problem.text}]({problem.target}) (第{problem.line}行)',
+                    'reference': problem.target
+                })
+                self.stats['anchor_issues'] += 1
 
         return issues
 
-    def check_orphan_documents(self, file_path: Path, all_references: Dict[str, List[str]]) -> List[Dict]:
-        """检查孤立文档（没有被其他文档引用）"""
+    def check_orphan_documents(self, file_path: Path) -> List[Dict]:
+        """检查孤立文档（没有被其他文档引用）和从入口文档不可达的文档"""
         issues = []
-        file_name = file_path.name
-
-        # 如果文档没有被任何其他文档引用，标记为孤立文档
-        if file_name not in all_references or len(all_references[file_name]) == 0:
-            # 排除索引文档和根目录文档
-            if '索引' not in file_name and 'README' not in file_name:
-                issues.append({
-                    'type': 'orphan_document',
-                    'severity': 'low',
-                    'message': '文档没有被其他文档引用，可能需要添加相关链接'
-                })
-                self.stats['orphan_docs'] += 1
+        rel_path = self.build_link_graph().relative(file_path)
+
+        # 孤立文档已排除索引文档和根目录文档
+        if rel_path in self.orphans:
+            issues.append({
+                'type': 'orphan_document',
+                'severity': 'low',
+                'message': '文档没有被其他文档引用，可能需要添加相关链接'
+            })
+            self.stats['orphan_docs'] += 1
+        elif rel_path in self.unreachable:
+            issues.append({
+                'type': 'unreachable_document',
+                'severity': 'low',
+                'message': '文档只被孤立的文档引用，从索引文档沿链接无法到达'
+            })
+            self.stats['unreachable_docs'] += 1
 
         return issues
 
@@ -142,38 +206,15 @@ class DocumentContextAuditor:
         # 检查编号连续性
         numbering_issues = self.check_numbering_sequence(files)
 
-        # 构建文档集合
-        all_doc_names = {f.name for f in files}
-
-        # 收集所有文档引用
-        all_references = {}
         for file_path in files:
-            all_references[file_path.name] = []
+            with document(file_path):
+                file_issues = []
 
-        # 检查每个文档的引用
-        for file_path in files:
-            file_issues = []
-
-            # 检查文档引用
-            ref_issues = self.check_document_references(file_path, all_doc_names)
-            file_issues.extend(ref_issues)
-
-            # 记录引用关系
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                ref_pattern = r'\[([^\]]+)\]\(([^)]+\.md)\)'
-                references = re.findall(ref_pattern, content)
-                for text, ref_path in references:
-                    ref_file_name = Path(ref_path).name
-                    if ref_file_name in all_doc_names:
-                        all_references[ref_file_name].append(file_path.name)
-            except:
-                pass
-
-            # 检查是否为孤立文档
-            orphan_issues = self.check_orphan_documents(file_path, all_references)
-            file_issues.extend(orphan_issues)
+                # 检查文档引用
+                file_issues.extend(self.check_document_references(file_path))
+
+                # 检查是否为孤立文档
+                file_issues.extend(self.check_orphan_documents(file_path))
 
             # 检查编号问题
             file_issues.extend(numbering_issues)
@@ -219,7 +260,9 @@ class DocumentContextAuditor:
             for doc_type in ['架构类', '技巧类']:
                 type_path = category_path / doc_type
                 if type_path.exists():
-                    results = self.audit_directory(type_path)
+                    with stage("audit_directory", directory=str(type_path)) as record:
+                        results = self.audit_directory(type_path)
+                        record.items = len(results)
                     if results:
                         category_results[doc_type] = results
 
@@ -228,6 +271,7 @@ class DocumentContextAuditor:
 
         return all_results
 
+    @profiled("generate_report")
     def generate_report(self, results: Dict) -> str:
         """生成审核报告"""
         report_lines = [
@@ -238,8 +282,11 @@ class DocumentContextAuditor:
             "## 📊 审核统计\n",
             f"- **总文档数**: {self.stats['total_docs']}",
             f"- **引用问题**: {self.stats['reference_issues']}",
+            f"- **锚点问题**: {self.stats['anchor_issues']}",
+            f"- **根目录相对链接**: {self.stats['root_relative_links']}",
             f"- **编号断层**: {self.stats['numbering_gaps']}",
             f"- **孤立文档**: {self.stats['orphan_docs']}",
+            f"- **不可达文档**: {self.stats['unreachable_docs']}",
             f"- **通过审核**: {self.stats['passed']}",
             f"- **通过率**: {(self.stats['passed'] / self.stats['total_docs'] * 100):.1f}%" if self.stats['total_docs'] > 0 else "- **通过率**: 0%",
             "",
@@ -275,6 +322,7 @@ class DocumentContextAuditor:
             "1. **修复无效引用**\n",
             "   - 检查所有文档引用，确保引用的文件存在\n",
             "   - 更新或删除无效的文档链接\n",
+            "   - 标题改名后同步更新指向它的 #锚点\n",
             "   - 使用相对路径引用文档\n",
             "",
             "### 中优先级（P1）\n",
@@ -312,23 +360,32 @@ class DocumentContextAuditor:
 
 def main():
     """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文档间上下文衔接有序性审核工具')
+    parser.add_argument('--rebuild', action='store_true', help='忽略链接图缓存，重新解析全部文档')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     # 文档根目录
     base_dir = Path('/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环')
 
-    # 创建审核器
-    auditor = DocumentContextAuditor(base_dir)
+    with profiling_from_args(args):
+        # 创建审核器
+        auditor = DocumentContextAuditor(base_dir, rebuild=args.rebuild)
 
-    # 执行审核
-    print("开始审核文档间上下文衔接有序性...")
-    results = auditor.audit_all_categories()
+        # 执行审核
+        print("开始审核文档间上下文衔接有序性...")
+        results = auditor.audit_all_categories()
 
-    # 生成报告
-    report = auditor.generate_report(results)
+        # 生成报告
+        report = auditor.generate_report(results)
 
-    # 保存报告
-    report_path = base_dir / 'YYC3-文档上下文审核报告.md'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+        # 保存报告
+        report_path = base_dir / 'YYC3-文档上下文审核报告.md'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
+        auditor.corpus.close()
 
     print(f"✅ 审核完成！")
     print(f"📊 总文档数: {auditor.stats['total_docs']}")
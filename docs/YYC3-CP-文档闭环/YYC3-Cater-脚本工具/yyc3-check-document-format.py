@@ -10,17 +10,19 @@ from pathlib import Path
 import re
 from typing import List, Dict
 
+from yyc3_doc_corpus import DocumentCorpus
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
 
-def check_document_structure(file_path: Path) -> Dict:
+
+def check_document_structure(file_path: Path, corpus: DocumentCorpus) -> Dict:
     """
     检查文档结构
     """
     issues = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
+        parsed = corpus.get(file_path)
+        content = corpus.text(parsed)
     except Exception as e:
         return {'error': str(e)}
     
@@ -44,7 +46,7 @@ def check_document_structure(file_path: Path) -> Dict:
     has_empty_lines = '\n\n' in content
     
     # 检查代码块
-    has_code_blocks = '```' in content
+    has_code_blocks = bool(parsed.code_blocks)
     
     # 检查表格
     has_tables = '|' in content and '---' in content
@@ -59,22 +61,25 @@ def check_document_structure(file_path: Path) -> Dict:
         'has_empty_lines': has_empty_lines,
         'has_code_blocks': has_code_blocks,
         'has_tables': has_tables,
-        'line_count': len(lines),
+        'line_count': parsed.line_count,
         'issues': issues
     }
 
 
-def check_directory_format(dir_path: Path) -> Dict:
+def check_directory_format(dir_path: Path, corpus: DocumentCorpus) -> Dict:
     """
     检查目录下所有文档的格式
     """
     results = []
     
     for file_path in sorted(dir_path.glob("*.md")):
-        result = check_document_structure(file_path)
+        with document(file_path):
+            result = check_document_structure(file_path, corpus)
         if 'error' not in result:
             results.append(result)
     
+    corpus.commit()
+    
     return {
         'directory': dir_path,
         'total': len(results),
@@ -82,6 +87,7 @@ def check_directory_format(dir_path: Path) -> Dict:
     }
 
 
+@profiled("generate_format_report")
 def generate_format_report(results: List[Dict]) -> str:
     """
     生成格式审核报告
@@ -172,34 +178,44 @@ def main():
     """
     主函数
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 文档格式审核工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     base_path = Path(__file__).parent
     
     print("开始检查文档格式...")
     print()
     
-    results = []
+    with profiling_from_args(args):
+        results = []
+        corpus = DocumentCorpus()
     
-    # 遍历所有分类目录
-    for category_dir in sorted(base_path.iterdir()):
-        if not category_dir.is_dir():
-            continue
+        # 遍历所有分类目录
+        for category_dir in sorted(base_path.iterdir()):
+            if not category_dir.is_dir():
+                continue
         
-        # 检查架构类和技巧类子目录
-        for sub_dir in ['架构类', '技巧类']:
-            sub_path = category_dir / sub_dir
-            if sub_path.exists() and sub_path.is_dir():
-                result = check_directory_format(sub_path)
-                if result['total'] > 0:
-                    results.append(result)
-    
-    report = generate_format_report(results)
-    
-    print(report)
-    
-    # 保存报告
-    report_path = base_path / "YYC3-文档格式审核报告.md"
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+            # 检查架构类和技巧类子目录
+            for sub_dir in ['架构类', '技巧类']:
+                sub_path = category_dir / sub_dir
+                if sub_path.exists() and sub_path.is_dir():
+                    with stage("check_directory_format", directory=str(sub_path)) as record:
+                        result = check_directory_format(sub_path, corpus)
+                        record.items = result['total']
+                    if result['total'] > 0:
+                        results.append(result)
+    
+        report = generate_format_report(results)
+    
+        print(report)
+    
+        # 保存报告
+        report_path = base_path / "YYC3-文档格式审核报告.md"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
     
     print(f"\n报告已保存到: {report_path}")
 
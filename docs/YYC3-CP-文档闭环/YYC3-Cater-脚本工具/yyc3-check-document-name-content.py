@@ -18,6 +18,12 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import json
 
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args
+from yyc3_tokenizer import DEFAULT_STOP_WORDS, Tokenizer
+
+# 名称和内容中不参与比较的通用词
+GENERIC_WORDS = {'文档', '设计', '架构', '说明', '指南', '手册'}
+
 
 class DocumentNameContentChecker:
     """文档名称与内容对应关系检查器"""
@@ -32,6 +38,7 @@ class DocumentNameContentChecker:
         self.base_path = Path(base_path)
         self.issues = []
         self.check_results = []
+        self.tokenizer = Tokenizer(stop_words=DEFAULT_STOP_WORDS | GENERIC_WORDS)
 
     def extract_keywords_from_filename(self, filename: str) -> List[str]:
         """
@@ -54,12 +61,8 @@ class DocumentNameContentChecker:
         # 移除YYC3前缀
         name = re.sub(r'^YYC3-', '', name)
 
-        # 分割关键词
-        keywords = re.split(r'[-_]', name)
-        # 过滤空字符串和通用词
-        keywords = [kw for kw in keywords if kw and kw not in ['文档', '设计', '架构', '说明', '指南', '手册']]
-
-        return keywords
+        # 分词（中文按二元组和领域词典切分，已去除通用词），去重并保持顺序
+        return list(dict.fromkeys(self.tokenizer.tokens(name)))
 
     def extract_keywords_from_content(self, content: str) -> List[str]:
         """
@@ -76,30 +79,23 @@ class DocumentNameContentChecker:
         # 从标题中提取关键词
         title_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
         if title_match:
-            title = title_match.group(1)
-            title_keywords = re.split(r'[\s-]+', title)
-            keywords.extend([kw for kw in title_keywords if kw and len(kw) > 1])
+            keywords.extend(self.tokenizer.tokens(title_match.group(1)))
 
         # 从@description中提取关键词
         desc_match = re.search(r'\*\*@description\*\*：(.+)$', content, re.MULTILINE)
         if desc_match:
-            desc = desc_match.group(1)
-            desc_keywords = re.split(r'[\s,，、]+', desc)
-            keywords.extend([kw for kw in desc_keywords if kw and len(kw) > 1])
+            keywords.extend(self.tokenizer.tokens(desc_match.group(1)))
 
         # 从文档信息表格中提取关键词
         table_match = re.search(r'\*\*文档标题\*\*\|(.+)$', content, re.MULTILINE)
         if table_match:
-            title = table_match.group(1).strip()
-            title_keywords = re.split(r'[\s-]+', title)
-            keywords.extend([kw for kw in title_keywords if kw and len(kw) > 1])
+            keywords.extend(self.tokenizer.tokens(table_match.group(1)))
 
         # 从目录中提取关键词
         toc_match = re.search(r'##\s+目录\s*\n([\s\S]+?)(?=\n##|\Z)', content)
         if toc_match:
-            toc = toc_match.group(1)
-            toc_keywords = re.findall(r'\[(.+?)\]', toc)
-            keywords.extend([kw for kw in toc_keywords if kw and len(kw) > 1])
+            for entry in re.findall(r'\[(.+?)\]', toc_match.group(1)):
+                keywords.extend(self.tokenizer.tokens(entry))
 
         # 去重并返回
         return list(set(keywords))
@@ -177,6 +173,7 @@ class DocumentNameContentChecker:
             'issues': issues
         }
 
+    @profiled("check_all_documents")
     def check_all_documents(self) -> List[Dict]:
         """
         检查所有文档
@@ -195,7 +192,8 @@ class DocumentNameContentChecker:
         # 检查每个文档
         results = []
         for file_path in md_files:
-            result = self.check_document(file_path)
+            with document(file_path):
+                result = self.check_document(file_path)
             results.append(result)
 
             # 记录问题
@@ -205,6 +203,7 @@ class DocumentNameContentChecker:
         self.check_results = results
         return results
 
+    @profiled("generate_report")
     def generate_report(self) -> str:
         """
         生成审核报告
@@ -355,25 +354,32 @@ class DocumentNameContentChecker:
 
 def main():
     """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文档名称内容对应关系检查工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     # 设置基础路径
     base_path = '/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环'
 
-    # 创建检查器
-    checker = DocumentNameContentChecker(base_path)
-
-    # 检查所有文档
-    print('开始检查文档名称与内容对应关系...')
-    results = checker.check_all_documents()
+    with profiling_from_args(args):
+        # 创建检查器
+        checker = DocumentNameContentChecker(base_path)
 
-    # 生成报告
-    print('生成审核报告...')
-    report = checker.generate_report()
+        # 检查所有文档
+        print('开始检查文档名称与内容对应关系...')
+        results = checker.check_all_documents()
 
-    # 保存报告
-    report_path = Path(base_path) / 'YYC3-Cater-审核报告' / 'YYC3-文档名称内容对应关系审核报告.md'
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+        # 生成报告
+        print('生成审核报告...')
+        report = checker.generate_report()
+
+        # 保存报告
+        report_path = Path(base_path) / 'YYC3-Cater-审核报告' / 'YYC3-文档名称内容对应关系审核报告.md'
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
 
     print(f'审核报告已保存到：{report_path}')
     print(f'审核完成：共检查 {len(results)} 个文档')
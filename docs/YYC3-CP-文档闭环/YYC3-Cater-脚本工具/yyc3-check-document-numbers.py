@@ -10,6 +10,8 @@ from pathlib import Path
 from collections import defaultdict
 import re
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 def extract_number_from_filename(filename: str) -> tuple[int, str]:
     """
@@ -66,7 +68,9 @@ def check_all_directories(base_path: Path) -> list[dict]:
         for sub_dir in ['架构类', '技巧类']:
             sub_path = category_dir / sub_dir
             if sub_path.exists() and sub_path.is_dir():
-                result = check_directory_numbers(sub_path)
+                with stage("check_directory_numbers", directory=str(sub_path)) as record:
+                    result = check_directory_numbers(sub_path)
+                    record.items = result['total']
                 if result['total'] > 0:
                     results.append(result)
     
@@ -133,20 +137,28 @@ def main():
     """
     主函数
     """
-    base_path = Path(__file__).parent
+    import argparse
     
-    print("开始检查文档编号...")
-    print()
+    parser = argparse.ArgumentParser(description='YYC³ 文档编号检查工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
     
-    results = check_all_directories(base_path)
-    report = generate_report(results)
-    
-    print(report)
+    base_path = Path(__file__).parent
     
-    # 保存报告
-    report_path = base_path / "YYC3-文档编号审核报告.md"
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    with profiling_from_args(args):
+        print("开始检查文档编号...")
+        print()
+        
+        results = check_all_directories(base_path)
+        with stage("generate_report"):
+            report = generate_report(results)
+        
+        print(report)
+        
+        # 保存报告
+        report_path = base_path / "YYC3-文档编号审核报告.md"
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
     
     print(f"\n报告已保存到: {report_path}")
 
@@ -19,6 +19,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 from datetime import datetime
 
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
+
 
 class FileNamingAuditor:
     """文件命名审核器"""
@@ -144,7 +146,8 @@ class FileNamingAuditor:
         for file_path in sorted(dir_path.glob('*')):
             if file_path.is_file():
                 self.stats['total_files'] += 1
-                result = self.check_document_naming(file_path)
+                with document(file_path):
+                    result = self.check_document_naming(file_path)
                 if result['status'] != 'skipped':
                     results.append(result)
         return results
@@ -177,7 +180,9 @@ class FileNamingAuditor:
             for doc_type in ['架构类', '技巧类']:
                 type_path = category_path / doc_type
                 if type_path.exists():
-                    results = self.audit_directory(type_path)
+                    with stage("audit_directory", directory=str(type_path)) as record:
+                        results = self.audit_directory(type_path)
+                        record.items = len(results)
                     if results:
                         category_results[doc_type] = results
 
@@ -186,6 +191,7 @@ class FileNamingAuditor:
 
         return all_results
 
+    @profiled("generate_report")
     def generate_report(self, results: Dict) -> str:
         """生成审核报告"""
         report_lines = [
@@ -264,23 +270,30 @@ class FileNamingAuditor:
 
 def main():
     """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文件命名规范性审核工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
     # 文档根目录
     base_dir = Path('/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环')
 
-    # 创建审核器
-    auditor = FileNamingAuditor(base_dir)
+    with profiling_from_args(args):
+        # 创建审核器
+        auditor = FileNamingAuditor(base_dir)
 
-    # 执行审核
-    print("开始审核文件命名规范性...")
-    results = auditor.audit_all_categories()
+        # 执行审核
+        print("开始审核文件命名规范性...")
+        results = auditor.audit_all_categories()
 
-    # 生成报告
-    report = auditor.generate_report(results)
+        # 生成报告
+        report = auditor.generate_report(results)
 
-    # 保存报告
-    report_path = base_dir / 'YYC3-文件命名审核报告.md'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+        # 保存报告
+        report_path = base_dir / 'YYC3-文件命名审核报告.md'
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
 
     print(f"✅ 审核完成！")
     print(f"📊 总文件数: {auditor.stats['total_files']}")
@@ -10,6 +10,8 @@ import re
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 # 文档根目录
 DOCS_ROOT = Path("/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环")
 
@@ -186,6 +188,12 @@ def main():
     """
     主函数
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 文档统一化脚本')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     print("=" * 80)
     print("YYC³ 文档统一化脚本")
     print("批量添加标准文档头部信息")
@@ -194,12 +202,15 @@ def main():
     total_processed = 0
     total_skipped = 0
     
-    # 处理所有子目录
-    for subdir in sorted(DOCS_ROOT.iterdir()):
-        if subdir.is_dir():
-            processed, skipped = process_directory(subdir)
-            total_processed += processed
-            total_skipped += skipped
+    with profiling_from_args(args):
+        # 处理所有子目录
+        for subdir in sorted(DOCS_ROOT.iterdir()):
+            if subdir.is_dir():
+                with stage("process_directory", directory=str(subdir)) as record:
+                    processed, skipped = process_directory(subdir)
+                    record.items = processed + skipped
+                total_processed += processed
+                total_skipped += skipped
     
     # 输出统计信息
     print("\n" + "=" * 80)
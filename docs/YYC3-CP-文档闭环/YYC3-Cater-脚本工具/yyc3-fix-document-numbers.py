@@ -10,6 +10,8 @@ from pathlib import Path
 import re
 from typing import Dict, List
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 def extract_number_from_filename(filename: str) -> tuple[int, str]:
     """
@@ -113,6 +115,12 @@ def main():
     """
     主函数
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 文档编号修正工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     base_path = Path(__file__).parent
     
     print("=" * 80)
@@ -122,18 +130,21 @@ def main():
     total_duplicate_fixed = 0
     total_unnumbered_fixed = 0
     
-    # 遍历所有分类目录
-    for category_dir in sorted(base_path.iterdir()):
-        if not category_dir.is_dir():
-            continue
-        
-        # 检查架构类和技巧类子目录
-        for sub_dir in ['架构类', '技巧类']:
-            sub_path = category_dir / sub_dir
-            if sub_path.exists() and sub_path.is_dir():
-                duplicate_fixed, unnumbered_fixed = fix_directory(sub_path)
-                total_duplicate_fixed += duplicate_fixed
-                total_unnumbered_fixed += unnumbered_fixed
+    with profiling_from_args(args):
+        # 遍历所有分类目录
+        for category_dir in sorted(base_path.iterdir()):
+            if not category_dir.is_dir():
+                continue
+            
+            # 检查架构类和技巧类子目录
+            for sub_dir in ['架构类', '技巧类']:
+                sub_path = category_dir / sub_dir
+                if sub_path.exists() and sub_path.is_dir():
+                    with stage("fix_directory", directory=str(sub_path)) as record:
+                        duplicate_fixed, unnumbered_fixed = fix_directory(sub_path)
+                        record.items = duplicate_fixed + unnumbered_fixed
+                    total_duplicate_fixed += duplicate_fixed
+                    total_unnumbered_fixed += unnumbered_fixed
     
     print("\n" + "=" * 80)
     print("修正完成")
@@ -13,6 +13,8 @@ import shutil
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 class DuplicateDocumentFixer:
     """文档重复处理类"""
@@ -95,7 +97,9 @@ class DuplicateDocumentFixer:
     
     def fix_all_duplicates(self) -> None:
         """修复所有重复文档"""
-        duplicates = self.find_duplicate_documents()
+        with stage("find_duplicate_documents") as record:
+            duplicates = self.find_duplicate_documents()
+            record.items = len(duplicates)
         
         if not duplicates:
             print("✅ 未发现重复文档")
@@ -106,19 +110,20 @@ class DuplicateDocumentFixer:
         for category_dir, files in duplicates.items():
             print(f"\n📁 处理目录: {category_dir}")
             
-            # 比较文档完整性
-            keep_file, delete_files = self.compare_document_completeness(files)
-            
-            print(f"   保留: {keep_file.name} ({keep_file.stat().st_size} bytes)")
-            for f in delete_files:
-                print(f"   删除: {f.name} ({f.stat().st_size} bytes)")
-            
-            # 删除重复文件
-            self.delete_duplicate_files(delete_files)
-            
-            # 重新编号文档
-            print("   🔄 重新编号文档...")
-            self.renumber_documents(Path(category_dir))
+            with stage("fix_duplicates", directory=str(category_dir), items=len(files)):
+                # 比较文档完整性
+                keep_file, delete_files = self.compare_document_completeness(files)
+                
+                print(f"   保留: {keep_file.name} ({keep_file.stat().st_size} bytes)")
+                for f in delete_files:
+                    print(f"   删除: {f.name} ({f.stat().st_size} bytes)")
+                
+                # 删除重复文件
+                self.delete_duplicate_files(delete_files)
+                
+                # 重新编号文档
+                print("   🔄 重新编号文档...")
+                self.renumber_documents(Path(category_dir))
     
     def generate_report(self) -> str:
         """生成变更报告"""
@@ -140,26 +145,33 @@ class DuplicateDocumentFixer:
 
 def main():
     """主函数"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 重复文档处理工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     docs_root = "/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环"
     reports_dir = Path(docs_root) / "YYC3-Cater-审核报告"
     
     # 创建报告目录
     reports_dir.mkdir(parents=True, exist_ok=True)
     
-    # 创建修复器
-    fixer = DuplicateDocumentFixer(docs_root)
-    
-    # 修复重复文档
-    print("🔍 开始处理重复文档...")
-    fixer.fix_all_duplicates()
-    
-    # 生成报告
-    print("\n📝 生成处理报告...")
-    report = fixer.generate_report()
-    report_path = reports_dir / "YYC3-文档重复处理报告.md"
-    
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    with profiling_from_args(args):
+        # 创建修复器
+        fixer = DuplicateDocumentFixer(docs_root)
+        
+        # 修复重复文档
+        print("🔍 开始处理重复文档...")
+        fixer.fix_all_duplicates()
+        
+        # 生成报告
+        print("\n📝 生成处理报告...")
+        report = fixer.generate_report()
+        report_path = reports_dir / "YYC3-文档重复处理报告.md"
+        
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
     
     print(f"✅ 处理完成！报告已保存到: {report_path}")
 
@@ -12,6 +12,8 @@ import shutil
 from pathlib import Path
 from typing import List, Tuple
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args
+
 
 def manual_fix_architecture_docs():
     """手动修复架构类文档的重复和编号问题"""
@@ -100,5 +102,17 @@ def manual_fix_architecture_docs():
         print(f"  {doc.name}")
 
 
+def main():
+    """主函数"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 文档手动修复工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
+    with profiling_from_args(args):
+        manual_fix_architecture_docs()
+
+
 if __name__ == "__main__":
-    manual_fix_architecture_docs()
+    main()
@@ -16,6 +16,8 @@ import re
 from pathlib import Path
 from typing import Dict, List
 
+from yyc3_profiling import add_profile_arguments, document, profiling_from_args, stage
+
 # 文档根目录
 DOCS_ROOT = "/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环"
 
@@ -368,20 +370,24 @@ class ContentEnricher:
         print()
         
         # 查找所有Markdown文件
-        md_files = self.find_all_markdown_files()
+        with stage("find_all_markdown_files") as record:
+            md_files = self.find_all_markdown_files()
+            record.items = len(md_files)
         self.stats['total_docs'] = len(md_files)
         
         print(f"📊 找到 {len(md_files)} 个Markdown文件")
         print()
         
         # 补充每个文档的内容
-        for i, file_path in enumerate(md_files, 1):
-            print(f"[{i}/{len(md_files)}] 处理: {file_path.name}")
-            
-            if not dry_run:
-                self.enrich_document(file_path)
-            
-            print()
+        with stage("enrich_documents", items=len(md_files)):
+            for i, file_path in enumerate(md_files, 1):
+                print(f"[{i}/{len(md_files)}] 处理: {file_path.name}")
+                
+                if not dry_run:
+                    with document(file_path):
+                        self.enrich_document(file_path)
+                
+                print()
         
         # 打印统计信息
         self.print_stats()
@@ -404,11 +410,13 @@ def main():
     parser = argparse.ArgumentParser(description='YYC³文档闭环系统第一阶段（P0）内容补充脚本')
     parser.add_argument('--dry-run', action='store_true', help='仅分析，不修改文件')
     parser.add_argument('--docs-root', default=DOCS_ROOT, help='文档根目录')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
-    enricher = ContentEnricher(args.docs_root)
-    enricher.run(dry_run=args.dry_run)
+    with profiling_from_args(args):
+        enricher = ContentEnricher(args.docs_root)
+        enricher.run(dry_run=args.dry_run)
 
 
 if __name__ == '__main__':
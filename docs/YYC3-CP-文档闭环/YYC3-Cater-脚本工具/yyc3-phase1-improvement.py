@@ -17,6 +17,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import sys
 
+from yyc3_profiling import add_profile_arguments, document, profiling_from_args, stage
+
 # 文档根目录
 DOCS_ROOT = "/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环"
 
@@ -371,36 +373,40 @@ class DocumentImprover:
         print()
         
         # 查找所有Markdown文件
-        md_files = self.find_all_markdown_files()
+        with stage("find_all_markdown_files") as record:
+            md_files = self.find_all_markdown_files()
+            record.items = len(md_files)
         self.stats['total_docs'] = len(md_files)
         
         print(f"📊 找到 {len(md_files)} 个Markdown文件")
         print()
         
         # 分析和改进每个文档
-        for i, file_path in enumerate(md_files, 1):
-            print(f"[{i}/{len(md_files)}] 处理: {file_path.name}")
-            
-            doc_info = self.analyze_document(file_path)
-            if doc_info:
-                if not dry_run:
-                    self.improve_document(doc_info)
-                else:
-                    # 仅分析，不修改
-                    if doc_info['effective_lines'] < 50:
-                        print(f"  ⚠️  内容过少 ({doc_info['effective_lines']}行)")
-                        self.stats['short_content'] += 1
-                    if not doc_info['has_info_table']:
-                        print(f"  📝 缺少文档信息表格")
-                        self.stats['missing_info_table'] += 1
-                    if not doc_info['has_toc']:
-                        print(f"  📑 缺少目录")
-                        self.stats['missing_toc'] += 1
-                    if not doc_info['has_standard_sections']:
-                        print(f"  📚 缺少标准章节")
-                        self.stats['missing_sections'] += 1
-            
-            print()
+        with stage("improve_documents", items=len(md_files)):
+            for i, file_path in enumerate(md_files, 1):
+                print(f"[{i}/{len(md_files)}] 处理: {file_path.name}")
+                
+                with document(file_path):
+                    doc_info = self.analyze_document(file_path)
+                    if doc_info:
+                        if not dry_run:
+                            self.improve_document(doc_info)
+                        else:
+                            # 仅分析，不修改
+                            if doc_info['effective_lines'] < 50:
+                                print(f"  ⚠️  内容过少 ({doc_info['effective_lines']}行)")
+                                self.stats['short_content'] += 1
+                            if not doc_info['has_info_table']:
+                                print(f"  📝 缺少文档信息表格")
+                                self.stats['missing_info_table'] += 1
+                            if not doc_info['has_toc']:
+                                print(f"  📑 缺少目录")
+                                self.stats['missing_toc'] += 1
+                            if not doc_info['has_standard_sections']:
+                                print(f"  📚 缺少标准章节")
+                                self.stats['missing_sections'] += 1
+                
+                print()
         
         # 打印统计信息
         self.print_stats()
@@ -426,11 +432,13 @@ def main():
     parser = argparse.ArgumentParser(description='YYC³文档闭环系统第一阶段（P0）改进脚本')
     parser.add_argument('--dry-run', action='store_true', help='仅分析，不修改文件')
     parser.add_argument('--docs-root', default=DOCS_ROOT, help='文档根目录')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
-    improver = DocumentImprover(args.docs_root)
-    improver.run(dry_run=args.dry_run)
+    with profiling_from_args(args):
+        improver = DocumentImprover(args.docs_root)
+        improver.run(dry_run=args.dry_run)
 
 
 if __name__ == '__main__':
@@ -22,6 +22,8 @@ from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from yyc3_profiling import add_profile_arguments, document, profiling_from_args, stage
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -1169,10 +1171,12 @@ const useStore = create((set) => ({
         
         # 分析文档
         logger.info("\n分析文档内容...")
-        for md_file in md_files:
-            doc_content = self.analyze_document(md_file)
-            if doc_content:
-                self.documents.append(doc_content)
+        with stage("analyze_documents", items=len(md_files)):
+            for md_file in md_files:
+                with document(md_file):
+                    doc_content = self.analyze_document(md_file)
+                if doc_content:
+                    self.documents.append(doc_content)
         
         # 统计
         total_docs = len(self.documents)
@@ -1181,11 +1185,13 @@ const useStore = create((set) => ({
         
         # 完善文档
         logger.info("\n完善文档内容...")
-        for doc in self.documents:
-            if doc.improvement_suggestions:
-                if self.improve_document(doc):
-                    improved_count += 1
-                    total_suggestions += len(doc.improvement_suggestions)
+        with stage("improve_documents") as record:
+            for doc in self.documents:
+                if doc.improvement_suggestions:
+                    if self.improve_document(doc):
+                        improved_count += 1
+                        total_suggestions += len(doc.improvement_suggestions)
+            record.items = improved_count
         
         # 生成报告
         report = {
@@ -1230,6 +1236,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='YYC³ 文档内容完善工具')
     parser.add_argument('--dry-run', action='store_true', help='试运行模式，不实际修改文件')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # 获取脚本所在目录的父目录（文档闭环目录）
@@ -1237,8 +1244,9 @@ def main():
     base_path = script_dir.parent
     
     # 创建完善器并运行
-    completer = ContentCompleter(str(base_path), dry_run=args.dry_run)
-    report = completer.run()
+    with profiling_from_args(args):
+        completer = ContentCompleter(str(base_path), dry_run=args.dry_run)
+        report = completer.run()
     
     # 保存报告
     report_path = script_dir.parent / 'YYC3-Cater-审核报告' / f'YYC3-文档内容完善报告{"_dryrun" if args.dry_run else ""}.json'
@@ -8,11 +8,20 @@ YYC³ 第二阶段（P1）文档改进工具
 import os
 import re
 import json
+import time
+from array import array
+from collections.abc import Mapping
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
-from collections import defaultdict
+from typing import Dict, Iterable, Iterator, List, Tuple, Set, Optional
 import logging
 
+import numpy as np
+
+from yyc3_doc_corpus import DocumentCorpus
+from yyc3_minhash import MinHashLSH
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
+from yyc3_tokenizer import DEFAULT_STOP_WORDS, Tokenizer, load_user_terms
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -21,15 +30,130 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class DocumentIndex(Mapping):
+    """
+    紧凑的文档索引：文档、关键词、分类和类型都以整数编码保存，不保存正文
+    
+    文档ID即加载顺序；关键词ID由分词器驻留，各文档的关键词ID连续存放在一个数组中（CSR）。
+    以路径为键访问时按需构造文档信息字典，正文需要时用 DocumentContextAnalyzer.read_content 读取。
+    """
+    
+    def __init__(self, tokenizer: Tokenizer):
+        self.tokenizer = tokenizer
+        self.paths: List[str] = []
+        self.positions: Dict[str, int] = {}
+        self.titles: List[str] = []
+        self.category_names: List[str] = []
+        self.type_names: List[str] = []
+        self._category_ids: Dict[str, int] = {}
+        self._type_ids: Dict[str, int] = {}
+        
+        # 加载时追加，freeze 后转为NumPy数组
+        self.category_codes = array('i')
+        self.type_codes = array('i')
+        self.keyword_ids = array('i')
+        self.offsets = array('q', [0])
+    
+    @staticmethod
+    def _intern(value: str, ids: Dict[str, int], names: List[str]) -> int:
+        code = ids.get(value)
+        if code is None:
+            code = ids[value] = len(names)
+            names.append(value)
+        return code
+    
+    def add(self, path: str, title: str, category: str, doc_type: str, keyword_ids: Iterable[int]) -> int:
+        """添加文档，返回文档ID"""
+        doc_id = len(self.paths)
+        self.paths.append(path)
+        self.positions[path] = doc_id
+        self.titles.append(title)
+        self.category_codes.append(self._intern(category, self._category_ids, self.category_names))
+        self.type_codes.append(self._intern(doc_type, self._type_ids, self.type_names))
+        self.keyword_ids.extend(sorted(set(keyword_ids)))
+        self.offsets.append(len(self.keyword_ids))
+        return doc_id
+    
+    def freeze(self):
+        """加载完成后把编码数组转为NumPy数组"""
+        self.category_codes = np.asarray(self.category_codes, dtype=np.int32)
+        self.type_codes = np.asarray(self.type_codes, dtype=np.int32)
+        self.keyword_ids = np.asarray(self.keyword_ids, dtype=np.int32)
+        self.offsets = np.asarray(self.offsets, dtype=np.int64)
+    
+    def document_keywords(self, doc_id: int) -> np.ndarray:
+        """文档的关键词ID（升序）"""
+        return self.keyword_ids[self.offsets[doc_id]:self.offsets[doc_id + 1]]
+    
+    def keyword_overlaps(self, doc_id: int, others: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """文档与 others 中各文档共有的关键词数和关键词并集大小"""
+        starts = self.offsets[others]
+        lengths = self.offsets[others + 1] - starts
+        total = int(lengths.sum())
+        # 把各文档的关键词区间拼接为一个下标数组
+        entry_owner = np.repeat(np.arange(len(others)), lengths)
+        entries = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths) + np.repeat(starts, lengths)
+        
+        own = self.document_keywords(doc_id)
+        values = self.keyword_ids[entries]
+        if len(own):
+            shared = own[np.minimum(np.searchsorted(own, values), len(own) - 1)] == values
+        else:
+            shared = np.zeros(total, dtype=bool)
+        overlap = np.bincount(entry_owner, weights=shared, minlength=len(others))
+        return overlap, len(own) + lengths - overlap
+    
+    def record(self, doc_id: int) -> Dict:
+        """按需构造文档信息字典（不含正文）"""
+        path = self.paths[doc_id]
+        return {
+            'id': doc_id,
+            'path': path,
+            'filename': Path(path).name,
+            'title': self.titles[doc_id],
+            'category': self.category_names[self.category_codes[doc_id]],
+            'type': self.type_names[self.type_codes[doc_id]],
+            'keywords': {self.tokenizer.token(k) for k in self.document_keywords(doc_id)},
+        }
+    
+    def __getitem__(self, path: str) -> Dict:
+        return self.record(self.positions[path])
+    
+    def __contains__(self, path) -> bool:
+        return path in self.positions
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
 class DocumentContextAnalyzer:
     """文档上下文分析器"""
     
-    def __init__(self, base_dir: str):
+    # 文档数少于该值时直接逐一比较
+    LSH_MIN_DOCUMENTS = 200
+    # 每个文档按签名估计分数保留、再精确重排的LSH候选数
+    LSH_MAX_CANDIDATES = 100
+    
+    # 关键词停用词：在通用停用词外，去掉几乎每个文档都有的词
+    STOP_WORDS = DEFAULT_STOP_WORDS | {'文档', '设计', '实现', '规范', '指南'}
+    
+    def __init__(self, base_dir: str, corpus: Optional[DocumentCorpus] = None,
+                 user_terms: Optional[List[str]] = None):
         self.base_dir = Path(base_dir)
-        self.documents: Dict[str, Dict] = {}
-        self.document_categories: Dict[str, List[str]] = defaultdict(list)
-        self.keyword_index: Dict[str, Set[str]] = defaultdict(set)
+        self.corpus = corpus or DocumentCorpus()
+        self.tokenizer = Tokenizer(stop_words=self.STOP_WORDS)
+        if user_terms:
+            self.tokenizer.add_terms(user_terms)
+        self.documents = DocumentIndex(self.tokenizer)
+        
+        # 相关文档索引（load_documents 结束时建立）
+        self.lsh: Optional[MinHashLSH] = None
+        self._groups: Dict[Tuple, np.ndarray] = {}
         
+    @profiled("load_documents")
     def load_documents(self):
         """加载所有文档"""
         logger.info("开始加载文档...")
@@ -49,15 +173,20 @@ class DocumentContextAnalyzer:
                     continue
                     
                 for doc_file in type_dir.glob('*.md'):
-                    self._parse_document(doc_file)
+                    with document(doc_file, stage="load_documents"):
+                        self._parse_document(doc_file)
         
+        self.corpus.commit()
+        self.documents.freeze()
         logger.info(f"共加载 {len(self.documents)} 个文档")
         
+        self._build_related_index()
+        
     def _parse_document(self, file_path: Path):
-        """解析单个文档"""
+        """解析单个文档（只保留标题、分类、类型和关键词，正文不常驻内存）"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            parsed = self.corpus.get(file_path, keep=False)
+            content = self.corpus.text(parsed)
             
             # 提取文档元数据
             metadata = self._extract_metadata(content)
@@ -69,27 +198,15 @@ class DocumentContextAnalyzer:
             category = file_path.parent.parent.name  # 如：YYC3-Cater-架构设计
             doc_type = file_path.parent.name  # 如：架构类或技巧类
             
-            doc_info = {
-                'path': str(file_path),
-                'filename': file_path.name,
-                'title': metadata.get('title', file_path.stem),
-                'category': category,
-                'type': doc_type,
-                'content': content,
-                'keywords': keywords,
-                'metadata': metadata
-            }
-            
-            self.documents[str(file_path)] = doc_info
-            self.document_categories[category].append(str(file_path))
-            
-            # 建立关键词索引
-            for keyword in keywords:
-                self.keyword_index[keyword].add(str(file_path))
+            self.documents.add(str(file_path), metadata.get('title', file_path.stem), category, doc_type, keywords)
             
         except Exception as e:
             logger.error(f"解析文档失败 {file_path}: {e}")
     
+    def read_content(self, doc_path: str) -> str:
+        """读取文档正文"""
+        return Path(doc_path).read_text(encoding='utf-8')
+    
     def _extract_metadata(self, content: str) -> Dict:
         """提取文档元数据"""
         metadata = {}
@@ -117,8 +234,8 @@ class DocumentContextAnalyzer:
         
         return metadata
     
-    def _extract_keywords(self, content: str) -> Set[str]:
-        """提取文档关键词"""
+    def _extract_keywords(self, content: str) -> Set[int]:
+        """提取文档关键词（关键词ID）"""
         keywords = set()
         
         # 从标题提取
@@ -152,54 +269,139 @@ class DocumentContextAnalyzer:
         
         return keywords
     
-    def _tokenize(self, text: str) -> Set[str]:
-        """分词并提取关键词"""
-        # 移除特殊字符和标点
-        text = re.sub(r'[^\w\s\u4e00-\u9fff]', ' ', text)
-        # 分词
-        words = text.split()
-        # 过滤停用词和短词
-        stop_words = {'的', '和', '与', '或', '在', '是', '了', '等', '文档', '设计', '实现', '规范', '指南'}
-        keywords = {word for word in words if len(word) > 1 and word not in stop_words}
-        return keywords
+    def _tokenize(self, text: str) -> List[int]:
+        """分词并提取关键词ID（中文按二元组和用户词典切分）"""
+        return self.tokenizer.encode(text)
+    
+    def _build_related_index(self):
+        """建立相关文档索引：按分类、类型分组的文档ID，以及关键词MinHash/LSH"""
+        with stage("build_related_index", items=len(self.documents)):
+            index = self.documents
+            self._groups = {('all',): np.arange(len(index))}
+            for code, name in enumerate(index.category_names):
+                self._groups[('category', name)] = np.flatnonzero(index.category_codes == code)
+            for code, name in enumerate(index.type_names):
+                self._groups[('type', name)] = np.flatnonzero(index.type_codes == code)
+            combined = index.category_codes.astype(np.int64) * len(index.type_names) + index.type_codes
+            for code in np.unique(combined):
+                category, doc_type = divmod(int(code), len(index.type_names))
+                self._groups[('category_type', index.category_names[category], index.type_names[doc_type])] = \
+                    np.flatnonzero(combined == code)
+            
+            if len(index) < self.LSH_MIN_DOCUMENTS:
+                self.lsh = None
+                return
+            
+            self.lsh = MinHashLSH()
+            self.lsh.build([index.document_keywords(i) for i in range(len(index))])
+    
+    def same_group_documents(self, doc_path: str) -> List[str]:
+        """与文档同分类同类型的其他文档（按加载顺序）"""
+        doc_id = self.documents.positions[doc_path]
+        index = self.documents
+        key = ('category_type', index.category_names[index.category_codes[doc_id]],
+               index.type_names[index.type_codes[doc_id]])
+        return [index.paths[i] for i in self._groups[key] if i != doc_id]
+    
+    def _related_scores(self, doc_id: int, others: np.ndarray) -> np.ndarray:
+        """相关度：关键词Jaccard相似度×0.5 + 同分类0.3 + 同类型0.2"""
+        index = self.documents
+        overlap, union = index.keyword_overlaps(doc_id, others)
+        
+        # 1. 关键词重叠度（权重：0.5）
+        scores = np.divide(overlap, union, out=np.zeros(len(others)), where=union > 0) * 0.5
+        
+        # 2. 同分类加分（权重：0.3）
+        scores += (index.category_codes[others] == index.category_codes[doc_id]) * 0.3
+        
+        # 3. 同类型加分（权重：0.2）
+        scores += (index.type_codes[others] == index.type_codes[doc_id]) * 0.2
+        
+        return scores
+    
+    def _top_related(self, doc_id: int, others: np.ndarray, limit: int) -> List[Tuple[str, float]]:
+        """按相关度从高到低取前 limit 个，分数相同时按加载顺序"""
+        scores = self._related_scores(doc_id, others)
+        order = np.lexsort((others, -scores))[:limit]
+        return [(self.documents.paths[others[i]], float(scores[i])) for i in order]
     
     def find_related_documents(self, doc_path: str, limit: int = 5) -> List[Tuple[str, float]]:
-        """查找相关文档"""
+        """
+        查找相关文档
+        
+        候选集为LSH同桶文档中按签名估计分数最高的 LSH_MAX_CANDIDATES 个，
+        加上各分类/类型分组中最靠前的 limit+1 个文档（关键词不重叠时只按分类、类型加分排序的文档），
+        再按相关度精确重排。
+        """
+        if doc_path not in self.documents:
+            return []
+        if self.lsh is None:
+            return self.find_related_documents_exact(doc_path, limit)
+        
+        index = self.documents
+        doc_id = index.positions[doc_path]
+        found = self.lsh.candidates(doc_id)
+        if len(found) > self.LSH_MAX_CANDIDATES:
+            estimated = (self.lsh.estimate_jaccard(doc_id, found) * 0.5
+                         + (index.category_codes[found] == index.category_codes[doc_id]) * 0.3
+                         + (index.type_codes[found] == index.type_codes[doc_id]) * 0.2)
+            found = found[np.argpartition(-estimated, self.LSH_MAX_CANDIDATES)[:self.LSH_MAX_CANDIDATES]]
+        
+        category = index.category_names[index.category_codes[doc_id]]
+        doc_type = index.type_names[index.type_codes[doc_id]]
+        heads = [self._groups[key][:limit + 1] for key in
+                 (('all',), ('category', category), ('type', doc_type), ('category_type', category, doc_type))]
+        candidates = np.unique(np.concatenate([found] + heads))
+        return self._top_related(doc_id, candidates[candidates != doc_id], limit)
+    
+    def find_related_documents_exact(self, doc_path: str, limit: int = 5) -> List[Tuple[str, float]]:
+        """逐一比较所有文档查找相关文档"""
         if doc_path not in self.documents:
             return []
         
-        doc = self.documents[doc_path]
-        doc_keywords = doc['keywords']
-        doc_category = doc['category']
-        doc_type = doc['type']
-        
-        # 计算相似度分数
-        scores = []
-        for other_path, other_doc in self.documents.items():
-            if other_path == doc_path:
-                continue
-            
-            score = 0.0
-            
-            # 1. 关键词重叠度（权重：0.5）
-            keyword_overlap = len(doc_keywords & other_doc['keywords'])
-            keyword_union = len(doc_keywords | other_doc['keywords'])
-            if keyword_union > 0:
-                score += (keyword_overlap / keyword_union) * 0.5
-            
-            # 2. 同分类加分（权重：0.3）
-            if doc_category == other_doc['category']:
-                score += 0.3
-            
-            # 3. 同类型加分（权重：0.2）
-            if doc_type == other_doc['type']:
-                score += 0.2
-            
-            scores.append((other_path, score))
-        
-        # 按分数排序并返回前N个
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[:limit]
+        doc_id = self.documents.positions[doc_path]
+        others = np.arange(len(self.documents))
+        return self._top_related(doc_id, others[others != doc_id], limit)
+    
+    def check_related_recall(self, sample_size: int = 100, limit: int = 5) -> Dict:
+        """
+        以逐一比较的结果为基准，检查LSH查找相关文档的召回率
+        
+        Args:
+            sample_size: 抽查的文档数（均匀抽取）
+            limit: 每个文档的相关文档数
+        
+        Returns:
+            Dict: 抽查数、召回率、结果完全一致的比例和两种方式的耗时
+        """
+        paths = self.documents.paths
+        if not paths:
+            return {'queries': 0, 'recall': 1.0, 'exact_match': 1.0, 'lsh_seconds': 0.0, 'exact_seconds': 0.0}
+        
+        step = max(1, len(paths) // sample_size)
+        sample = paths[::step][:sample_size]
+        
+        start = time.perf_counter()
+        approximate = [self.find_related_documents(path, limit) for path in sample]
+        lsh_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        exact = [self.find_related_documents_exact(path, limit) for path in sample]
+        exact_seconds = time.perf_counter() - start
+        
+        found = expected = matched = 0
+        for approx_result, exact_result in zip(approximate, exact):
+            exact_paths = {path for path, _ in exact_result}
+            found += len(exact_paths & {path for path, _ in approx_result})
+            expected += len(exact_paths)
+            matched += approx_result == exact_result
+        
+        return {
+            'queries': len(sample),
+            'recall': found / expected if expected else 1.0,
+            'exact_match': matched / len(sample),
+            'lsh_seconds': lsh_seconds,
+            'exact_seconds': exact_seconds,
+        }
     
     def generate_document_links(self, doc_path: str) -> List[Dict]:
         """生成文档链接"""
@@ -222,9 +424,9 @@ class DocumentContextAnalyzer:
 class DocumentContextImprover:
     """文档上下文改进器"""
     
-    def __init__(self, base_dir: str):
+    def __init__(self, base_dir: str, user_terms: Optional[List[str]] = None):
         self.base_dir = Path(base_dir)
-        self.analyzer = DocumentContextAnalyzer(base_dir)
+        self.analyzer = DocumentContextAnalyzer(base_dir, user_terms=user_terms)
         self.stats = {
             'total_docs': 0,
             'improved_docs': 0,
@@ -241,20 +443,22 @@ class DocumentContextImprover:
         self.stats['total_docs'] = len(self.analyzer.documents)
         
         # 遍历所有文档
-        for doc_path, doc_info in self.analyzer.documents.items():
-            try:
-                improved = self._improve_document(doc_path, doc_info, dry_run)
-                if improved:
-                    self.stats['improved_docs'] += 1
-            except Exception as e:
-                logger.error(f"改进文档失败 {doc_path}: {e}")
+        with stage("improve_documents", items=len(self.analyzer.documents)):
+            for doc_path, doc_info in self.analyzer.documents.items():
+                try:
+                    with document(doc_path, stage="improve_documents"):
+                        improved = self._improve_document(doc_path, doc_info, dry_run)
+                    if improved:
+                        self.stats['improved_docs'] += 1
+                except Exception as e:
+                    logger.error(f"改进文档失败 {doc_path}: {e}")
         
         # 输出统计信息
         self._print_stats()
     
     def _improve_document(self, doc_path: str, doc_info: Dict, dry_run: bool) -> bool:
         """改进单个文档"""
-        content = doc_info['content']
+        content = self.analyzer.read_content(doc_path)
         original_content = content
         
         # 1. 添加相关文档引用
@@ -326,15 +530,12 @@ class DocumentContextImprover:
         context_section += f"本文档属于 **{doc_info['category']}** 分类下的 **{doc_info['type']}** 文档。\n\n"
         
         # 查找同分类同类型的文档
-        same_category_docs = [
-            d for d in self.analyzer.documents.values()
-            if d['category'] == doc_info['category'] and d['type'] == doc_info['type']
-            and d['path'] != doc_info['path']
-        ]
+        same_category_docs = self.analyzer.same_group_documents(doc_info['path'])
         
         if same_category_docs:
             context_section += "### 相关文档\n\n"
-            for related_doc in same_category_docs[:3]:
+            for related_path in same_category_docs[:3]:
+                related_doc = self.analyzer.documents[related_path]
                 doc_path = Path(related_doc['path'])
                 base_path = Path(self.base_dir)
                 try:
@@ -398,15 +599,35 @@ def main():
     
     parser = argparse.ArgumentParser(description='YYC³ 第二阶段（P1）文档改进工具')
     parser.add_argument('--dry-run', action='store_true', help='试运行模式，不实际修改文件')
+    parser.add_argument('--user-dict', type=str, help='用户词典文件（每行一个领域词），补充分词器的默认词典')
+    parser.add_argument('--check-recall', type=int, metavar='N',
+                        help='只加载文档，抽查N个文档对比LSH与逐一比较的相关文档结果（不修改文件）')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
     # 获取文档目录
     base_dir = Path(__file__).parent.parent
     
+    user_terms = load_user_terms(Path(args.user_dict)) if args.user_dict else None
+    
+    if args.check_recall:
+        analyzer = DocumentContextAnalyzer(str(base_dir), user_terms=user_terms)
+        with profiling_from_args(args):
+            analyzer.load_documents()
+            result = analyzer.check_related_recall(sample_size=args.check_recall)
+        if analyzer.lsh is None:
+            print(f"⚠ 文档数少于 {analyzer.LSH_MIN_DOCUMENTS}，未启用LSH索引（逐一比较）")
+        print(f"抽查文档: {result['queries']}")
+        print(f"召回率: {result['recall']:.2%}")
+        print(f"结果完全一致: {result['exact_match']:.2%}")
+        print(f"耗时: LSH {result['lsh_seconds']:.3f}s, 逐一比较 {result['exact_seconds']:.3f}s")
+        return
+    
     # 创建改进器并运行
-    improver = DocumentContextImprover(str(base_dir))
-    improver.run(dry_run=args.dry_run)
+    improver = DocumentContextImprover(str(base_dir), user_terms=user_terms)
+    with profiling_from_args(args):
+        improver.run(dry_run=args.dry_run)
 
 
 if __name__ == '__main__':
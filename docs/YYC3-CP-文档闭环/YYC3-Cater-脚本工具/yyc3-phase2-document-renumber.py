@@ -11,6 +11,8 @@ from typing import List, Dict, Tuple
 from datetime import datetime
 import json
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 class DocumentRenumberer:
     """文档编号规范化工具"""
@@ -106,7 +108,9 @@ class DocumentRenumberer:
         # 模版规范目录
         template_dir = self.base_path / "YYC3-Cater-模版规范"
         if template_dir.exists():
-            result = self.renumber_documents(template_dir, dry_run)
+            with stage("renumber_documents", directory=str(template_dir)) as record:
+                result = self.renumber_documents(template_dir, dry_run)
+                record.items = result['total']
             results.append(result)
         
         return results
@@ -146,6 +150,7 @@ def main():
     parser.add_argument('--base-path', type=str, 
                        default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环',
                        help='文档根目录路径')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -158,7 +163,8 @@ def main():
     print()
     
     renumberer = DocumentRenumberer(args.base_path)
-    results = renumberer.process_all_directories(dry_run=args.dry_run)
+    with profiling_from_args(args):
+        results = renumberer.process_all_directories(dry_run=args.dry_run)
     
     print()
     print("=" * 80)
@@ -21,6 +21,8 @@ from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -233,10 +235,11 @@ class FilenameOptimizer:
         
         # 分析文件
         logger.info("\n分析文件名...")
-        for file_path in all_files:
-            action = self.analyze_file(file_path)
-            if action:
-                self.rename_actions.append(action)
+        with stage("analyze_files", items=len(all_files)):
+            for file_path in all_files:
+                action = self.analyze_file(file_path)
+                if action:
+                    self.rename_actions.append(action)
         
         # 统计
         total_actions = len(self.rename_actions)
@@ -245,14 +248,15 @@ class FilenameOptimizer:
         
         # 执行重命名
         logger.info(f"\n执行重命名（共 {total_actions} 个文件）...")
-        for action in self.rename_actions:
-            if self.execute_rename(action):
-                if action.success or self.dry_run:
-                    success_count += 1
+        with stage("execute_renames", items=total_actions):
+            for action in self.rename_actions:
+                if self.execute_rename(action):
+                    if action.success or self.dry_run:
+                        success_count += 1
+                    else:
+                        fail_count += 1
                 else:
                     fail_count += 1
-            else:
-                fail_count += 1
         
         # 生成报告
         report = {
@@ -298,6 +302,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='YYC³ 文件命名优化工具')
     parser.add_argument('--dry-run', action='store_true', help='试运行模式，不实际重命名文件')
+    add_profile_arguments(parser)
     args = parser.parse_args()
     
     # 获取脚本所在目录的父目录（文档闭环目录）
@@ -305,8 +310,9 @@ def main():
     base_path = script_dir.parent
     
     # 创建优化器并运行
-    optimizer = FilenameOptimizer(str(base_path), dry_run=args.dry_run)
-    report = optimizer.run()
+    with profiling_from_args(args):
+        optimizer = FilenameOptimizer(str(base_path), dry_run=args.dry_run)
+        report = optimizer.run()
     
     # 保存报告
     report_path = script_dir.parent / 'YYC3-Cater-审核报告' / f'YYC3-文件命名优化报告{"_dryrun" if args.dry_run else ""}.json'
@@ -6,12 +6,153 @@ YYC³ 文档自动生成工具 - 第三阶段（P2）
 
 import os
 import re
+import io
+import hashlib
+import contextlib
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, Optional, Tuple, Iterator
 from datetime import datetime
 import json
 from dataclasses import dataclass, field
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from yyc3_aho_corasick import get_automaton
+from yyc3_graph_store import load_graph
+from yyc3_profiling import add_profile_arguments, document, profiled, profiler, profiling_from_args
+
+
+# 流式批量生成时每个任务包含的需求数，以及每个进程最多排队的任务数
+STREAM_CHUNK_SIZE = 32
+STREAM_QUEUE_PER_WORKER = 4
+
+# 流式批量生成的进度日志（位于输出目录）
+DEFAULT_JOURNAL_NAME = ".yyc3-generate-journal.jsonl"
+
+
+def atomic_write_text(path: Path, text: str):
+    """先写同目录下的临时文件并落盘，再替换，中断或断电时不会留下写了一半的文件"""
+    tmp_file = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+
+
+def iter_requirements_jsonl(requirements_file: Path) -> Iterator[Tuple[int, str, Optional[Dict], Optional[str]]]:
+    """
+    逐行读取JSONL需求文件
+    
+    Yields:
+        (行号, 需求键, 需求, 错误信息)：需求键为该行内容的sha1，解析失败时需求为None
+    """
+    with open(requirements_file, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            key = hashlib.sha1(line.encode('utf-8')).hexdigest()
+            try:
+                requirements = json.loads(line)
+                if not isinstance(requirements, dict):
+                    raise ValueError("每行应为一个JSON对象")
+                yield line_no, key, requirements, None
+            except ValueError as e:
+                yield line_no, key, None, str(e)
+
+
+def load_journal(journal_file: Path) -> Set[str]:
+    """读取进度日志中已完成的需求键（忽略中断时写了一半的最后一行）"""
+    done = set()
+    if not journal_file.exists():
+        return done
+    with open(journal_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("status") == "done":
+                done.add(entry["key"])
+    return done
+
+
+# 模板中的基本占位符
+TEMPLATE_VARIABLES = ("文档名称", "文档描述", "技巧名称", "技巧描述", "创建日期", "最后更新日期")
+
+# {基本占位符} 或 [必填]/[可选] 字段（字段名为该行其余部分）
+PLACEHOLDER_RE = re.compile(
+    r'\{(' + '|'.join(TEMPLATE_VARIABLES) + r')\}|\[(必填|可选)\][ \t]*([^\n]*[^\s])'
+)
+
+# 二级及以下标题，去掉 "1.2" 之类的编号后作为字段的别名
+SECTION_TITLE_RE = re.compile(r'^#{2,6}\s+(?:\d+(?:\.\d+)*\.?\s+)?(.+?)\s*$')
+
+
+@dataclass
+class TemplateSlot:
+    """模板中的一个待填写位置"""
+    kind: str  # variable / required / optional
+    name: str  # 占位符名称或 [必填]/[可选] 后的字段说明
+    section: str  # 所在章节标题，可作为字段名填写
+    raw: str  # 未填写时保留的原文
+
+
+class CompiledTemplate:
+    """编译后的模板：字面文本片段与待填写位置交替排列，渲染只需一次拼接"""
+    
+    def __init__(self, content: str):
+        self.literals: List[str] = []  # 比 slots 多一个
+        self.slots: List[TemplateSlot] = []
+        
+        pending = []
+        section = ""
+        for line in content.splitlines(keepends=True):
+            title_match = SECTION_TITLE_RE.match(line)
+            if title_match:
+                section = title_match.group(1)
+            
+            last = 0
+            for match in PLACEHOLDER_RE.finditer(line):
+                pending.append(line[last:match.start()])
+                self.literals.append("".join(pending))
+                pending = []
+                if match.group(1):
+                    slot = TemplateSlot("variable", match.group(1), "", match.group(0))
+                else:
+                    kind = "required" if match.group(2) == "必填" else "optional"
+                    slot = TemplateSlot(kind, match.group(3).strip(), section, match.group(0))
+                self.slots.append(slot)
+                last = match.end()
+            pending.append(line[last:])
+        self.literals.append("".join(pending))
+    
+    def render(self, variables: Dict[str, str], fields: Dict[str, str]) -> Tuple[str, List[str]]:
+        """
+        渲染模板
+        
+        Args:
+            variables: 基本占位符的值
+            fields: 字段值，键为 [必填]/[可选] 后的字段说明或所在章节标题
+            
+        Returns:
+            Tuple[str, List[str]]: (文档内容, 未填写的必填字段)
+        """
+        parts = [self.literals[0]]
+        missing = []
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            if slot.kind == "variable":
+                value = variables.get(slot.name)
+            else:
+                value = fields.get(slot.name)
+                if value is None and slot.section:
+                    value = fields.get(slot.section)
+                if value is None and slot.kind == "required":
+                    missing.append(slot.name)
+            parts.append(slot.raw if value is None else str(value))
+            parts.append(literal)
+        return "".join(parts), missing
 
 
 @dataclass
@@ -24,6 +165,14 @@ class DocumentTemplate:
     required_fields: List[str]
     optional_fields: List[str]
     example_content: str
+    _compiled: Optional[CompiledTemplate] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def compiled(self) -> CompiledTemplate:
+        """编译后的模板（首次使用时编译）"""
+        if self._compiled is None:
+            self._compiled = CompiledTemplate(self.example_content)
+        return self._compiled
 
 
 @dataclass
@@ -34,6 +183,7 @@ class GeneratedDocument:
     metadata: Dict
     references: List[str]
     related_concepts: List[str]
+    missing_fields: List[str] = field(default_factory=list)  # 未填写的必填字段
 
 
 class DocumentAutoGenerator:
@@ -53,17 +203,16 @@ class DocumentAutoGenerator:
         # 加载模板
         self.load_templates()
     
+    @profiled("load_graph")
     def load_graph(self):
-        """加载知识图谱"""
-        with open(self.graph_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        self.graph = data
-        self.documents = {doc["name"]: doc for doc in data["documents"]}
-        self.concepts = {concept["name"]: concept for concept in data["concepts"]}
+        """加载知识图谱（存在二进制图谱时优先内存映射加载）"""
+        self.graph = load_graph(self.graph_file)
+        self.documents = self.graph.documents
+        self.concepts = self.graph.concepts
         
         print(f"✓ 已加载知识图谱: {len(self.documents)} 个文档, {len(self.concepts)} 个概念")
     
+    @profiled("load_templates")
     def load_templates(self):
         """加载文档模板"""
         template_dir = self.base_path / "YYC3-Cater-模版规范"
@@ -336,21 +485,17 @@ class DocumentAutoGenerator:
         
         template = self.templates[template_name]
         
-        # 替换模板中的占位符
-        content = template.example_content
-        
-        # 替换基本字段
-        content = content.replace("{文档名称}", doc_name)
-        content = content.replace("{文档描述}", doc_description)
-        content = content.replace("{技巧名称}", doc_name)
-        content = content.replace("{技巧描述}", doc_description)
-        content = content.replace("{创建日期}", datetime.now().strftime('%Y-%m-%d'))
-        content = content.replace("{最后更新日期}", datetime.now().strftime('%Y-%m-%d'))
-        
-        # 替换自定义字段
-        for field_name, field_value in fields.items():
-            content = content.replace(f"[必填] {field_name}", field_value)
-            content = content.replace(f"[可选] {field_name}", field_value)
+        # 填写基本占位符和自定义字段（模板只编译一次）
+        today = datetime.now().strftime('%Y-%m-%d')
+        variables = {
+            "文档名称": doc_name,
+            "文档描述": doc_description,
+            "技巧名称": doc_name,
+            "技巧描述": doc_description,
+            "创建日期": today,
+            "最后更新日期": today
+        }
+        content, missing_fields = template.compiled.render(variables, fields)
         
         # 添加相关概念
         if concepts:
@@ -373,7 +518,8 @@ class DocumentAutoGenerator:
             "category": template.category,
             "doc_type": template.doc_type,
             "created_at": datetime.now().isoformat(),
-            "fields": fields
+            "fields": fields,
+            "missing_required_fields": missing_fields
         }
         
         return GeneratedDocument(
@@ -381,24 +527,28 @@ class DocumentAutoGenerator:
             content=content,
             metadata=metadata,
             references=[doc["name"] for doc in related_docs],
-            related_concepts=concepts or []
+            related_concepts=concepts or [],
+            missing_fields=missing_fields
         )
     
     def find_related_documents(self, concepts: List[str]) -> List[Dict]:
         """查找相关文档"""
         related = []
         
-        for doc_name, doc in self.documents.items():
-            # 检查是否包含相关概念
-            doc_concepts = set(doc.get("concepts", []))
-            concept_matches = doc_concepts & set(concepts)
-            
-            if concept_matches:
-                related.append({
-                    "name": doc_name,
-                    "title": doc["title"],
-                    "matches": len(concept_matches)
-                })
+        # 通过概念倒排统计每个文档命中的概念数
+        matches = defaultdict(int)
+        for concept in set(concepts):
+            concept_id = self.graph.concept_names.get(concept)
+            if concept_id is not None:
+                for doc_id in set(self.graph.concept_doc_ids(concept_id).tolist()):
+                    matches[doc_id] += 1
+        
+        for doc_id in sorted(matches):
+            related.append({
+                "name": self.graph.doc_names[doc_id],
+                "title": self.graph.doc_titles[doc_id],
+                "matches": matches[doc_id]
+            })
         
         # 按匹配数排序
         related.sort(key=lambda x: x["matches"], reverse=True)
@@ -447,38 +597,40 @@ class DocumentAutoGenerator:
     
     def extract_concepts_from_requirements(self, requirements: Dict[str, str]) -> List[str]:
         """从需求中提取概念"""
-        concepts = []
-        
         # 合并所有需求文本
         all_text = " ".join(requirements.values())
         
-        # 匹配知识图谱中的概念
-        for concept_name in self.concepts.keys():
-            if concept_name.lower() in all_text.lower():
-                concepts.append(concept_name)
-        
-        return concepts
+        # 匹配知识图谱中的概念（忽略大小写，一次扫描），按概念在图谱中的顺序返回
+        found = get_automaton(self.graph.concept_names, ignore_case=True).find_all(all_text)
+        return sorted(found, key=self.graph.concept_names.get)
     
-    def save_document(self, doc: GeneratedDocument, output_dir: Path):
-        """保存文档"""
+    def write_document(self, doc: GeneratedDocument, output_dir: Path) -> Tuple[Path, Path]:
+        """写出文档和元数据（均为原子替换），返回两个文件路径"""
         output_dir.mkdir(exist_ok=True)
         
-        # 保存Markdown文档
-        doc_file = output_dir / doc.name
-        with open(doc_file, 'w', encoding='utf-8') as f:
-            f.write(doc.content)
+        # 先写元数据再写文档：文档存在即表示元数据已完整
+        metadata_file = output_dir / f"{doc.name}.metadata.json"
+        atomic_write_text(metadata_file, json.dumps(doc.metadata, ensure_ascii=False, indent=2))
         
-        print(f"✓ 文档已保存到: {doc_file}")
+        doc_file = output_dir / doc.name
+        atomic_write_text(doc_file, doc.content)
         
-        # 保存元数据
-        metadata_file = output_dir / f"{doc.name}.metadata.json"
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(doc.metadata, f, ensure_ascii=False, indent=2)
+        return doc_file, metadata_file
+    
+    def save_document(self, doc: GeneratedDocument, output_dir: Path):
+        """保存文档"""
+        doc_file, metadata_file = self.write_document(doc, output_dir)
         
+        print(f"✓ 文档已保存到: {doc_file}")
         print(f"✓ 元数据已保存到: {metadata_file}")
         
+        if doc.missing_fields:
+            print(f"⚠ {len(doc.missing_fields)} 个必填字段未填写: {', '.join(doc.missing_fields[:3])}"
+                  f"{' 等' if len(doc.missing_fields) > 3 else ''}")
+        
         return doc_file
     
+    @profiled("batch_generate")
     def batch_generate(
         self,
         requirements_list: List[Dict[str, str]],
@@ -491,18 +643,161 @@ class DocumentAutoGenerator:
             print(f"\n生成第 {i}/{len(requirements_list)} 个文档...")
             
             try:
-                doc = self.generate_document_from_requirements(
-                    doc_type=requirements.get("type", "architecture"),
-                    requirements=requirements
-                )
-                
-                doc_file = self.save_document(doc, output_dir)
+                with document(requirements.get("name", f"#{i}")):
+                    doc = self.generate_document_from_requirements(
+                        doc_type=requirements.get("type", "architecture"),
+                        requirements=requirements
+                    )
+                    
+                    doc_file = self.save_document(doc, output_dir)
                 generated_files.append(doc_file)
                 
             except Exception as e:
                 print(f"✗ 生成文档失败: {requirements.get('name', '未知')} - {e}")
         
         return generated_files
+    
+    def generate_items(self, items: List[Tuple[str, Dict]], output_dir: Path) -> List[Tuple]:
+        """
+        生成并写出一组需求，单个需求失败时记录错误而不中断整组
+        
+        Returns:
+            List[Tuple]: (需求键, 文档名, 文件路径或None, 未填写必填字段数, 错误信息或None)
+        """
+        outcomes = []
+        for key, requirements in items:
+            name = requirements.get("name", "未知")
+            try:
+                with document(name):
+                    doc = self.generate_document_from_requirements(
+                        doc_type=requirements.get("type", "architecture"),
+                        requirements=requirements
+                    )
+                    doc_file, _ = self.write_document(doc, output_dir)
+                outcomes.append((key, name, str(doc_file), len(doc.missing_fields), None))
+            except Exception as e:
+                outcomes.append((key, name, None, 0, str(e)))
+        return outcomes
+    
+    @profiled("batch_generate_stream")
+    def batch_generate_stream(
+        self,
+        requirements_file: Path,
+        output_dir: Path,
+        workers: int = 1,
+        journal_file: Optional[Path] = None,
+        resume: bool = True
+    ) -> Dict[str, int]:
+        """
+        从JSONL文件流式批量生成文档
+        
+        需求逐行读取，分块交给进程池生成，每个文档写临时文件后原子替换；
+        每完成一个需求就向进度日志追加一行（每块落盘一次），中断后重新运行会跳过日志中已完成的需求。
+        
+        Args:
+            requirements_file: JSONL需求文件，每行一个需求对象
+            output_dir: 输出目录
+            workers: 生成进程数（1 表示在当前进程中生成）
+            journal_file: 进度日志路径，默认为输出目录下的 .yyc3-generate-journal.jsonl
+            resume: 是否跳过日志中已完成的需求（否则清空日志重新生成）
+            
+        Returns:
+            Dict[str, int]: 生成、跳过、失败的需求数
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        journal_file = Path(journal_file) if journal_file else output_dir / DEFAULT_JOURNAL_NAME
+        if not resume and journal_file.exists():
+            journal_file.unlink()
+        done = load_journal(journal_file)
+        
+        # 清理上次中断时遗留的临时文件
+        for tmp_file in output_dir.glob("*.md*.tmp"):
+            tmp_file.unlink()
+        
+        stats = {"generated": 0, "skipped": 0, "failed": 0, "missing_fields": 0}
+        if done:
+            print(f"✓ 进度日志中已完成 {len(done)} 个需求，将跳过")
+        
+        with open(journal_file, 'a', encoding='utf-8') as journal:
+            def record(key, name, doc_file, missing, error):
+                entry = {"key": key, "name": name, "status": "failed" if error else "done",
+                         "finished_at": datetime.now().isoformat()}
+                if error:
+                    entry["error"] = error
+                    stats["failed"] += 1
+                    print(f"✗ 生成文档失败: {name} - {error}")
+                else:
+                    entry["file"] = doc_file
+                    stats["generated"] += 1
+                    stats["missing_fields"] += missing
+                    if stats["generated"] % 100 == 0:
+                        print(f"  已生成 {stats['generated']} 个文档...")
+                journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                journal.flush()
+            
+            def sync():
+                # 每块落盘一次：断电后日志最多丢失最后一块，重新运行时会重新生成这些需求
+                os.fsync(journal.fileno())
+            
+            def chunks() -> Iterator[List[Tuple[str, Dict]]]:
+                chunk = []
+                for line_no, key, requirements, error in iter_requirements_jsonl(requirements_file):
+                    if key in done:
+                        stats["skipped"] += 1
+                        continue
+                    if requirements is None:
+                        record(key, f"第{line_no}行", None, 0, f"JSON解析失败: {error}")
+                        continue
+                    done.add(key)  # 同一需求重复出现时只生成一次
+                    chunk.append((key, requirements))
+                    if len(chunk) >= STREAM_CHUNK_SIZE:
+                        yield chunk
+                        chunk = []
+                if chunk:
+                    yield chunk
+            
+            if workers <= 1:
+                for chunk in chunks():
+                    for outcome in self.generate_items(chunk, output_dir):
+                        record(*outcome)
+                    sync()
+            else:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(str(self.base_path), str(self.graph_file))) as executor:
+                    # 限制排队中的任务数，输入再大内存占用也有上界
+                    running = set()
+                    for chunk in chunks():
+                        running.add(executor.submit(_generate_items, chunk, str(output_dir)))
+                        if len(running) >= workers * STREAM_QUEUE_PER_WORKER:
+                            finished, running = wait(running, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                for outcome in future.result():
+                                    record(*outcome)
+                                sync()
+                    for future in running:
+                        for outcome in future.result():
+                            record(*outcome)
+                        sync()
+            sync()
+        
+        return stats
+
+
+_worker_generator: Optional[DocumentAutoGenerator] = None
+
+
+def _init_worker(base_path: str, graph_file: str):
+    """进程池初始化：每个子进程只加载一次知识图谱和模板"""
+    global _worker_generator
+    # 子进程中的文档耗时不回传，剖析只覆盖主进程
+    profiler.disable()
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_generator = DocumentAutoGenerator(base_path, graph_file)
+
+
+def _generate_items(items: List[Tuple[str, Dict]], output_dir: str) -> List[Tuple]:
+    """在子进程中生成一组需求"""
+    return _worker_generator.generate_items(items, Path(output_dir))
 
 
 def main():
@@ -523,7 +818,15 @@ def main():
                        default='architecture', help='文档类型')
     parser.add_argument('--name', type=str, help='文档名称')
     parser.add_argument('--description', type=str, help='文档描述')
-    parser.add_argument('--batch', type=str, help='批量生成配置文件（JSON）')
+    parser.add_argument('--batch', type=str,
+                       help='批量生成配置文件（JSON列表；.jsonl 文件按行流式生成，可中断后续跑）')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='流式批量生成的进程数（默认1，即串行）')
+    parser.add_argument('--journal', type=str,
+                       help='流式批量生成的进度日志路径（默认为输出目录下的 .yyc3-generate-journal.jsonl）')
+    parser.add_argument('--restart', action='store_true',
+                       help='忽略进度日志，重新生成全部文档')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -536,38 +839,55 @@ def main():
     print("=" * 80)
     print()
     
-    # 初始化生成器
-    generator = DocumentAutoGenerator(args.base_path, args.graph_file)
+    with profiling_from_args(args):
+        # 初始化生成器
+        generator = DocumentAutoGenerator(args.base_path, args.graph_file)
     
-    # 批量生成
-    if args.batch:
-        with open(args.batch, 'r', encoding='utf-8') as f:
-            requirements_list = json.load(f)
-        
-        print(f"批量生成 {len(requirements_list)} 个文档...\n")
-        generated_files = generator.batch_generate(requirements_list, Path(args.output_dir))
-        
-        print(f"\n✓ 批量生成完成！共生成 {len(generated_files)} 个文档")
+        # 流式批量生成
+        if args.batch and args.batch.endswith('.jsonl'):
+            print(f"流式批量生成: {args.batch}（{args.workers} 个进程）\n")
+            stats = generator.batch_generate_stream(
+                Path(args.batch),
+                Path(args.output_dir),
+                workers=args.workers,
+                journal_file=Path(args.journal) if args.journal else None,
+                resume=not args.restart
+            )
+        
+            print(f"\n✓ 流式批量生成完成！生成 {stats['generated']} 个，跳过已完成 {stats['skipped']} 个，"
+                  f"失败 {stats['failed']} 个")
+            if stats["missing_fields"]:
+                print(f"⚠ 共有 {stats['missing_fields']} 个必填字段未填写，详见各文档元数据")
     
-    # 单个生成
-    elif args.name and args.description:
-        requirements = {
-            "name": args.name,
-            "description": args.description,
-            "type": args.type
-        }
+        # 批量生成
+        elif args.batch:
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                requirements_list = json.load(f)
         
-        print(f"生成文档: {args.name}\n")
-        doc = generator.generate_document_from_requirements(args.type, requirements)
-        doc_file = generator.save_document(doc, Path(args.output_dir))
+            print(f"批量生成 {len(requirements_list)} 个文档...\n")
+            generated_files = generator.batch_generate(requirements_list, Path(args.output_dir))
         
-        print(f"\n✓ 文档生成完成！")
+            print(f"\n✓ 批量生成完成！共生成 {len(generated_files)} 个文档")
+    
+        # 单个生成
+        elif args.name and args.description:
+            requirements = {
+                "name": args.name,
+                "description": args.description,
+                "type": args.type
+            }
+        
+            print(f"生成文档: {args.name}\n")
+            doc = generator.generate_document_from_requirements(args.type, requirements)
+            doc_file = generator.save_document(doc, Path(args.output_dir))
+        
+            print(f"\n✓ 文档生成完成！")
     
-    else:
-        print("错误: 需要指定 --name 和 --description 参数，或使用 --batch 批量生成")
-        print("\n示例:")
-        print("  单个生成: python3 yyc3-phase3-document-generator.py --name '测试文档' --description '这是一个测试文档' --type architecture")
-        print("  批量生成: python3 yyc3-phase3-document-generator.py --batch requirements.json")
+        else:
+            print("错误: 需要指定 --name 和 --description 参数，或使用 --batch 批量生成")
+            print("\n示例:")
+            print("  单个生成: python3 yyc3-phase3-document-generator.py --name '测试文档' --description '这是一个测试文档' --type architecture")
+            print("  批量生成: python3 yyc3-phase3-document-generator.py --batch requirements.json")
 
 
 if __name__ == "__main__":
@@ -14,6 +14,23 @@ from dataclasses import dataclass, field
 from collections import Counter, defaultdict
 import math
 
+import numpy as np
+
+from yyc3_aho_corasick import get_automaton
+from yyc3_graph_store import BinaryGraph, load_graph
+from yyc3_profiling import add_profile_arguments, profiled, profiling_from_args
+from yyc3_tokenizer import Tokenizer
+
+
+# 查询文本中识别的常见技术术语（英文整词匹配，中文在分词结果中匹配）
+TECH_TERMS = [
+    '架构', '设计', '开发', '测试', '部署', 'API', '接口', '服务', '模块', '组件', '系统', '平台', '应用',
+    '数据库', '缓存', '消息队列', '监控', '日志', '安全', '性能', '优化'
+]
+
+# 大写开头的英文单词
+CAPITALIZED_WORD_RE = re.compile(r'[A-Z][a-zA-Z]{2,}')
+
 
 @dataclass
 class RecommendationResult:
@@ -41,12 +58,20 @@ class UserContext:
 class IntelligentDocumentRecommender:
     """智能文档推荐系统"""
     
-    def __init__(self, graph_file: str):
+    def __init__(self, graph_file: str, verbose: bool = True):
+        """
+        Args:
+            graph_file: 知识图谱文件路径
+            verbose: 是否打印加载进度（常驻服务中关闭）
+        """
         self.graph_file = Path(graph_file)
-        self.graph = None
+        self.verbose = verbose
+        self.graph: Optional[BinaryGraph] = None
         self.documents = {}
+        # 查询分词保留大小写、不去停用词，技术术语作为用户词典
+        self.query_tokenizer = Tokenizer(user_terms=TECH_TERMS, stop_words=(), lowercase=False)
+        self.tech_terms = set(TECH_TERMS)
         self.concepts = {}
-        self.edges = []
         
         # 加载知识图谱
         self.load_graph()
@@ -54,371 +79,352 @@ class IntelligentDocumentRecommender:
         # 构建索引
         self.build_indexes()
     
+    @profiled("load_graph")
     def load_graph(self):
-        """加载知识图谱"""
-        with open(self.graph_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        """加载知识图谱（存在二进制图谱时优先内存映射加载）"""
+        self.graph = load_graph(self.graph_file)
         
-        self.graph = data
-        self.documents = {doc["name"]: doc for doc in data["documents"]}
-        self.concepts = {concept["name"]: concept for concept in data["concepts"]}
-        self.edges = data["edges"]
+        # 文档/概念记录在访问时才构造
+        self.documents = self.graph.documents
+        self.concepts = self.graph.concepts
         
-        print(f"✓ 已加载知识图谱: {len(self.documents)} 个文档, {len(self.concepts)} 个概念, {len(self.edges)} 条边")
+        if self.verbose:
+            print(f"✓ 已加载知识图谱: {len(self.documents)} 个文档, {len(self.concepts)} 个概念, {self.graph.num_edges} 条边 ({self.graph.source.name})")
     
+    @profiled("build_indexes")
     def build_indexes(self):
-        """构建索引"""
-        # 关键词索引
-        self.keyword_index = defaultdict(set)
-        for doc_name, doc in self.documents.items():
-            for keyword in doc["keywords"]:
-                self.keyword_index[keyword.lower()].add(doc_name)
-        
-        # 概念索引
-        self.concept_index = defaultdict(set)
-        for doc_name, doc in self.documents.items():
-            for concept in doc["concepts"]:
-                self.concept_index[concept].add(doc_name)
-        
-        # 分类索引
-        self.category_index = defaultdict(set)
-        for doc_name, doc in self.documents.items():
-            self.category_index[doc["category"]].add(doc_name)
-        
-        # 引用索引
-        self.reference_index = defaultdict(set)
-        for edge in self.edges:
-            if edge["type"] == "reference":
-                self.reference_index[edge["source"]].add(edge["target"])
-        
-        # 反向引用索引
-        self.referenced_by_index = defaultdict(set)
-        for edge in self.edges:
-            if edge["type"] == "reference":
-                self.referenced_by_index[edge["target"]].add(edge["source"])
-        
-        print("✓ 已构建索引")
-    
-    def search_by_keywords(self, keywords: List[str], limit: int = 10) -> List[RecommendationResult]:
-        """基于关键词搜索"""
-        results = []
-        keyword_scores = defaultdict(float)
+        """构建索引（基于图谱的CSR倒排，按需展开）"""
+        graph = self.graph
+        self.keyword_index = graph.keyword_index()
+        self.concept_index = graph.concept_index()
+        self.category_index = graph.category_index()
+        self.reference_index = graph.reference_index()
+        self.referenced_by_index = graph.referenced_by_index()
+        
+        # 评分用的稠密数组（按文档ID索引）
+        self.num_documents = graph.num_documents
+        self.doc_primary = graph.arrays["doc_primary"].astype(bool)
+        self.doc_category = graph.arrays["doc_category"]
+        self.doc_quality = graph.arrays["doc_quality_score"]
+        self.doc_importance = graph.arrays["doc_importance"]
+        self.concept_importance = graph.arrays["concept_importance"]
+        
+        # 分类 -> 文档ID（升序）
+        self.category_members = [
+            self._unique(self.category_index.ids(category)) for category in graph.categories
+        ]
+        
+        # 小写关键词：关键词ID -> 小写关键词ID，文档的小写关键词ID与原关键词CSR共用 indptr
+        folded = {}
+        self.keyword_fold = np.array(
+            [folded.setdefault(keyword.lower(), len(folded)) for keyword in graph.keywords], dtype=np.int32
+        )
+        self.folded_keyword_ids = folded
+        self.doc_keyword_indptr = graph.arrays["doc_keyword_indptr"]
+        self.doc_folded_keywords = self.keyword_fold[graph.arrays["doc_keyword_ids"]]
+        
+        # 概念名词表的自动机，查询文本一次扫描即可识别全部概念
+        self.concept_matcher = get_automaton(graph.concept_names)
         
-        # 计算每个文档的关键词匹配分数
+        if self.verbose:
+            print("✓ 已构建索引")
+    
+    # ---- 基于文档ID的评分 ----
+    
+    def _doc_id(self, document_name: str) -> Optional[int]:
+        """文档名 -> 文档ID（同名文档取最后一个）"""
+        return self.graph.doc_names.get(document_name) if document_name else None
+    
+    def _doc_keyword_set(self, doc_id: int) -> Set[int]:
+        """文档的小写关键词ID集合"""
+        indptr = self.doc_keyword_indptr
+        return set(self.doc_folded_keywords[indptr[doc_id]:indptr[doc_id + 1]].tolist())
+    
+    def _dedupe(self, ids: np.ndarray) -> np.ndarray:
+        """文档ID去重（升序）：ID较少时排序，较多时用布尔掩码，避免对大列表排序"""
+        if len(ids) * 64 < self.num_documents:
+            return np.unique(ids)
+        mask = np.zeros(self.num_documents, dtype=bool)
+        mask[ids] = True
+        return np.flatnonzero(mask)
+    
+    def _unique(self, ids: np.ndarray) -> np.ndarray:
+        """去重并去掉不可按名称访问的同名文档"""
+        ids = self._dedupe(ids)
+        return ids[self.doc_primary[ids]]
+    
+    def _keyword_docs(self, keyword_lower: str) -> np.ndarray:
+        return self._unique(self.keyword_index.ids(keyword_lower))
+    
+    def _concept_docs(self, concept: str) -> np.ndarray:
+        return self._unique(self.concept_index.ids(concept))
+    
+    def _candidates(self, touched: List[np.ndarray]) -> np.ndarray:
+        if not touched:
+            return np.zeros(0, dtype=np.int64)
+        return self._dedupe(np.concatenate(touched))
+    
+    def _rank(self, scores: np.ndarray, candidates: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+        """按分数取前 limit 个候选（分数相同按文档ID升序），分数按候选最大值归一化"""
+        candidates = candidates[scores[candidates] > 0]
+        if not len(candidates) or limit <= 0:
+            return []
+        values = scores[candidates]
+        max_score = values.max()
+        
+        if len(candidates) > limit:
+            # 只对第 limit 大的分数做一次划分，再对入选的少量候选排序
+            kth = np.partition(values, len(values) - limit)[len(values) - limit]
+            above = candidates[values > kth]
+            tied = candidates[values == kth][:limit - len(above)]
+            candidates = np.concatenate([above, tied])
+            values = scores[candidates]
+        
+        order = np.lexsort((candidates, -values))
+        return [(int(candidates[i]), float(values[i] / max_score)) for i in order]
+    
+    def _score_keywords(self, keywords: List[str], weight: float = 1.0,
+                        scores: Optional[np.ndarray] = None, touched: Optional[List] = None):
+        scores = np.zeros(self.num_documents) if scores is None else scores
+        touched = [] if touched is None else touched
         for keyword in keywords:
-            keyword_lower = keyword.lower()
-            if keyword_lower in self.keyword_index:
-                for doc_name in self.keyword_index[keyword_lower]:
-                    keyword_scores[doc_name] += 1
-        
-        # 归一化分数
-        max_score = max(keyword_scores.values()) if keyword_scores else 1
-        for doc_name in keyword_scores:
-            keyword_scores[doc_name] = keyword_scores[doc_name] / max_score
-        
-        # 生成推荐结果
-        for doc_name, score in sorted(keyword_scores.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            doc = self.documents[doc_name]
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=doc["title"],
-                category=doc["category"],
-                relevance_score=score,
-                quality_score=doc["quality_score"],
-                importance=doc["importance"],
-                match_reasons=[f"匹配关键词: {', '.join(keywords)}"],
-                preview=doc.get("description", "")[:200]
-            )
-            results.append(result)
+            ids = self._keyword_docs(keyword.lower())
+            scores[ids] += weight
+            touched.append(ids)
+        return scores, touched
+    
+    def _score_concepts(self, concepts: List[str], weight: Optional[float] = None,
+                        scores: Optional[np.ndarray] = None, touched: Optional[List] = None):
+        """概念评分：weight 为 None 时使用概念重要性作为权重"""
+        scores = np.zeros(self.num_documents) if scores is None else scores
+        touched = [] if touched is None else touched
+        for concept in concepts:
+            concept_id = self.graph.concept_names.get(concept)
+            if concept_id is None:
+                continue
+            ids = self._concept_docs(concept)
+            scores[ids] += float(self.concept_importance[concept_id]) if weight is None else weight
+            touched.append(ids)
+        return scores, touched
+    
+    def _score_document(self, doc_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """基于文档的评分：引用0.3、被引用0.4、每个共享概念0.2、相同分类0.1"""
+        graph = self.graph
+        scores = np.zeros(self.num_documents)
+        touched = []
+        
+        for ids, weight in ((graph.reference_ids(doc_id), 0.3), (graph.referenced_by_ids(doc_id), 0.4)):
+            ids = self._unique(ids)
+            scores[ids] += weight
+            touched.append(ids)
+        
+        for concept_id in graph.doc_concept_ids(doc_id):
+            ids = self._unique(graph.concept_doc_ids(int(concept_id)))
+            scores[ids] += 0.2
+            touched.append(ids)
+        
+        same_category = self.category_members[self.doc_category[doc_id]]
+        scores[same_category] += 0.1
+        touched.append(same_category)
         
-        return results
+        # 排除当前文档
+        scores[doc_id] = 0.0
+        return scores, self._candidates(touched)
     
+    def _result(self, doc_id: int, score: float, match_reasons: List[str]) -> RecommendationResult:
+        graph = self.graph
+        return RecommendationResult(
+            document_name=graph.doc_names[doc_id],
+            title=graph.doc_titles[doc_id],
+            category=graph.categories[int(self.doc_category[doc_id])],
+            relevance_score=score,
+            quality_score=float(self.doc_quality[doc_id]),
+            importance=float(self.doc_importance[doc_id]),
+            match_reasons=match_reasons,
+            preview=graph.doc_descriptions[doc_id][:200]
+        )
+    
+    # ---- 推荐策略 ----
+    
+    @profiled("search_by_keywords")
+    def search_by_keywords(self, keywords: List[str], limit: int = 10) -> List[RecommendationResult]:
+        """基于关键词搜索"""
+        scores, touched = self._score_keywords(keywords)
+        reasons = [f"匹配关键词: {', '.join(keywords)}"]
+        return [
+            self._result(doc_id, score, list(reasons))
+            for doc_id, score in self._rank(scores, self._candidates(touched), limit)
+        ]
+    
+    @profiled("recommend_by_concepts")
     def recommend_by_concepts(self, concepts: List[str], limit: int = 10) -> List[RecommendationResult]:
         """基于概念推荐"""
-        results = []
-        concept_scores = defaultdict(float)
+        scores, touched = self._score_concepts(concepts)
         
-        # 计算每个文档的概念匹配分数
-        for concept in concepts:
-            if concept in self.concept_index:
-                concept_weight = self.concepts[concept]["importance"]
-                for doc_name in self.concept_index[concept]:
-                    concept_scores[doc_name] += concept_weight
-        
-        # 归一化分数
-        max_score = max(concept_scores.values()) if concept_scores else 1
-        for doc_name in concept_scores:
-            concept_scores[doc_name] = concept_scores[doc_name] / max_score
-        
-        # 生成推荐结果
-        for doc_name, score in sorted(concept_scores.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            doc = self.documents[doc_name]
-            matched_concepts = [c for c in concepts if c in doc["concepts"]]
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=doc["title"],
-                category=doc["category"],
-                relevance_score=score,
-                quality_score=doc["quality_score"],
-                importance=doc["importance"],
-                match_reasons=[f"匹配概念: {', '.join(matched_concepts)}"],
-                preview=doc.get("description", "")[:200]
-            )
-            results.append(result)
+        results = []
+        for doc_id, score in self._rank(scores, self._candidates(touched), limit):
+            doc_concepts = set(self.graph.concept_names[i] for i in self.graph.doc_concept_ids(doc_id))
+            matched_concepts = [c for c in concepts if c in doc_concepts]
+            results.append(self._result(doc_id, score, [f"匹配概念: {', '.join(matched_concepts)}"]))
         
         return results
     
+    @profiled("recommend_by_document")
     def recommend_by_document(self, document_name: str, limit: int = 10) -> List[RecommendationResult]:
         """基于文档推荐相关文档"""
-        results = []
-        
-        if document_name not in self.documents:
-            return results
-        
-        doc = self.documents[document_name]
-        doc_scores = defaultdict(float)
-        
-        # 基于引用关系推荐
-        if document_name in self.reference_index:
-            for ref_doc in self.reference_index[document_name]:
-                doc_scores[ref_doc] += 0.3
-        
-        # 基于被引用关系推荐
-        if document_name in self.referenced_by_index:
-            for ref_doc in self.referenced_by_index[document_name]:
-                doc_scores[ref_doc] += 0.4
+        doc_id = self._doc_id(document_name)
+        if doc_id is None:
+            return []
         
-        # 基于共享概念推荐
-        for concept in doc["concepts"]:
-            if concept in self.concept_index:
-                for other_doc in self.concept_index[concept]:
-                    if other_doc != document_name:
-                        doc_scores[other_doc] += 0.2
+        graph = self.graph
+        scores, candidates = self._score_document(doc_id)
+        references = set(graph.reference_ids(doc_id).tolist())
+        referenced_by = set(graph.referenced_by_ids(doc_id).tolist())
+        doc_concepts = [graph.concept_names[i] for i in dict.fromkeys(graph.doc_concept_ids(doc_id).tolist())]
         
-        # 基于相同分类推荐
-        for other_doc in self.category_index[doc["category"]]:
-            if other_doc != document_name:
-                doc_scores[other_doc] += 0.1
-        
-        # 排除当前文档
-        if document_name in doc_scores:
-            del doc_scores[document_name]
-        
-        # 归一化分数
-        max_score = max(doc_scores.values()) if doc_scores else 1
-        for doc_name in doc_scores:
-            doc_scores[doc_name] = doc_scores[doc_name] / max_score
-        
-        # 生成推荐结果
-        for doc_name, score in sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            other_doc = self.documents[doc_name]
-            
+        results = []
+        for other_id, score in self._rank(scores, candidates, limit):
             # 计算匹配原因
             match_reasons = []
-            if document_name in self.reference_index and doc_name in self.reference_index[document_name]:
+            if other_id in references:
                 match_reasons.append("被当前文档引用")
-            if document_name in self.referenced_by_index and doc_name in self.referenced_by_index[document_name]:
+            if other_id in referenced_by:
                 match_reasons.append("引用当前文档")
             
-            shared_concepts = set(doc["concepts"]) & set(other_doc["concepts"])
+            other_concepts = set(graph.doc_concept_ids(other_id).tolist())
+            shared_concepts = [c for c in doc_concepts if graph.concept_names.get(c) in other_concepts]
             if shared_concepts:
-                match_reasons.append(f"共享概念: {', '.join(list(shared_concepts)[:3])}")
+                match_reasons.append(f"共享概念: {', '.join(shared_concepts[:3])}")
             
-            if other_doc["category"] == doc["category"]:
+            if self.doc_category[other_id] == self.doc_category[doc_id]:
                 match_reasons.append("相同分类")
             
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=other_doc["title"],
-                category=other_doc["category"],
-                relevance_score=score,
-                quality_score=other_doc["quality_score"],
-                importance=other_doc["importance"],
-                match_reasons=match_reasons,
-                preview=other_doc.get("description", "")[:200]
-            )
-            results.append(result)
+            results.append(self._result(other_id, score, match_reasons))
         
         return results
     
+    @profiled("recommend_by_category")
     def recommend_by_category(self, category: str, limit: int = 10) -> List[RecommendationResult]:
         """基于分类推荐"""
-        results = []
-        
-        if category not in self.category_index:
-            return results
-        
-        # 获取该分类下的所有文档
-        doc_names = list(self.category_index[category])
-        
-        # 按重要性和质量评分排序
-        sorted_docs = sorted(
-            doc_names,
-            key=lambda x: (self.documents[x]["importance"], self.documents[x]["quality_score"]),
-            reverse=True
-        )[:limit]
-        
-        # 生成推荐结果
-        for doc_name in sorted_docs:
-            doc = self.documents[doc_name]
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=doc["title"],
-                category=doc["category"],
-                relevance_score=doc["importance"],
-                quality_score=doc["quality_score"],
-                importance=doc["importance"],
-                match_reasons=[f"分类: {category}"],
-                preview=doc.get("description", "")[:200]
-            )
-            results.append(result)
-        
-        return results
+        category_id = self.graph.categories.get(category)
+        if category_id is None:
+            return []
+        
+        # 该分类下的文档，按重要性和质量评分排序
+        ids = self.category_members[category_id]
+        order = np.lexsort((ids, -self.doc_quality[ids], -self.doc_importance[ids]))[:limit]
+        
+        return [
+            self._result(int(ids[i]), float(self.doc_importance[ids[i]]), [f"分类: {category}"])
+            for i in order
+        ]
     
-    def personalized_recommend(self, user_context: UserContext, limit: int = 10) -> List[RecommendationResult]:
-        """个性化推荐"""
-        results = []
-        doc_scores = defaultdict(float)
+    def _personalized_scores(self, user_context: UserContext) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.zeros(self.num_documents)
+        touched = []
         
-        # 基于查看历史推荐
+        # 基于查看历史推荐：与查看过的文档相关的前5个文档
         for viewed_doc in user_context.viewed_documents:
-            if viewed_doc in self.documents:
-                # 推荐与查看过的文档相关的文档
-                related_docs = self.recommend_by_document(viewed_doc, limit=5)
-                for related in related_docs:
-                    doc_scores[related.document_name] += 0.3
-        
-        # 基于兴趣标签推荐
+            doc_id = self._doc_id(viewed_doc)
+            if doc_id is None:
+                continue
+            related = [other_id for other_id, _ in self._rank(*self._score_document(doc_id), 5)]
+            scores[related] += 0.3
+            touched.append(np.array(related, dtype=np.int64))
+        
+        # 基于兴趣标签推荐：关键词匹配0.2，概念匹配0.3
         for interest in user_context.interests:
-            # 关键词匹配
-            if interest.lower() in self.keyword_index:
-                for doc_name in self.keyword_index[interest.lower()]:
-                    doc_scores[doc_name] += 0.2
-            
-            # 概念匹配
-            if interest in self.concept_index:
-                for doc_name in self.concept_index[interest]:
-                    doc_scores[doc_name] += 0.3
+            self._score_keywords([interest], 0.2, scores, touched)
+            self._score_concepts([interest], 0.3, scores, touched)
         
         # 排除已查看的文档
-        for viewed_doc in user_context.viewed_documents:
-            if viewed_doc in doc_scores:
-                del doc_scores[viewed_doc]
-        
-        # 归一化分数
-        max_score = max(doc_scores.values()) if doc_scores else 1
-        for doc_name in doc_scores:
-            doc_scores[doc_name] = doc_scores[doc_name] / max_score
-        
-        # 生成推荐结果
-        for doc_name, score in sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)[:limit]:
-            doc = self.documents[doc_name]
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=doc["title"],
-                category=doc["category"],
-                relevance_score=score,
-                quality_score=doc["quality_score"],
-                importance=doc["importance"],
-                match_reasons=["个性化推荐"],
-                preview=doc.get("description", "")[:200]
-            )
-            results.append(result)
+        viewed_ids = [self._doc_id(name) for name in user_context.viewed_documents]
+        scores[[i for i in viewed_ids if i is not None]] = 0.0
         
-        return results
+        return scores, self._candidates(touched)
+    
+    @profiled("personalized_recommend")
+    def personalized_recommend(self, user_context: UserContext, limit: int = 10) -> List[RecommendationResult]:
+        """个性化推荐"""
+        return [
+            self._result(doc_id, score, ["个性化推荐"])
+            for doc_id, score in self._rank(*self._personalized_scores(user_context), limit)
+        ]
     
+    @profiled("hybrid_recommend")
     def hybrid_recommend(self, query: str, user_context: Optional[UserContext] = None, limit: int = 10) -> List[RecommendationResult]:
         """混合推荐（综合多种推荐策略）"""
-        results = []
-        doc_scores = defaultdict(float)
+        scores = np.zeros(self.num_documents)
+        touched = []
         
-        # 提取查询关键词
-        keywords = self.extract_keywords(query)
+        def blend(ranked: List[Tuple[int, float]], weight: float):
+            ids = np.array([doc_id for doc_id, _ in ranked], dtype=np.int64)
+            scores[ids] += np.array([score for _, score in ranked]) * weight
+            touched.append(ids)
         
         # 1. 关键词搜索（权重0.4）
-        keyword_results = self.search_by_keywords(keywords, limit=20)
-        for result in keyword_results:
-            doc_scores[result.document_name] += result.relevance_score * 0.4
+        keywords = self.extract_keywords(query)
+        keyword_scores, keyword_touched = self._score_keywords(keywords)
+        blend(self._rank(keyword_scores, self._candidates(keyword_touched), 20), 0.4)
         
         # 2. 概念推荐（权重0.3）
         concepts = self.extract_concepts(query)
-        concept_results = self.recommend_by_concepts(concepts, limit=20)
-        for result in concept_results:
-            doc_scores[result.document_name] += result.relevance_score * 0.3
+        concept_scores, concept_touched = self._score_concepts(concepts)
+        blend(self._rank(concept_scores, self._candidates(concept_touched), 20), 0.3)
         
         # 3. 基于当前文档推荐（权重0.2）
         if user_context and user_context.current_document:
-            doc_results = self.recommend_by_document(user_context.current_document, limit=20)
-            for result in doc_results:
-                doc_scores[result.document_name] += result.relevance_score * 0.2
+            doc_id = self._doc_id(user_context.current_document)
+            if doc_id is not None:
+                blend(self._rank(*self._score_document(doc_id), 20), 0.2)
         
         # 4. 个性化推荐（权重0.1）
         if user_context:
-            personalized_results = self.personalized_recommend(user_context, limit=20)
-            for result in personalized_results:
-                doc_scores[result.document_name] += result.relevance_score * 0.1
+            blend(self._rank(*self._personalized_scores(user_context), 20), 0.1)
         
         # 排序并生成最终结果
-        sorted_docs = sorted(doc_scores.items(), key=lambda x: x[1], reverse=True)[:limit]
-        
-        for doc_name, score in sorted_docs:
-            doc = self.documents[doc_name]
-            
+        keyword_ids = [(kw, self.folded_keyword_ids.get(kw.lower())) for kw in keywords]
+        results = []
+        for doc_id, _ in self._rank(scores, self._candidates(touched), limit):
             # 收集所有匹配原因
             match_reasons = []
             if keywords:
-                matched_keywords = [kw for kw in keywords if kw.lower() in [k.lower() for k in doc["keywords"]]]
+                doc_keywords = self._doc_keyword_set(doc_id)
+                matched_keywords = [kw for kw, kw_id in keyword_ids if kw_id in doc_keywords]
                 if matched_keywords:
                     match_reasons.append(f"匹配关键词: {', '.join(matched_keywords[:3])}")
             
             if concepts:
-                matched_concepts = [c for c in concepts if c in doc["concepts"]]
+                doc_concepts = set(self.graph.doc_concept_ids(doc_id).tolist())
+                matched_concepts = [c for c in concepts if self.graph.concept_names.get(c) in doc_concepts]
                 if matched_concepts:
                     match_reasons.append(f"匹配概念: {', '.join(matched_concepts[:3])}")
             
-            result = RecommendationResult(
-                document_name=doc_name,
-                title=doc["title"],
-                category=doc["category"],
-                relevance_score=score,
-                quality_score=doc["quality_score"],
-                importance=doc["importance"],
-                match_reasons=match_reasons,
-                preview=doc.get("description", "")[:200]
-            )
-            results.append(result)
+            results.append(self._result(doc_id, float(scores[doc_id]), match_reasons))
         
         return results
     
     def extract_keywords(self, text: str) -> List[str]:
         """提取关键词"""
         keywords = []
+        tokens = self.query_tokenizer.tokens(text)
         
-        # 匹配大写开头的单词
-        words = re.findall(r'\b[A-Z][a-zA-Z]{2,}\b', text)
-        keywords.extend(words)
+        # 匹配大写开头的单词（按中英文切分，紧挨中文的英文单词也能识别）
+        keywords.extend(token for token in tokens if CAPITALIZED_WORD_RE.fullmatch(token))
         
         # 匹配常见技术术语
-        tech_terms = re.findall(
-            r'\b(?:架构|设计|开发|测试|部署|API|接口|服务|模块|组件|系统|平台|应用|数据库|缓存|消息队列|监控|日志|安全|性能|优化)\b',
-            text
-        )
-        keywords.extend(tech_terms)
+        keywords.extend(token for token in tokens if token in self.tech_terms)
         
-        # 去重并限制数量
-        return list(set(keywords))[:10]
+        # 去重（保持首次出现的顺序）并限制数量
+        return list(dict.fromkeys(keywords))[:10]
     
     def extract_concepts(self, text: str) -> List[str]:
         """提取概念"""
-        concepts = []
-        
-        # 匹配预定义概念
-        for concept_name in self.concepts.keys():
-            if concept_name in text:
-                concepts.append(concept_name)
-        
-        return concepts
+        # 匹配预定义概念，按概念在图谱中的顺序返回
+        found = self.concept_matcher.find_all(text)
+        return sorted(found, key=self.graph.concept_names.get)
     
+    @profiled("save_recommendation_report")
     def save_recommendation_report(self, results: List[RecommendationResult], output_file: Path, query: str = ""):
         """保存推荐报告"""
         output_file.parent.mkdir(exist_ok=True)
@@ -499,6 +505,7 @@ def main():
     parser.add_argument('--output-dir', type=str,
                        default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环/YYC3-Cater-审核报告',
                        help='输出目录')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -511,53 +518,54 @@ def main():
     print("=" * 80)
     print()
     
-    # 初始化推荐系统
-    recommender = IntelligentDocumentRecommender(args.graph_file)
-    
-    # 执行推荐
-    results = []
-    
-    if args.type == 'keyword':
-        keywords = args.query.split()
-        results = recommender.search_by_keywords(keywords, args.limit)
-    elif args.type == 'concept':
-        concepts = recommender.extract_concepts(args.query)
-        results = recommender.recommend_by_concepts(concepts, args.limit)
-    elif args.type == 'document':
-        if not args.document:
-            print("错误: 需要指定 --document 参数")
-            return
-        results = recommender.recommend_by_document(args.document, args.limit)
-    elif args.type == 'category':
-        if not args.category:
-            print("错误: 需要指定 --category 参数")
-            return
-        results = recommender.recommend_by_category(args.category, args.limit)
-    elif args.type == 'personalized':
-        user_context = UserContext(
-            current_document=args.document,
-            interests=args.query.split()
-        )
-        results = recommender.personalized_recommend(user_context, args.limit)
-    elif args.type == 'hybrid':
-        user_context = UserContext(current_document=args.document)
-        results = recommender.hybrid_recommend(args.query, user_context, args.limit)
-    
-    # 显示结果
-    print(f"\n找到 {len(results)} 个推荐结果:\n")
-    print("=" * 120)
-    print(f"{'排名':<6}{'文档名称':<35}{'分类':<12}{'相关性':<10}{'质量':<8}{'重要性':<10}{'匹配原因'}")
-    print("=" * 120)
-    
-    for i, result in enumerate(results, 1):
-        reasons = "; ".join(result.match_reasons[:2])
-        print(f"{i:<6}{result.document_name[:35]:<35}{result.category:<12}{result.relevance_score:.3f}{'':<6}{result.quality_score:.1f}{'':<4}{result.importance:.3f}{'':<6}{reasons[:40]}")
-    
-    print("=" * 120)
-    
-    # 保存报告
-    output_file = Path(args.output_dir) / f"YYC3-文档推荐报告_{args.type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-    recommender.save_recommendation_report(results, output_file, args.query)
+    with profiling_from_args(args):
+        # 初始化推荐系统
+        recommender = IntelligentDocumentRecommender(args.graph_file)
+    
+        # 执行推荐
+        results = []
+    
+        if args.type == 'keyword':
+            keywords = args.query.split()
+            results = recommender.search_by_keywords(keywords, args.limit)
+        elif args.type == 'concept':
+            concepts = recommender.extract_concepts(args.query)
+            results = recommender.recommend_by_concepts(concepts, args.limit)
+        elif args.type == 'document':
+            if not args.document:
+                print("错误: 需要指定 --document 参数")
+                return
+            results = recommender.recommend_by_document(args.document, args.limit)
+        elif args.type == 'category':
+            if not args.category:
+                print("错误: 需要指定 --category 参数")
+                return
+            results = recommender.recommend_by_category(args.category, args.limit)
+        elif args.type == 'personalized':
+            user_context = UserContext(
+                current_document=args.document,
+                interests=args.query.split()
+            )
+            results = recommender.personalized_recommend(user_context, args.limit)
+        elif args.type == 'hybrid':
+            user_context = UserContext(current_document=args.document)
+            results = recommender.hybrid_recommend(args.query, user_context, args.limit)
+    
+        # 显示结果
+        print(f"\n找到 {len(results)} 个推荐结果:\n")
+        print("=" * 120)
+        print(f"{'排名':<6}{'文档名称':<35}{'分类':<12}{'相关性':<10}{'质量':<8}{'重要性':<10}{'匹配原因'}")
+        print("=" * 120)
+    
+        for i, result in enumerate(results, 1):
+            reasons = "; ".join(result.match_reasons[:2])
+            print(f"{i:<6}{result.document_name[:35]:<35}{result.category:<12}{result.relevance_score:.3f}{'':<6}{result.quality_score:.1f}{'':<4}{result.importance:.3f}{'':<6}{reasons[:40]}")
+    
+        print("=" * 120)
+    
+        # 保存报告
+        output_file = Path(args.output_dir) / f"YYC3-文档推荐报告_{args.type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        recommender.save_recommendation_report(results, output_file, args.query)
     
     print(f"\n✓ 推荐完成！")
 
@@ -13,14 +13,60 @@
 """
 
 import os
+import re
 import json
-import subprocess
+import posixpath
+import sqlite3
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from yyc3_doc_diff import MISSING_BLOB, DiffCache, DocumentDiff, SectionChange
+from yyc3_git import GitError, GitRepository
+from yyc3_profiling import add_profile_arguments, profiled, profiling_from_args
+
+
+# 批量创建版本时按变更行数（新增+删除）决定语义化版本的升级级别
+DEFAULT_MINOR_CHANGE_LINES = 20
+DEFAULT_MAJOR_CHANGE_LINES = 200
+INITIAL_VERSION = "1.0.0"
+
+SEMVER_RE = re.compile(r'^v?(\d+)(?:\.(\d+))?(?:\.(\d+))?')
+
+
+def change_level(changed_lines: int, minor_lines: int = DEFAULT_MINOR_CHANGE_LINES,
+                 major_lines: int = DEFAULT_MAJOR_CHANGE_LINES) -> str:
+    """根据变更行数返回版本升级级别：major / minor / patch"""
+    if changed_lines >= major_lines:
+        return "major"
+    if changed_lines >= minor_lines:
+        return "minor"
+    return "patch"
+
+
+def bump_version(version: Optional[str], level: str) -> str:
+    """
+    计算下一个语义化版本号
+    
+    Args:
+        version: 当前版本号（无版本时为None）
+        level: major / minor / patch
+        
+    Returns:
+        str: 新版本号，无法解析的旧版本号从 1.0.0 重新开始
+    """
+    match = SEMVER_RE.match(version or "")
+    if not match:
+        return INITIAL_VERSION
+    major, minor, patch = (int(part or 0) for part in match.groups())
+    if level == "major":
+        return f"{major + 1}.0.0"
+    if level == "minor":
+        return f"{major}.{minor + 1}.0"
+    return f"{major}.{minor}.{patch + 1}"
+
 
 class VersionStatus(Enum):
     """版本状态枚举"""
@@ -55,6 +101,229 @@ class VersionDiff:
     additions: int
     deletions: int
     changes_summary: str
+    sections: List[SectionChange] = field(default_factory=list)  # 章节（## 标题）级变更
+    unified_diff: List[str] = field(default_factory=list)
+
+
+class VersionStore:
+    """
+    版本数据库：SQLite中的追加写入表
+    
+    每个版本一行，按插入顺序（id）即为文档的版本顺序；
+    (doc_name, version)、status、author、created_at 上建有索引，
+    写入只插入/更新一行，查询走索引而不是加载全部历史。
+    """
+    
+    COLUMNS = "doc_name, version, status, created_at, author, commit_hash, message, changes, metadata"
+    
+    def __init__(self, db_path: Path):
+        """
+        初始化版本数据库
+        
+        Args:
+            db_path: SQLite数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS versions ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " doc_name TEXT NOT NULL, version TEXT NOT NULL, status TEXT NOT NULL,"
+            " created_at TEXT NOT NULL, author TEXT NOT NULL, commit_hash TEXT NOT NULL,"
+            " message TEXT NOT NULL, changes TEXT NOT NULL, metadata TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_versions_doc_version ON versions (doc_name, version);"
+            "CREATE INDEX IF NOT EXISTS idx_versions_status ON versions (status);"
+            "CREATE INDEX IF NOT EXISTS idx_versions_author ON versions (author);"
+            "CREATE INDEX IF NOT EXISTS idx_versions_created_at ON versions (created_at);"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self._conn.commit()
+    
+    @staticmethod
+    def _to_row(v: DocumentVersion) -> Tuple:
+        return (
+            v.doc_name, v.version, v.status.value, v.created_at, v.author, v.commit_hash, v.message,
+            json.dumps(v.changes, ensure_ascii=False), json.dumps(v.metadata, ensure_ascii=False)
+        )
+    
+    @staticmethod
+    def _from_row(row: Tuple) -> DocumentVersion:
+        return DocumentVersion(
+            doc_name=row[0],
+            version=row[1],
+            status=VersionStatus(row[2]),
+            created_at=row[3],
+            author=row[4],
+            commit_hash=row[5],
+            message=row[6],
+            changes=json.loads(row[7]),
+            metadata=json.loads(row[8])
+        )
+    
+    def _select(self, where: str = "", params: Tuple = (), suffix: str = "ORDER BY id") -> List[DocumentVersion]:
+        sql = f"SELECT {self.COLUMNS} FROM versions {where} {suffix}"
+        return [self._from_row(row) for row in self._conn.execute(sql, params)]
+    
+    def add(self, version: DocumentVersion):
+        """追加一个版本"""
+        self.add_many([version])
+    
+    def add_many(self, versions: Iterable[DocumentVersion]) -> int:
+        """在一个事务中追加多个版本，返回写入数"""
+        with self._conn:
+            cursor = self._conn.executemany(
+                f"INSERT INTO versions ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._to_row(v) for v in versions)
+            )
+        return cursor.rowcount
+    
+    def get_versions(self, doc_name: str) -> List[DocumentVersion]:
+        """文档的全部版本（按创建顺序）"""
+        return self._select("WHERE doc_name = ?", (doc_name,))
+    
+    def get_latest(self, doc_name: str) -> Optional[DocumentVersion]:
+        """文档的最新版本"""
+        rows = self._select("WHERE doc_name = ?", (doc_name,), "ORDER BY id DESC LIMIT 1")
+        return rows[0] if rows else None
+    
+    def get_latest_many(self, doc_names: Iterable[str]) -> Dict[str, DocumentVersion]:
+        """批量获取多个文档的最新版本"""
+        doc_names = list(doc_names)
+        latest = {}
+        for start in range(0, len(doc_names), 500):
+            chunk = doc_names[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for v in self._select(
+                f"WHERE id IN (SELECT MAX(id) FROM versions WHERE doc_name IN ({placeholders}) GROUP BY doc_name)",
+                tuple(chunk)
+            ):
+                latest[v.doc_name] = v
+        return latest
+    
+    def get_version(self, doc_name: str, version: str) -> Optional[DocumentVersion]:
+        """按版本号查找（同一版本号有多条时取最早的一条）"""
+        rows = self._select("WHERE doc_name = ? AND version = ?", (doc_name, version), "ORDER BY id LIMIT 1")
+        return rows[0] if rows else None
+    
+    def update_status(self, doc_name: str, version: str, status: VersionStatus) -> bool:
+        """更新版本状态"""
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE versions SET status = ? WHERE id = ("
+                " SELECT id FROM versions WHERE doc_name = ? AND version = ? ORDER BY id LIMIT 1)",
+                (status.value, doc_name, version)
+            )
+        return cursor.rowcount > 0
+    
+    def find(
+        self,
+        status: Optional[VersionStatus] = None,
+        author: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[DocumentVersion]:
+        """按状态、作者、创建时间范围查询版本（created_at 为ISO格式，可直接比较）"""
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status.value)
+        if author is not None:
+            conditions.append("author = ?")
+            params.append(author)
+        if created_after is not None:
+            conditions.append("created_at >= ?")
+            params.append(created_after)
+        if created_before is not None:
+            conditions.append("created_at < ?")
+            params.append(created_before)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        suffix = "ORDER BY created_at, id" + (f" LIMIT {int(limit)}" if limit else "")
+        return self._select(where, tuple(params), suffix)
+    
+    def doc_names(self) -> List[str]:
+        """所有文档名称（按首次创建版本的顺序）"""
+        return [row[0] for row in self._conn.execute(
+            "SELECT doc_name FROM versions GROUP BY doc_name ORDER BY MIN(id)"
+        )]
+    
+    def count_versions(self) -> int:
+        """版本总数"""
+        return self._conn.execute("SELECT COUNT(*) FROM versions").fetchone()[0]
+    
+    def status_counts(self) -> Dict[str, int]:
+        """各状态的版本数"""
+        return dict(self._conn.execute("SELECT status, COUNT(*) FROM versions GROUP BY status"))
+    
+    def document_summaries(self) -> List[Tuple[str, int, DocumentVersion]]:
+        """每个文档的 (名称, 版本数, 最新版本)"""
+        rows = self._conn.execute(
+            f"SELECT v.{self.COLUMNS.replace(', ', ', v.')}, s.n FROM versions v JOIN ("
+            " SELECT MAX(id) AS id, COUNT(*) AS n FROM versions GROUP BY doc_name) s ON v.id = s.id"
+            " ORDER BY v.doc_name"
+        ).fetchall()
+        return [(row[0], row[-1], self._from_row(row[:-1])) for row in rows]
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def set_meta(self, key: str, value: str):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, value))
+    
+    @profiled("migrate_from_json")
+    def migrate_from_json(self, json_path: Path) -> int:
+        """
+        从旧版JSON版本数据库导入（每个JSON文件只导入一次）
+        
+        Args:
+            json_path: JSON版本数据库路径
+            
+        Returns:
+            int: 导入的版本数
+        """
+        json_path = Path(json_path)
+        marker = f"migrated:{json_path.resolve()}"
+        if self.get_meta(marker):
+            return 0
+        
+        with open(json_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        versions = [
+            DocumentVersion(
+                doc_name=v['doc_name'],
+                version=v['version'],
+                status=VersionStatus(v['status']),
+                created_at=v['created_at'],
+                author=v['author'],
+                commit_hash=v['commit_hash'],
+                message=v['message'],
+                changes=v['changes'],
+                metadata=v.get('metadata', {})
+            )
+            for doc_versions in data.values()
+            for v in doc_versions
+        ]
+        
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO versions ({self.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._to_row(v) for v in versions)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                (marker, datetime.now().isoformat())
+            )
+        return len(versions)
+    
+    def close(self):
+        """关闭数据库"""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
 
 
 class DocumentVersionManager:
@@ -66,137 +335,96 @@ class DocumentVersionManager:
         
         Args:
             docs_dir: 文档目录路径
-            version_db_path: 版本数据库路径
+            version_db_path: 版本数据库路径（.json 路径会使用同名的 .sqlite3 数据库，并一次性导入原JSON）
         """
         self.docs_dir = Path(docs_dir)
         self.version_db_path = Path(version_db_path)
-        self.version_db = self._load_version_db()
         
         # 确保目录存在
         self.docs_dir.mkdir(parents=True, exist_ok=True)
         self.version_db_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    def _load_version_db(self) -> Dict[str, List[DocumentVersion]]:
-        """加载版本数据库"""
-        if not self.version_db_path.exists():
-            return {}
         
-        try:
-            with open(self.version_db_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # 转换为DocumentVersion对象
-                version_db = {}
-                for doc_name, versions in data.items():
-                    version_db[doc_name] = [
-                        DocumentVersion(
-                            doc_name=v['doc_name'],
-                            version=v['version'],
-                            status=VersionStatus(v['status']),
-                            created_at=v['created_at'],
-                            author=v['author'],
-                            commit_hash=v['commit_hash'],
-                            message=v['message'],
-                            changes=v['changes'],
-                            metadata=v.get('metadata', {})
-                        )
-                        for v in versions
-                    ]
-                return version_db
-        except Exception as e:
-            print(f"✗ 加载版本数据库失败: {e}")
-            return {}
+        if self.version_db_path.suffix == '.json':
+            legacy_json = self.version_db_path
+            self.version_db_path = self.version_db_path.with_suffix('.sqlite3')
+        else:
+            legacy_json = self.version_db_path.with_suffix('.json')
+        self.store = VersionStore(self.version_db_path)
+        if legacy_json.exists():
+            self._migrate_version_db(legacy_json)
+        
+        # Git访问层：HEAD直接读引用文件，差异统计和文件内容批量获取
+        self.git = GitRepository(self.docs_dir)
+        self._diff_cache: Optional[DiffCache] = None
+    
+    @property
+    def diff_cache(self) -> DiffCache:
+        """按 (blob_a, blob_b) 缓存的文档差异"""
+        if self._diff_cache is None:
+            self._diff_cache = DiffCache()
+        return self._diff_cache
+    
+    def close(self):
+        """释放Git访问层持有的子进程并关闭版本数据库"""
+        self.git.close()
+        self.store.close()
+        if self._diff_cache is not None:
+            self._diff_cache.close()
     
-    def _save_version_db(self):
-        """保存版本数据库"""
+    def _migrate_version_db(self, json_path: Path):
+        """从旧版JSON版本数据库迁移"""
         try:
-            # 转换为可序列化的字典
-            data = {}
-            for doc_name, versions in self.version_db.items():
-                data[doc_name] = [
-                    {
-                        'doc_name': v.doc_name,
-                        'version': v.version,
-                        'status': v.status.value,
-                        'created_at': v.created_at,
-                        'author': v.author,
-                        'commit_hash': v.commit_hash,
-                        'message': v.message,
-                        'changes': v.changes,
-                        'metadata': v.metadata
-                    }
-                    for v in versions
-                ]
-            
-            with open(self.version_db_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-            
-            print(f"✓ 版本数据库已保存: {self.version_db_path}")
+            count = self.store.migrate_from_json(json_path)
+            if count:
+                print(f"✓ 已从JSON版本数据库迁移 {count} 个版本: {json_path} -> {self.version_db_path}")
         except Exception as e:
-            print(f"✗ 保存版本数据库失败: {e}")
+            print(f"✗ 迁移JSON版本数据库失败: {e}")
     
+    @profiled("_get_git_commit_hash")
     def _get_git_commit_hash(self) -> str:
         """获取当前Git提交哈希"""
         try:
-            result = subprocess.run(
-                ['git', 'rev-parse', 'HEAD'],
-                cwd=self.docs_dir,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return result.stdout.strip()
+            commit_hash = self.git.head()
+            if not commit_hash:
+                raise GitError("HEAD 尚无提交")
+            return commit_hash
         except Exception as e:
             print(f"✗ 获取Git提交哈希失败: {e}")
             return "unknown"
     
+    @profiled("_get_git_diff_stats")
     def _get_git_diff_stats(self, file_path: str) -> Tuple[int, int]:
         """获取文件的Git差异统计"""
-        try:
-            result = subprocess.run(
-                ['git', 'diff', '--shortstat', file_path],
-                cwd=self.docs_dir,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            output = result.stdout.strip()
-            
-            # 解析差异统计
-            additions = 0
-            deletions = 0
-            
-            if 'insertion' in output:
-                parts = output.split()
-                for i, part in enumerate(parts):
-                    if 'insertion' in part:
-                        additions = int(parts[i-1])
-            
-            if 'deletion' in output:
-                parts = output.split()
-                for i, part in enumerate(parts):
-                    if 'deletion' in part:
-                        deletions = int(parts[i-1])
+        return self._get_git_diff_stats_batch([file_path]).get(file_path, (0, 0))
+    
+    @profiled("_get_git_diff_stats_batch")
+    def _get_git_diff_stats_batch(self, file_paths: List[str]) -> Dict[str, Tuple[int, int]]:
+        """
+        一次git调用获取多个文件的差异统计（工作区相对索引）
+        
+        Args:
+            file_paths: 文件路径列表（相对文档目录或绝对路径）
             
-            return additions, deletions
+        Returns:
+            Dict[str, Tuple[int, int]]: 文件路径 -> (新增行数, 删除行数)
+        """
+        try:
+            stats = self.git.numstat(file_paths)
+            return {path: stats.get(self.git.repo_path(path), (0, 0)) for path in file_paths}
         except Exception as e:
             print(f"✗ 获取Git差异统计失败: {e}")
-            return 0, 0
+            return {path: (0, 0) for path in file_paths}
     
+    @profiled("_get_changed_files")
     def _get_changed_files(self) -> List[str]:
         """获取已修改的文件列表"""
         try:
-            result = subprocess.run(
-                ['git', 'diff', '--name-only'],
-                cwd=self.docs_dir,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return [f for f in result.stdout.strip().split('\n') if f]
+            return self.git.changed_files()
         except Exception as e:
             print(f"✗ 获取已修改文件失败: {e}")
             return []
     
+    @profiled("create_version")
     def create_version(
         self,
         doc_name: str,
@@ -238,18 +466,130 @@ class DocumentVersionManager:
             metadata=metadata or {}
         )
         
-        # 添加到版本数据库
-        if doc_name not in self.version_db:
-            self.version_db[doc_name] = []
-        
-        self.version_db[doc_name].append(doc_version)
-        
-        # 保存版本数据库
-        self._save_version_db()
+        # 追加到版本数据库
+        self.store.add(doc_version)
         
         print(f"✓ 版本已创建: {doc_name} v{version}")
         return doc_version
     
+    @profiled("_get_document_changes")
+    def _get_document_changes(
+        self,
+        rev_range: Optional[str] = None,
+        paths: Optional[List[str]] = None
+    ) -> Dict[str, Tuple[int, int]]:
+        """
+        一次git调用获取文档目录下有变更的Markdown文档及其增删行数
+        
+        Args:
+            rev_range: Git修订范围（如 v1.0..HEAD），None 表示工作区相对HEAD的改动
+            paths: 只统计这些文件（相对文档目录或绝对路径）
+            
+        Returns:
+            Dict[str, Tuple[int, int]]: 文档名称 -> (新增行数, 删除行数)，已删除的文档不包含在内
+        """
+        stats = self.git.numstat(paths, rev_a=rev_range or 'HEAD', diff_filter='d')
+        docs_root = self.git.repo_path('.')
+        changes = {}
+        for path, counts in stats.items():
+            if not path.endswith('.md'):
+                continue
+            relative = posixpath.relpath(path, docs_root)
+            if relative.startswith('../'):
+                continue
+            changes[relative[:-len('.md')]] = counts
+        return changes
+    
+    def _resolve_range_end(self, rev_range: Optional[str]) -> str:
+        """版本范围终点的提交哈希（工作区改动记为HEAD）"""
+        end = rev_range.split('..')[-1].lstrip('.') if rev_range and '..' in rev_range else ''
+        if not end:
+            return self._get_git_commit_hash()
+        return self.git.rev_parse(f"{end}^{{commit}}") or "unknown"
+    
+    @profiled("create_versions_bulk")
+    def create_versions_bulk(
+        self,
+        status: VersionStatus,
+        author: str,
+        message: str,
+        changes: Optional[List[str]] = None,
+        rev_range: Optional[str] = None,
+        paths: Optional[List[str]] = None,
+        minor_lines: int = DEFAULT_MINOR_CHANGE_LINES,
+        major_lines: int = DEFAULT_MAJOR_CHANGE_LINES,
+        dry_run: bool = False
+    ) -> List[DocumentVersion]:
+        """
+        为所有有变更的文档批量创建版本
+        
+        增删行数由一次 git diff --numstat 得到，版本号按变更行数在各文档最新版本上自动升级，
+        所有新版本在一个事务中写入。
+        
+        Args:
+            status: 版本状态
+            author: 作者
+            message: 版本说明
+            changes: 变更列表，为空时使用增删行数
+            rev_range: Git修订范围，None 表示工作区相对HEAD的改动
+            paths: 只为这些文件创建版本
+            minor_lines: 变更行数达到该值时升级次版本号
+            major_lines: 变更行数达到该值时升级主版本号
+            dry_run: 只计算不写入
+            
+        Returns:
+            List[DocumentVersion]: 创建的版本列表
+        """
+        try:
+            doc_changes = self._get_document_changes(rev_range, paths)
+        except Exception as e:
+            print(f"✗ 获取变更文档失败: {e}")
+            return []
+        
+        if not doc_changes:
+            print("✓ 没有需要创建版本的文档")
+            return []
+        
+        commit_hash = self._resolve_range_end(rev_range)
+        latest_versions = self.store.get_latest_many(doc_changes)
+        created_at = datetime.now().isoformat()
+        
+        versions = []
+        for doc_name, (additions, deletions) in sorted(doc_changes.items()):
+            latest = latest_versions.get(doc_name)
+            level = change_level(additions + deletions, minor_lines, major_lines)
+            new_version = bump_version(latest.version, level) if latest else INITIAL_VERSION
+            versions.append(DocumentVersion(
+                doc_name=doc_name,
+                version=new_version,
+                status=status,
+                created_at=created_at,
+                author=author,
+                commit_hash=commit_hash,
+                message=message,
+                changes=changes or [f"新增 {additions} 行，删除 {deletions} 行"],
+                metadata={
+                    'additions': additions,
+                    'deletions': deletions,
+                    'bump': level if latest else 'initial',
+                    'previous_version': latest.version if latest else None,
+                    'range': rev_range or 'working-tree'
+                }
+            ))
+        
+        for v in versions:
+            previous = v.metadata['previous_version']
+            arrow = f"v{previous} -> " if previous else ""
+            print(f"  {v.doc_name}: {arrow}v{v.version} (+{v.metadata['additions']} -{v.metadata['deletions']})")
+        
+        if dry_run:
+            print(f"\n✓ 预览完成，共 {len(versions)} 个文档（未写入）")
+            return versions
+        
+        self.store.add_many(versions)
+        print(f"\n✓ 已批量创建 {len(versions)} 个版本")
+        return versions
+    
     def get_versions(self, doc_name: str) -> List[DocumentVersion]:
         """
         获取文档的所有版本
@@ -260,7 +600,7 @@ class DocumentVersionManager:
         Returns:
             List[DocumentVersion]: 版本列表
         """
-        return self.version_db.get(doc_name, [])
+        return self.store.get_versions(doc_name)
     
     def get_latest_version(self, doc_name: str) -> Optional[DocumentVersion]:
         """
@@ -272,8 +612,7 @@ class DocumentVersionManager:
         Returns:
             Optional[DocumentVersion]: 最新版本对象
         """
-        versions = self.get_versions(doc_name)
-        return versions[-1] if versions else None
+        return self.store.get_latest(doc_name)
     
     def get_version_by_number(self, doc_name: str, version: str) -> Optional[DocumentVersion]:
         """
@@ -286,12 +625,33 @@ class DocumentVersionManager:
         Returns:
             Optional[DocumentVersion]: 版本对象
         """
-        versions = self.get_versions(doc_name)
-        for v in versions:
-            if v.version == version:
-                return v
-        return None
+        return self.store.get_version(doc_name, version)
+    
+    @profiled("find_versions")
+    def find_versions(
+        self,
+        status: Optional[VersionStatus] = None,
+        author: Optional[str] = None,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> List[DocumentVersion]:
+        """
+        按状态、作者和创建时间查询所有文档的版本
+        
+        Args:
+            status: 版本状态
+            author: 作者
+            created_after: 创建时间下限（含，ISO格式，如 2026-10-01）
+            created_before: 创建时间上限（不含）
+            limit: 最多返回的版本数
+            
+        Returns:
+            List[DocumentVersion]: 按创建时间排序的版本列表
+        """
+        return self.store.find(status, author, created_after, created_before, limit)
     
+    @profiled("update_version_status")
     def update_version_status(
         self,
         doc_name: str,
@@ -309,17 +669,89 @@ class DocumentVersionManager:
         Returns:
             bool: 是否成功
         """
-        versions = self.get_versions(doc_name)
-        for v in versions:
-            if v.version == version:
-                v.status = new_status
-                self._save_version_db()
-                print(f"✓ 版本状态已更新: {doc_name} v{version} -> {new_status.value}")
-                return True
+        if self.store.update_status(doc_name, version, new_status):
+            print(f"✓ 版本状态已更新: {doc_name} v{version} -> {new_status.value}")
+            return True
         
         print(f"✗ 版本不存在: {doc_name} v{version}")
         return False
     
+    @profiled("_diff_version_pairs")
+    def _diff_version_pairs(
+        self,
+        doc_name: str,
+        pairs: List[Tuple[DocumentVersion, DocumentVersion]]
+    ) -> List[VersionDiff]:
+        """
+        计算文档在多对版本间的差异
+        
+        先用一次往返取得各版本的blob ID，缓存未命中的差异再一次性读取所需的blob内容。
+        
+        Args:
+            doc_name: 文档名称
+            pairs: (旧版本, 新版本) 列表
+            
+        Returns:
+            List[VersionDiff]: 与 pairs 一一对应的差异
+        """
+        doc_path = self.git.repo_path(f"{doc_name}.md")
+        specs = {v.commit_hash: f"{v.commit_hash}:{doc_path}" for pair in pairs for v in pair}
+        object_ids = self.git.object_ids(specs.values())
+        blob_of = {commit: object_ids[spec] or MISSING_BLOB for commit, spec in specs.items()}
+        
+        diffs: Dict[Tuple[str, str], DocumentDiff] = {}
+        pending = []
+        for v1, v2 in pairs:
+            key = (blob_of[v1.commit_hash], blob_of[v2.commit_hash])
+            if key in diffs:
+                continue
+            if key == (MISSING_BLOB, MISSING_BLOB):
+                raise GitError(f"两个版本的提交中都不存在文档: {doc_path}")
+            if key[0] == key[1]:
+                diffs[key] = DocumentDiff(blob_a=key[0], blob_b=key[1])
+                continue
+            cached = self.diff_cache.get(*key)
+            if cached is not None:
+                diffs[key] = cached
+            else:
+                pending.append(key)
+        
+        if pending:
+            blobs = self.git.cat_objects({oid for key in pending for oid in key if oid != MISSING_BLOB})
+            # 本次算出的差异在一个事务中写入缓存
+            computed = self.diff_cache.compute_many(
+                (blob_a, blob_b,
+                 blobs[blob_a].text() if blob_a != MISSING_BLOB else "",
+                 blobs[blob_b].text() if blob_b != MISSING_BLOB else "")
+                for blob_a, blob_b in pending
+            )
+            diffs.update(zip(pending, computed))
+        
+        results = []
+        for v1, v2 in pairs:
+            diff = diffs[(blob_of[v1.commit_hash], blob_of[v2.commit_hash])]
+            
+            # 生成变更摘要
+            changes_summary = f"从 {v1.version} 到 {v2.version} 的变更："
+            changes_summary += f"\n- 修改文件: {1 if diff.changed else 0} 个"
+            changes_summary += f"\n- 新增行数: {diff.additions}"
+            changes_summary += f"\n- 删除行数: {diff.deletions}"
+            if diff.sections:
+                changes_summary += f"\n- 变更章节: {len(diff.sections)} 个"
+            
+            results.append(VersionDiff(
+                old_version=v1.version,
+                new_version=v2.version,
+                changed_files=[doc_path] if diff.changed else [],
+                additions=diff.additions,
+                deletions=diff.deletions,
+                changes_summary=changes_summary,
+                sections=diff.sections,
+                unified_diff=diff.unified_diff
+            ))
+        return results
+    
+    @profiled("compare_versions")
     def compare_versions(
         self,
         doc_name: str,
@@ -327,7 +759,7 @@ class DocumentVersionManager:
         version2: str
     ) -> Optional[VersionDiff]:
         """
-        比较两个版本
+        比较文档的两个版本（只比较该文档，结果按内容缓存）
         
         Args:
             doc_name: 文档名称
@@ -345,54 +777,33 @@ class DocumentVersionManager:
             return None
         
         try:
-            # 获取两个提交之间的差异
-            result = subprocess.run(
-                ['git', 'diff', '--stat', v1.commit_hash, v2.commit_hash],
-                cwd=self.docs_dir,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            
-            output = result.stdout.strip()
-            
-            # 解析差异统计
-            additions = 0
-            deletions = 0
-            changed_files = []
-            
-            for line in output.split('\n'):
-                if '|' in line:
-                    file_path = line.split('|')[0].strip()
-                    changed_files.append(file_path)
-                    
-                    # 统计增删行数
-                    parts = line.split()
-                    for i, part in enumerate(parts):
-                        if 'insertion' in part:
-                            additions += int(parts[i-1])
-                        if 'deletion' in part:
-                            deletions += int(parts[i-1])
-            
-            # 生成变更摘要
-            changes_summary = f"从 {version1} 到 {version2} 的变更："
-            changes_summary += f"\n- 修改文件: {len(changed_files)} 个"
-            changes_summary += f"\n- 新增行数: {additions}"
-            changes_summary += f"\n- 删除行数: {deletions}"
-            
-            return VersionDiff(
-                old_version=version1,
-                new_version=version2,
-                changed_files=changed_files,
-                additions=additions,
-                deletions=deletions,
-                changes_summary=changes_summary
-            )
-            
+            return self._diff_version_pairs(doc_name, [(v1, v2)])[0]
         except Exception as e:
             print(f"✗ 比较版本失败: {e}")
             return None
     
+    @profiled("compare_history")
+    def compare_history(self, doc_name: str) -> List[VersionDiff]:
+        """
+        比较文档每两个相邻版本
+        
+        Args:
+            doc_name: 文档名称
+            
+        Returns:
+            List[VersionDiff]: 按版本顺序的差异列表
+        """
+        versions = self.get_versions(doc_name)
+        pairs = list(zip(versions, versions[1:]))
+        if not pairs:
+            return []
+        try:
+            return self._diff_version_pairs(doc_name, pairs)
+        except Exception as e:
+            print(f"✗ 比较版本历史失败: {e}")
+            return []
+    
+    @profiled("rollback_version")
     def rollback_version(
         self,
         doc_name: str,
@@ -421,11 +832,7 @@ class DocumentVersionManager:
                 return False
             
             # 使用git checkout恢复文件
-            subprocess.run(
-                ['git', 'checkout', target_ver.commit_hash, '--', str(doc_file)],
-                cwd=self.docs_dir,
-                check=True
-            )
+            self.git.run('checkout', target_ver.commit_hash, '--', str(doc_file))
             
             print(f"✓ 文档已回滚到版本: {doc_name} v{target_version}")
             return True
@@ -434,6 +841,7 @@ class DocumentVersionManager:
             print(f"✗ 回滚版本失败: {e}")
             return False
     
+    @profiled("tag_version")
     def tag_version(
         self,
         doc_name: str,
@@ -460,11 +868,7 @@ class DocumentVersionManager:
         
         try:
             # 创建Git标签
-            subprocess.run(
-                ['git', 'tag', '-a', tag_name, '-m', tag_message, target_ver.commit_hash],
-                cwd=self.docs_dir,
-                check=True
-            )
+            self.git.run('tag', '-a', tag_name, '-m', tag_message, target_ver.commit_hash)
             
             print(f"✓ 标签已创建: {tag_name} -> {doc_name} v{version}")
             return True
@@ -480,14 +884,15 @@ class DocumentVersionManager:
         Returns:
             List[str]: 文档名称列表
         """
-        return list(self.version_db.keys())
+        return self.store.doc_names()
     
-    def get_version_history(self, doc_name: str) -> str:
+    def get_version_history(self, doc_name: str, include_diffs: bool = False) -> str:
         """
         获取版本历史（Markdown格式）
         
         Args:
             doc_name: 文档名称
+            include_diffs: 是否附带与上一版本的行级和章节级差异
             
         Returns:
             str: 版本历史Markdown文本
@@ -499,6 +904,9 @@ class DocumentVersionManager:
         
         markdown = f"# {doc_name} 版本历史\n\n"
         
+        # 第 i 个版本与第 i-1 个版本的差异
+        diffs = [None] + self.compare_history(doc_name) if include_diffs else []
+        
         for i, version in enumerate(reversed(versions), 1):
             markdown += f"## v{version.version} - {version.status.value}\n\n"
             markdown += f"- **创建时间**: {version.created_at}\n"
@@ -518,10 +926,20 @@ class DocumentVersionManager:
                     markdown += f"- **{key}**: {value}\n"
                 markdown += "\n"
             
+            diff = diffs[len(versions) - i] if len(diffs) == len(versions) else None
+            if diff:
+                markdown += f"### 与 v{diff.old_version} 的差异\n\n"
+                markdown += f"- **新增行数**: {diff.additions}\n"
+                markdown += f"- **删除行数**: {diff.deletions}\n"
+                for section in diff.sections:
+                    markdown += f"- {section.change} `{section.title}` (+{section.additions} -{section.deletions})\n"
+                markdown += "\n"
+            
             markdown += "---\n\n"
         
         return markdown
     
+    @profiled("export_version_report")
     def export_version_report(self, output_path: str):
         """
         导出版本报告
@@ -538,8 +956,9 @@ class DocumentVersionManager:
         report += "---\n\n"
         
         # 统计信息
-        total_docs = len(self.version_db)
-        total_versions = sum(len(versions) for versions in self.version_db.values())
+        summaries = self.store.document_summaries()
+        total_docs = len(summaries)
+        total_versions = self.store.count_versions()
         
         report += "## 📊 统计信息\n\n"
         report += f"- **文档总数**: {total_docs}\n"
@@ -547,11 +966,7 @@ class DocumentVersionManager:
         report += f"- **平均版本数**: {total_versions / total_docs:.1f}\n\n"
         
         # 状态分布
-        status_count = {}
-        for versions in self.version_db.values():
-            for version in versions:
-                status = version.status.value
-                status_count[status] = status_count.get(status, 0) + 1
+        status_count = self.store.status_counts()
         
         report += "### 版本状态分布\n\n"
         for status, count in sorted(status_count.items()):
@@ -560,12 +975,9 @@ class DocumentVersionManager:
         
         # 文档列表
         report += "## 📚 文档列表\n\n"
-        for doc_name in sorted(self.version_db.keys()):
-            versions = self.get_versions(doc_name)
-            latest = versions[-1] if versions else None
-            
+        for doc_name, version_count, latest in summaries:
             report += f"### {doc_name}\n\n"
-            report += f"- **版本数**: {len(versions)}\n"
+            report += f"- **版本数**: {version_count}\n"
             if latest:
                 report += f"- **最新版本**: v{latest.version} ({latest.status.value})\n"
                 report += f"- **最后更新**: {latest.created_at}\n"
@@ -585,6 +997,7 @@ def main():
     parser = argparse.ArgumentParser(description='YYC³文档版本管理工具')
     parser.add_argument('--docs-dir', required=True, help='文档目录路径')
     parser.add_argument('--version-db', required=True, help='版本数据库路径')
+    add_profile_arguments(parser)
     
     subparsers = parser.add_subparsers(dest='command', help='子命令')
     
@@ -597,6 +1010,18 @@ def main():
     create_parser.add_argument('--message', required=True, help='版本说明')
     create_parser.add_argument('--changes', required=True, help='变更列表（逗号分隔）')
     
+    # 批量创建版本
+    bulk_parser = subparsers.add_parser('bulk-create', help='为所有有变更的文档批量创建版本')
+    bulk_parser.add_argument('--range', dest='rev_range', help='Git修订范围（如 v1.0..HEAD），默认工作区相对HEAD的改动')
+    bulk_parser.add_argument('--paths', nargs='+', help='只为这些文件创建版本')
+    bulk_parser.add_argument('--status', default='draft', choices=['draft', 'review', 'approved', 'published', 'deprecated', 'archived'], help='版本状态')
+    bulk_parser.add_argument('--author', required=True, help='作者')
+    bulk_parser.add_argument('--message', required=True, help='版本说明')
+    bulk_parser.add_argument('--changes', help='变更列表（逗号分隔），默认记录增删行数')
+    bulk_parser.add_argument('--minor-lines', type=int, default=DEFAULT_MINOR_CHANGE_LINES, help='变更行数达到该值时升级次版本号')
+    bulk_parser.add_argument('--major-lines', type=int, default=DEFAULT_MAJOR_CHANGE_LINES, help='变更行数达到该值时升级主版本号')
+    bulk_parser.add_argument('--dry-run', action='store_true', help='只显示将创建的版本，不写入')
+    
     # 列出版本
     list_parser = subparsers.add_parser('list', help='列出版本')
     list_parser.add_argument('--doc-name', required=True, help='文档名称')
@@ -612,6 +1037,13 @@ def main():
     compare_parser.add_argument('--doc-name', required=True, help='文档名称')
     compare_parser.add_argument('--version1', required=True, help='版本号1')
     compare_parser.add_argument('--version2', required=True, help='版本号2')
+    compare_parser.add_argument('--show-diff', action='store_true', help='输出统一diff')
+    
+    # 版本历史
+    history_parser = subparsers.add_parser('history', help='输出版本历史（Markdown）')
+    history_parser.add_argument('--doc-name', required=True, help='文档名称')
+    history_parser.add_argument('--with-diffs', action='store_true', help='附带相邻版本间的差异')
+    history_parser.add_argument('--output', help='输出文件路径，默认打印')
     
     # 回滚版本
     rollback_parser = subparsers.add_parser('rollback', help='回滚版本')
@@ -625,73 +1057,151 @@ def main():
     tag_parser.add_argument('--tag-name', required=True, help='标签名称')
     tag_parser.add_argument('--tag-message', required=True, help='标签说明')
     
+    # 查询版本
+    find_parser = subparsers.add_parser('find', help='按状态/作者/创建时间查询版本')
+    find_parser.add_argument('--status', choices=['draft', 'review', 'approved', 'published', 'deprecated', 'archived'], help='版本状态')
+    find_parser.add_argument('--author', help='作者')
+    find_parser.add_argument('--since', help='创建时间下限（ISO格式，如 2026-10-01）')
+    find_parser.add_argument('--until', help='创建时间上限（不含）')
+    find_parser.add_argument('--limit', type=int, help='最多显示的版本数')
+    
+    # 迁移旧版JSON数据库
+    migrate_parser = subparsers.add_parser('migrate', help='从JSON版本数据库导入')
+    migrate_parser.add_argument('--json-file', required=True, help='JSON版本数据库路径')
+    
     # 导出报告
     export_parser = subparsers.add_parser('export', help='导出版本报告')
     export_parser.add_argument('--output', required=True, help='输出文件路径')
     
     args = parser.parse_args()
     
-    # 创建版本管理器
-    manager = DocumentVersionManager(args.docs_dir, args.version_db)
-    
-    # 执行命令
-    if args.command == 'create':
-        status_map = {
-            'draft': VersionStatus.DRAFT,
-            'review': VersionStatus.REVIEW,
-            'approved': VersionStatus.APPROVED,
-            'published': VersionStatus.PUBLISHED,
-            'deprecated': VersionStatus.DEPRECATED,
-            'archived': VersionStatus.ARCHIVED
-        }
-        
-        manager.create_version(
-            doc_name=args.doc_name,
-            version=args.version,
-            status=status_map[args.status],
-            author=args.author,
-            message=args.message,
-            changes=[c.strip() for c in args.changes.split(',')]
-        )
+    with profiling_from_args(args):
+        # 创建版本管理器
+        manager = DocumentVersionManager(args.docs_dir, args.version_db)
     
-    elif args.command == 'list':
-        versions = manager.get_versions(args.doc_name)
-        print(f"\n{args.doc_name} 的版本列表:\n")
-        for v in versions:
-            print(f"  v{v.version} - {v.status.value} - {v.created_at} - {v.message}")
-    
-    elif args.command == 'update':
-        status_map = {
-            'draft': VersionStatus.DRAFT,
-            'review': VersionStatus.REVIEW,
-            'approved': VersionStatus.APPROVED,
-            'published': VersionStatus.PUBLISHED,
-            'deprecated': VersionStatus.DEPRECATED,
-            'archived': VersionStatus.ARCHIVED
-        }
-        
-        manager.update_version_status(
-            doc_name=args.doc_name,
-            version=args.version,
-            new_status=status_map[args.status]
-        )
+        # 执行命令
+        if args.command == 'create':
+            status_map = {
+                'draft': VersionStatus.DRAFT,
+                'review': VersionStatus.REVIEW,
+                'approved': VersionStatus.APPROVED,
+                'published': VersionStatus.PUBLISHED,
+                'deprecated': VersionStatus.DEPRECATED,
+                'archived': VersionStatus.ARCHIVED
+            }
+        
+            manager.create_version(
+                doc_name=args.doc_name,
+                version=args.version,
+                status=status_map[args.status],
+                author=args.author,
+                message=args.message,
+                changes=[c.strip() for c in args.changes.split(',')]
+            )
     
-    elif args.command == 'compare':
-        diff = manager.compare_versions(args.doc_name, args.version1, args.version2)
-        if diff:
-            print(f"\n{diff.changes_summary}\n")
-            print("修改的文件:")
-            for f in diff.changed_files:
-                print(f"  - {f}")
+        elif args.command == 'bulk-create':
+            status_map = {
+                'draft': VersionStatus.DRAFT,
+                'review': VersionStatus.REVIEW,
+                'approved': VersionStatus.APPROVED,
+                'published': VersionStatus.PUBLISHED,
+                'deprecated': VersionStatus.DEPRECATED,
+                'archived': VersionStatus.ARCHIVED
+            }
+        
+            manager.create_versions_bulk(
+                status=status_map[args.status],
+                author=args.author,
+                message=args.message,
+                changes=[c.strip() for c in args.changes.split(',')] if args.changes else None,
+                rev_range=args.rev_range,
+                paths=args.paths,
+                minor_lines=args.minor_lines,
+                major_lines=args.major_lines,
+                dry_run=args.dry_run
+            )
+    
+        elif args.command == 'list':
+            versions = manager.get_versions(args.doc_name)
+            print(f"\n{args.doc_name} 的版本列表:\n")
+            for v in versions:
+                print(f"  v{v.version} - {v.status.value} - {v.created_at} - {v.message}")
+    
+        elif args.command == 'update':
+            status_map = {
+                'draft': VersionStatus.DRAFT,
+                'review': VersionStatus.REVIEW,
+                'approved': VersionStatus.APPROVED,
+                'published': VersionStatus.PUBLISHED,
+                'deprecated': VersionStatus.DEPRECATED,
+                'archived': VersionStatus.ARCHIVED
+            }
+        
+            manager.update_version_status(
+                doc_name=args.doc_name,
+                version=args.version,
+                new_status=status_map[args.status]
+            )
+    
+        elif args.command == 'compare':
+            diff = manager.compare_versions(args.doc_name, args.version1, args.version2)
+            if diff:
+                print(f"\n{diff.changes_summary}\n")
+                print("修改的文件:")
+                for f in diff.changed_files:
+                    print(f"  - {f}")
+                if diff.sections:
+                    print("\n变更的章节:")
+                    for section in diff.sections:
+                        print(f"  - [{section.change}] {section.title} (+{section.additions} -{section.deletions})")
+                if args.show_diff and diff.unified_diff:
+                    print()
+                    print("\n".join(diff.unified_diff))
+    
+        elif args.command == 'history':
+            history = manager.get_version_history(args.doc_name, include_diffs=args.with_diffs)
+            if args.output:
+                output_file = Path(args.output)
+                output_file.parent.mkdir(parents=True, exist_ok=True)
+                output_file.write_text(history, encoding='utf-8')
+                print(f"✓ 版本历史已导出: {args.output}")
+            else:
+                print(history)
+    
+        elif args.command == 'rollback':
+            manager.rollback_version(args.doc_name, args.version)
+    
+        elif args.command == 'tag':
+            manager.tag_version(args.doc_name, args.version, args.tag_name, args.tag_message)
+    
+        elif args.command == 'find':
+            status_map = {
+                'draft': VersionStatus.DRAFT,
+                'review': VersionStatus.REVIEW,
+                'approved': VersionStatus.APPROVED,
+                'published': VersionStatus.PUBLISHED,
+                'deprecated': VersionStatus.DEPRECATED,
+                'archived': VersionStatus.ARCHIVED
+            }
+        
+            versions = manager.find_versions(
+                status=status_map[args.status] if args.status else None,
+                author=args.author,
+                created_after=args.since,
+                created_before=args.until,
+                limit=args.limit
+            )
+            print(f"\n找到 {len(versions)} 个版本:\n")
+            for v in versions:
+                print(f"  {v.doc_name} v{v.version} - {v.status.value} - {v.author} - {v.created_at} - {v.message}")
     
-    elif args.command == 'rollback':
-        manager.rollback_version(args.doc_name, args.version)
+        elif args.command == 'migrate':
+            manager._migrate_version_db(Path(args.json_file))
     
-    elif args.command == 'tag':
-        manager.tag_version(args.doc_name, args.version, args.tag_name, args.tag_message)
+        elif args.command == 'export':
+            manager.export_version_report(args.output)
     
-    elif args.command == 'export':
-        manager.export_version_report(args.output)
+        manager.close()
 
 
 if __name__ == '__main__':
@@ -13,6 +13,14 @@ import json
 from dataclasses import dataclass, field
 from collections import Counter, defaultdict
 
+from yyc3_doc_corpus import DocumentCorpus
+from yyc3_aho_corasick import AhoCorasick, get_automaton
+from yyc3_graph_core import CSRGraph, pagerank, hits, approximate_betweenness
+from yyc3_graph_store import save_binary_graph, binary_graph_path
+from yyc3_profiling import add_profile_arguments, document, profiled, profiling_from_args, stage
+
+import numpy as np
+
 
 @dataclass
 class DocumentNode:
@@ -30,8 +38,11 @@ class DocumentNode:
     quality_score: float = 0.0
     
     # 图谱属性
-    centrality: float = 0.0  # 中心性
+    centrality: float = 0.0  # 中心性（PageRank）
     importance: float = 0.0  # 重要性
+    hub_score: float = 0.0  # HITS hub得分
+    authority_score: float = 0.0  # HITS authority得分
+    betweenness: float = 0.0  # 介数中心性（采样近似）
     cluster: int = -1  # 所属聚类
 
 
@@ -53,6 +64,7 @@ class KnowledgeGraph:
     concepts: Dict[str, ConceptNode] = field(default_factory=dict)
     edges: List[Dict] = field(default_factory=list)
     clusters: List[List[str]] = field(default_factory=list)
+    ambiguous_references: List[Dict] = field(default_factory=list)  # 无法唯一确定目标的引用
     
     # 统计信息
     total_documents: int = 0
@@ -60,34 +72,108 @@ class KnowledgeGraph:
     total_edges: int = 0
 
 
+class ReferenceResolver:
+    """文档引用解析器
+    
+    先按文件名、文件名主干、标题做精确匹配；未命中的引用再用 Aho-Corasick 自动机
+    对所有文档名和标题做一次扫描，找出包含该引用的文档。命中多个文档时视为歧义引用。
+    """
+    
+    def __init__(self, documents: Dict[str, DocumentNode]):
+        self.documents = documents
+        self.exact_index: Dict[str, Set[str]] = defaultdict(set)
+        for doc_name, doc_node in documents.items():
+            for key in (doc_name, Path(doc_name).stem, doc_node.title):
+                if key:
+                    self.exact_index[key].add(doc_name)
+    
+    def build_substring_index(self, references: Set[str]) -> Dict[str, Set[str]]:
+        """一次扫描所有文档名和标题，找出包含各引用的文档"""
+        substring_index: Dict[str, Set[str]] = defaultdict(set)
+        automaton = AhoCorasick(ref for ref in references if ref not in self.exact_index)
+        if not len(automaton):
+            return substring_index
+        
+        for doc_name, doc_node in self.documents.items():
+            for ref in automaton.find_all(doc_name) | automaton.find_all(doc_node.title):
+                substring_index[ref].add(doc_name)
+        return substring_index
+    
+    def resolve_all(self) -> Tuple[List[Tuple[str, str]], List[Dict]]:
+        """解析所有文档的引用
+        
+        Returns:
+            (已解析的 (引用方, 被引用方) 列表, 歧义引用列表)
+        """
+        all_references = set()
+        for doc_node in self.documents.values():
+            all_references.update(doc_node.references)
+        substring_index = self.build_substring_index(all_references)
+        
+        resolved = []
+        ambiguous = []
+        for doc_name, doc_node in self.documents.items():
+            for ref in doc_node.references:
+                candidates = self.exact_index.get(ref, set()) - {doc_name}
+                if not candidates:
+                    candidates = substring_index.get(ref, set()) - {doc_name}
+                
+                if len(candidates) == 1:
+                    resolved.append((doc_name, next(iter(candidates))))
+                elif candidates:
+                    ambiguous.append({
+                        "source": doc_name,
+                        "reference": ref,
+                        "candidates": sorted(candidates)
+                    })
+        
+        return resolved, ambiguous
+
+
 class DocumentKnowledgeGraphBuilder:
     """文档知识图谱构建器"""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, corpus: Optional[DocumentCorpus] = None,
+                 concept_top_k: Optional[int] = 10, betweenness_samples: int = 64):
         self.base_path = Path(base_path)
         self.graph = KnowledgeGraph()
+        self.corpus = corpus or DocumentCorpus()
         
-        # 关键词提取模式
-        self.keyword_patterns = [
-            r'\b[A-Z][a-zA-Z]{2,}\b',  # 大写开头的单词
-            r'\b(?:架构|设计|开发|测试|部署|运维|监控|API|接口|服务|模块|组件|系统|平台|应用)\b',
-            r'\b(?:AI|人工智能|机器学习|深度学习|智能|自动化|优化|性能|安全|质量)\b',
-            r'\b(?:需求|规划|实施|迭代|发布|版本|文档|规范|标准|流程)\b'
-        ]
+        # 每个文档最多保留的概念关联邻居数（None或0表示不限制）
+        self.concept_top_k = concept_top_k
         
-        # 概念提取模式
-        self.concept_patterns = [
-            r'(?:架构|设计)模式',
-            r'(?:开发|测试|部署|运维)流程',
-            r'(?:API|接口)设计',
-            r'(?:数据|业务|技术)架构',
-            r'(?:性能|安全|质量)保障',
-            r'(?:微服务|容器|云)部署',
-            r'(?:CI/CD|DevOps)流水线',
-            r'(?:监控|告警|日志)系统',
-            r'(?:需求|用户|产品)管理',
-            r'(?:文档|知识)管理'
+        # 介数中心性近似的采样源点数
+        self.betweenness_samples = betweenness_samples
+        
+        # 文档邻接矩阵（CSR），文档ID为 self.graph.documents 的插入顺序
+        self.adjacency: Optional[CSRGraph] = None
+        
+        # 关键词提取：大写开头的单词用正则，其余为按组排列的固定词表（整词匹配）
+        self.keyword_term_pattern = re.compile(r'\b[A-Z][a-zA-Z]{2,}\b')
+        self.keyword_groups = [
+            ['架构', '设计', '开发', '测试', '部署', '运维', '监控', 'API', '接口', '服务', '模块', '组件', '系统', '平台', '应用'],
+            ['AI', '人工智能', '机器学习', '深度学习', '智能', '自动化', '优化', '性能', '安全', '质量'],
+            ['需求', '规划', '实施', '迭代', '发布', '版本', '文档', '规范', '标准', '流程']
+        ]
+        self.keyword_group_of = {
+            keyword: index for index, group in enumerate(self.keyword_groups) for keyword in group
+        }
+        self.keyword_matcher = get_automaton(self.keyword_group_of)
+        
+        # 概念词表
+        self.concept_terms = [
+            '架构模式', '设计模式',
+            '开发流程', '测试流程', '部署流程', '运维流程',
+            'API设计', '接口设计',
+            '数据架构', '业务架构', '技术架构',
+            '性能保障', '安全保障', '质量保障',
+            '微服务部署', '容器部署', '云部署',
+            'CI/CD流水线', 'DevOps流水线',
+            '监控系统', '告警系统', '日志系统',
+            '需求管理', '用户管理', '产品管理',
+            '文档管理', '知识管理'
         ]
+        self.concept_matcher = get_automaton(self.concept_terms)
         
         # 文档分类
         self.doc_categories = {
@@ -100,6 +186,13 @@ class DocumentKnowledgeGraphBuilder:
             "用户指南": ["指南", "手册", "教程", "入门"],
             "归类迭代": ["迭代", "版本", "更新", "变更"]
         }
+        
+        # 分类关键词 -> 最先命中的分类序号（与按分类、关键词顺序逐个查找的结果一致）
+        self.category_rank: Dict[str, int] = {}
+        for rank, keywords in enumerate(self.doc_categories.values()):
+            for keyword in keywords:
+                self.category_rank.setdefault(keyword, rank)
+        self.category_matcher = get_automaton(self.category_rank, ignore_case=True)
     
     def extract_title(self, content: str) -> str:
         """提取文档标题"""
@@ -124,11 +217,14 @@ class DocumentKnowledgeGraphBuilder:
     
     def extract_keywords(self, content: str) -> List[str]:
         """提取关键词"""
-        keywords = []
+        keywords = self.keyword_term_pattern.findall(content)
         
-        for pattern in self.keyword_patterns:
-            matches = re.findall(pattern, content)
-            keywords.extend(matches)
+        # 固定词表一次扫描，按词表分组顺序追加（同频关键词的先后与逐组匹配一致）
+        grouped = [[] for _ in self.keyword_groups]
+        for _, _, keyword in self.keyword_matcher.iter_matches(content, whole_words=True):
+            grouped[self.keyword_group_of[keyword]].append(keyword)
+        for group in grouped:
+            keywords.extend(group)
         
         # 统计词频
         keyword_freq = Counter(keywords)
@@ -137,15 +233,8 @@ class DocumentKnowledgeGraphBuilder:
         return [kw for kw, _ in keyword_freq.most_common(10)]
     
     def extract_concepts(self, content: str) -> List[str]:
-        """提取概念"""
-        concepts = []
-        
-        for pattern in self.concept_patterns:
-            matches = re.findall(pattern, content)
-            concepts.extend(matches)
-        
-        # 去重
-        return list(set(concepts))
+        """提取概念（按首次出现的顺序去重）"""
+        return list(dict.fromkeys(concept for _, _, concept in self.concept_matcher.iter_matches(content)))
     
     def extract_references(self, content: str, current_file: str) -> List[str]:
         """提取文档引用"""
@@ -167,15 +256,15 @@ class DocumentKnowledgeGraphBuilder:
     
     def classify_document(self, file_name: str, content: str) -> str:
         """分类文档"""
-        file_lower = file_name.lower()
-        content_lower = content.lower()
-        
-        for category, keywords in self.doc_categories.items():
-            for keyword in keywords:
-                if keyword in file_lower or keyword in content_lower:
-                    return category
-        
-        return "其他"
+        categories = list(self.doc_categories)
+        best = len(categories)
+        for text in (file_name, content):
+            for _, _, keyword in self.category_matcher.iter_matches(text):
+                best = min(best, self.category_rank[keyword])
+                if best == 0:
+                    return categories[0]
+        
+        return categories[best] if best < len(categories) else "其他"
     
     def load_quality_scores(self) -> Dict[str, float]:
         """加载文档质量评分"""
@@ -203,15 +292,16 @@ class DocumentKnowledgeGraphBuilder:
                 continue
             
             try:
-                with open(file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                title = self.extract_title(content)
-                description = self.extract_description(content)
-                keywords = self.extract_keywords(content)
-                concepts = self.extract_concepts(content)
-                references = self.extract_references(content, file.name)
-                category = self.classify_document(file.name, content)
+                with document(file):
+                    parsed = self.corpus.get(file)
+                    content = self.corpus.text(parsed)
+                    
+                    title = parsed.title
+                    description = self.extract_description(content)
+                    keywords = self.extract_keywords(content)
+                    concepts = self.extract_concepts(content)
+                    references = self.extract_references(content, file.name)
+                    category = self.classify_document(file.name, content)
                 quality_score = quality_scores.get(file.name, 0.0)
                 
                 node = DocumentNode(
@@ -234,6 +324,7 @@ class DocumentKnowledgeGraphBuilder:
             except Exception as e:
                 print(f"✗ 处理失败: {file.name} - {e}")
         
+        self.corpus.commit()
         return documents
     
     def build_concept_nodes(self, documents: Dict[str, DocumentNode]) -> Dict[str, ConceptNode]:
@@ -290,63 +381,144 @@ class DocumentKnowledgeGraphBuilder:
         edges = []
         
         # 构建文档引用边
-        for doc_name, doc_node in documents.items():
-            for ref in doc_node.references:
-                # 查找被引用的文档
-                for other_name, other_node in documents.items():
-                    if ref in other_name or ref in other_node.title:
-                        edges.append({
-                            "source": doc_name,
-                            "target": other_name,
-                            "type": "reference",
-                            "weight": 1.0
-                        })
-                        
-                        # 记录被引用关系
-                        if doc_name not in other_node.referenced_by:
-                            other_node.referenced_by.append(doc_name)
-                        break
+        resolved, ambiguous = ReferenceResolver(documents).resolve_all()
+        for source, target in resolved:
+            edges.append({
+                "source": source,
+                "target": target,
+                "type": "reference",
+                "weight": 1.0
+            })
+            
+            # 记录被引用关系
+            target_node = documents[target]
+            if source not in target_node.referenced_by:
+                target_node.referenced_by.append(source)
+        
+        self.graph.ambiguous_references = ambiguous
         
         # 构建概念关联边
-        for doc_name, doc_node in documents.items():
-            for concept in doc_node.concepts:
-                for other_name, other_node in documents.items():
-                    if doc_name == other_name:
-                        continue
-                    
-                    # 如果两个文档共享概念，建立关联
-                    shared_concepts = set(doc_node.concepts) & set(other_node.concepts)
-                    if shared_concepts:
-                        edges.append({
-                            "source": doc_name,
-                            "target": other_name,
-                            "type": "concept",
-                            "weight": len(shared_concepts),
-                            "concepts": list(shared_concepts)
-                        })
+        edges.extend(self.build_concept_edges(documents))
         
         return edges
     
+    def build_concept_edges(self, documents: Dict[str, DocumentNode]) -> List[Dict]:
+        """基于文档×概念矩阵构建概念关联边
+        
+        每对文档（无向）只生成一条边，权重为共享概念数；设置了 concept_top_k 时，每个文档只保留
+        权重最高的 k 个邻居（权重相同时取文档顺序靠前的，两端任一保留即保留该边）。
+        概念词表很小，按行分块用矩阵乘法计算共享概念数，每块只保留各行的前 k 个邻居，
+        不会生成全部共现文档对（常见概念几乎出现在所有文档中）。
+        """
+        names = list(documents.keys())
+        n = len(names)
+        concept_names = sorted({concept for doc_node in documents.values() for concept in doc_node.concepts})
+        if n < 2 or not concept_names:
+            return []
+        concept_ids = {concept: i for i, concept in enumerate(concept_names)}
+        
+        # 文档×概念的0/1矩阵（float32 的矩阵乘法对小整数是精确的）
+        membership = np.zeros((n, len(concept_names)), dtype=np.float32)
+        for i, doc_node in enumerate(documents.values()):
+            membership[i, [concept_ids[concept] for concept in set(doc_node.concepts)]] = 1
+        
+        top_k = min(self.concept_top_k, n - 1) if self.concept_top_k else 0
+        block = max(1, (1 << 22) // n)  # 每块的权重矩阵约 4M 个元素
+        columns = np.arange(n, dtype=np.int64)
+        pair_codes = []
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n), dtype=np.int64)
+            weights = (membership[rows] @ membership.T).astype(np.int64)
+            weights[np.arange(len(rows)), rows] = 0
+            
+            if top_k:
+                # 排序键：权重优先，同权重时文档ID小的优先
+                keys = weights * n + (n - 1 - columns)
+                neighbours = np.argpartition(-keys, top_k - 1, axis=1)[:, :top_k]
+                sources = np.repeat(rows, top_k)
+                targets = neighbours.ravel()
+                positive = weights[np.repeat(np.arange(len(rows)), top_k), targets] > 0
+                sources, targets = sources[positive], targets[positive]
+            else:
+                local, targets = np.nonzero(weights)
+                sources = rows[local]
+                upper = sources < targets
+                sources, targets = sources[upper], targets[upper]
+            pair_codes.append(np.minimum(sources, targets) * n + np.maximum(sources, targets))
+        
+        pairs = np.unique(np.concatenate(pair_codes))
+        sources, targets = pairs // n, pairs % n
+        shared = (membership[sources] * membership[targets]) > 0
+        
+        edges = []
+        for i, j, row in zip(sources.tolist(), targets.tolist(), shared):
+            concepts = [concept_names[c] for c in np.flatnonzero(row)]
+            edges.append({
+                "source": names[i],
+                "target": names[j],
+                "type": "concept",
+                "weight": len(concepts),
+                "concepts": concepts
+            })
+        return edges
+    
+    def build_adjacency(self, documents: Dict[str, DocumentNode], edges: List[Dict]) -> CSRGraph:
+        """构建文档邻接矩阵（CSR）
+        
+        引用边为有向边（权重1），概念边按共享概念数作为权重双向加入。
+        """
+        doc_ids = {name: i for i, name in enumerate(documents)}
+        doc_edges = [
+            (doc_ids[edge["source"]], doc_ids[edge["target"]], edge["weight"], edge["type"] == "concept")
+            for edge in edges
+            if edge["source"] in doc_ids and edge["target"] in doc_ids
+        ]
+        if not doc_edges:
+            return CSRGraph.from_edges(len(doc_ids), np.zeros(0), np.zeros(0), np.zeros(0))
+        
+        sources, targets, weights, undirected = (np.array(column) for column in zip(*doc_edges))
+        return CSRGraph.from_edges(
+            len(doc_ids),
+            np.concatenate([sources, targets[undirected]]).astype(np.int32),
+            np.concatenate([targets, sources[undirected]]).astype(np.int32),
+            np.concatenate([weights, weights[undirected]]).astype(np.float32)
+        )
+    
     def calculate_centrality(self, documents: Dict[str, DocumentNode], edges: List[Dict]):
-        """计算中心性"""
-        # 计算度中心性（入度+出度）
-        for doc_name, doc_node in documents.items():
-            in_degree = len(doc_node.referenced_by)
-            out_degree = len(doc_node.references)
-            doc_node.centrality = in_degree * 2 + out_degree  # 入度权重更高
+        """计算中心性（PageRank、HITS、介数中心性近似）"""
+        self.adjacency = self.build_adjacency(documents, edges)
+        
+        with stage("pagerank"):
+            ranks = pagerank(self.adjacency)
+        with stage("hits"):
+            hubs, authorities = hits(self.adjacency)
+        with stage("betweenness", samples=self.betweenness_samples):
+            betweenness = approximate_betweenness(self.adjacency, samples=self.betweenness_samples)
+        
+        for i, doc_node in enumerate(documents.values()):
+            doc_node.centrality = float(ranks[i])
+            doc_node.hub_score = float(hubs[i])
+            doc_node.authority_score = float(authorities[i])
+            doc_node.betweenness = float(betweenness[i])
     
     def calculate_importance(self, documents: Dict[str, DocumentNode]):
         """计算重要性"""
-        max_centrality = max(doc.centrality for doc in documents.values()) if documents else 1
-        max_quality = max(doc.quality_score for doc in documents.values()) if documents else 1
-        
-        for doc_node in documents.values():
-            # 重要性 = 中心性(40%) + 质量评分(40%) + 引用数(20%)
-            centrality_score = doc_node.centrality / max_centrality if max_centrality > 0 else 0
-            quality_score = doc_node.quality_score / max_quality if max_quality > 0 else 0
-            reference_score = len(doc_node.referenced_by) / len(documents) if documents else 0
-            
-            doc_node.importance = centrality_score * 0.4 + quality_score * 0.4 + reference_score * 0.2
+        if not documents:
+            return
+        
+        nodes = list(documents.values())
+        centrality = np.array([doc.centrality for doc in nodes])
+        quality = np.array([doc.quality_score for doc in nodes])
+        referenced = np.array([len(doc.referenced_by) for doc in nodes], dtype=np.float64)
+        
+        # 重要性 = 中心性(40%) + 质量评分(40%) + 引用数(20%)
+        centrality_score = centrality / centrality.max() if centrality.max() > 0 else np.zeros(len(nodes))
+        quality_score = quality / quality.max() if quality.max() > 0 else np.zeros(len(nodes))
+        reference_score = referenced / len(nodes)
+        importance = centrality_score * 0.4 + quality_score * 0.4 + reference_score * 0.2
+        
+        for doc_node, value in zip(nodes, importance):
+            doc_node.importance = float(value)
     
     def build_graph(self) -> KnowledgeGraph:
         """构建知识图谱"""
@@ -357,37 +529,47 @@ class DocumentKnowledgeGraphBuilder:
         
         # 构建文档节点
         print("步骤1: 构建文档节点...")
-        documents = self.build_document_nodes()
+        with stage("build_document_nodes") as record:
+            documents = self.build_document_nodes()
+            record.items = len(documents)
         self.graph.documents = documents
         self.graph.total_documents = len(documents)
         print(f"✓ 已构建 {len(documents)} 个文档节点\n")
         
         # 构建概念节点
         print("步骤2: 构建概念节点...")
-        concepts = self.build_concept_nodes(documents)
+        with stage("build_concept_nodes") as record:
+            concepts = self.build_concept_nodes(documents)
+            record.items = len(concepts)
         self.graph.concepts = concepts
         self.graph.total_concepts = len(concepts)
         print(f"✓ 已构建 {len(concepts)} 个概念节点\n")
         
         # 构建边
         print("步骤3: 构建边...")
-        edges = self.build_edges(documents)
+        with stage("build_edges") as record:
+            edges = self.build_edges(documents)
+            record.items = len(edges)
         self.graph.edges = edges
         self.graph.total_edges = len(edges)
-        print(f"✓ 已构建 {len(edges)} 条边\n")
+        print(f"✓ 已构建 {len(edges)} 条边")
+        print(f"⚠ 歧义引用 {len(self.graph.ambiguous_references)} 个\n")
         
         # 计算中心性
         print("步骤4: 计算中心性...")
-        self.calculate_centrality(documents, edges)
+        with stage("calculate_centrality", items=len(documents)):
+            self.calculate_centrality(documents, edges)
         print("✓ 已计算中心性\n")
         
         # 计算重要性
         print("步骤5: 计算重要性...")
-        self.calculate_importance(documents)
+        with stage("calculate_importance", items=len(documents)):
+            self.calculate_importance(documents)
         print("✓ 已计算重要性\n")
         
         return self.graph
     
+    @profiled("save_graph")
     def save_graph(self, output_dir: Path):
         """保存知识图谱"""
         output_dir.mkdir(exist_ok=True)
@@ -412,6 +594,9 @@ class DocumentKnowledgeGraphBuilder:
                     "quality_score": node.quality_score,
                     "centrality": node.centrality,
                     "importance": node.importance,
+                    "hub_score": node.hub_score,
+                    "authority_score": node.authority_score,
+                    "betweenness": node.betweenness,
                     "references": node.references,
                     "referenced_by": node.referenced_by
                 }
@@ -427,20 +612,27 @@ class DocumentKnowledgeGraphBuilder:
                 }
                 for node in self.graph.concepts.values()
             ],
-            "edges": self.graph.edges
+            "edges": self.graph.edges,
+            "ambiguous_references": self.graph.ambiguous_references
         }
         
-        with open(json_file, 'w', encoding='utf-8') as f:
+        with stage("write_json"), open(json_file, 'w', encoding='utf-8') as f:
             json.dump(graph_data, f, ensure_ascii=False, indent=2)
         
         print(f"JSON图谱已保存到: {json_file}")
         
+        # 保存二进制格式（推荐/生成工具优先内存映射加载）
+        with stage("write_binary"):
+            binary_file = save_binary_graph(graph_data, binary_graph_path(json_file))
+        print(f"二进制图谱已保存到: {binary_file}")
+        
         # 保存可视化数据（用于D3.js等可视化库）
         self.save_visualization_data(output_dir)
         
         # 生成Markdown报告
         self.generate_markdown_report(output_dir)
     
+    @profiled("save_visualization_data")
     def save_visualization_data(self, output_dir: Path):
         """保存可视化数据"""
         vis_file = output_dir / f"YYC3-文档知识图谱可视化_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
@@ -520,6 +712,7 @@ class DocumentKnowledgeGraphBuilder:
         }
         return colors.get(category, "#95A5A6")
     
+    @profiled("generate_markdown_report")
     def generate_markdown_report(self, output_dir: Path):
         """生成Markdown报告"""
         md_file = output_dir / f"YYC3-文档知识图谱报告_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
@@ -551,7 +744,7 @@ class DocumentKnowledgeGraphBuilder:
             f.write("| 排名 | 文档名称 | 分类 | 重要性 | 质量评分 | 中心性 |\n")
             f.write("|------|---------|------|--------|---------|--------|\n")
             for i, doc in enumerate(sorted_docs[:20], 1):
-                f.write(f"| {i} | {doc.file_name[:30]} | {doc.category} | {doc.importance:.3f} | {doc.quality_score:.1f} | {doc.centrality:.0f} |\n")
+                f.write(f"| {i} | {doc.file_name[:30]} | {doc.category} | {doc.importance:.3f} | {doc.quality_score:.1f} | {doc.centrality:.4f} |\n")
             f.write("\n")
             
             f.write("## 💡 重要概念TOP20\n\n")
@@ -592,6 +785,20 @@ class DocumentKnowledgeGraphBuilder:
                 f.write(f"| {i} | {doc.file_name[:30]} | {len(doc.references)} | {refs} |\n")
             f.write("\n")
             
+            f.write("### 歧义引用\n\n")
+            if self.graph.ambiguous_references:
+                f.write(f"共 {len(self.graph.ambiguous_references)} 个引用匹配到多个文档，未建立引用边：\n\n")
+                f.write("| 引用方 | 引用 | 候选文档 |\n")
+                f.write("|--------|------|----------|\n")
+                for item in self.graph.ambiguous_references[:20]:
+                    candidates = ", ".join(item["candidates"][:3])
+                    if len(item["candidates"]) > 3:
+                        candidates += f" 等{len(item['candidates'])}个"
+                    f.write(f"| {item['source'][:30]} | {item['reference']} | {candidates} |\n")
+            else:
+                f.write("无歧义引用\n")
+            f.write("\n")
+            
             f.write("## 📂 文档分类统计\n\n")
             category_stats = defaultdict(int)
             for doc in self.graph.documents.values():
@@ -641,6 +848,11 @@ def main():
     parser.add_argument('--output-dir', type=str,
                        default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环/YYC3-Cater-审核报告',
                        help='输出目录')
+    parser.add_argument('--concept-top-k', type=int, default=10,
+                       help='每个文档保留的概念关联邻居数（0表示不限制）')
+    parser.add_argument('--betweenness-samples', type=int, default=64,
+                       help='介数中心性近似的采样源点数')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -652,19 +864,21 @@ def main():
     print("=" * 80)
     print()
     
-    builder = DocumentKnowledgeGraphBuilder(args.base_path)
-    builder.build_graph()
+    with profiling_from_args(args):
+        builder = DocumentKnowledgeGraphBuilder(args.base_path, concept_top_k=args.concept_top_k,
+                                                betweenness_samples=args.betweenness_samples)
+        builder.build_graph()
     
-    print()
-    print("=" * 80)
-    print("知识图谱构建完成")
-    print("=" * 80)
-    print(f"\n文档节点: {builder.graph.total_documents}")
-    print(f"概念节点: {builder.graph.total_concepts}")
-    print(f"边: {builder.graph.total_edges}")
-    print("=" * 80)
+        print()
+        print("=" * 80)
+        print("知识图谱构建完成")
+        print("=" * 80)
+        print(f"\n文档节点: {builder.graph.total_documents}")
+        print(f"概念节点: {builder.graph.total_concepts}")
+        print(f"边: {builder.graph.total_edges}")
+        print("=" * 80)
     
-    builder.save_graph(Path(args.output_dir))
+        builder.save_graph(Path(args.output_dir))
     
     print("\n✓ 文档知识图谱构建完成！")
 
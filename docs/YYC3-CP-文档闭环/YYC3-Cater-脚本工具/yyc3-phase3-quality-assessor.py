@@ -6,12 +6,35 @@ YYC³ 文档质量评估工具 - 第三阶段（P2）
 
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional
 from datetime import datetime
 import json
-from dataclasses import dataclass, field
-from collections import Counter
+from dataclasses import dataclass, field, asdict
+
+from yyc3_aho_corasick import get_automaton
+from yyc3_doc_corpus import DocumentCorpus, ParsedDocument, DEFAULT_CACHE_DIR
+from yyc3_profiling import add_profile_arguments, document, profiled, profiler, profiling_from_args, stage
+
+
+# 评估规则版本，评分规则变化时递增，使增量清单中的旧结果失效
+ASSESSOR_RULES_VERSION = 2
+
+# 增量评估清单默认位置
+DEFAULT_MANIFEST_FILE = DEFAULT_CACHE_DIR / "quality-manifest.json"
+
+# 原文关键词特征：按分组判断元数据和技术细节（子串查找，不走正则）
+FEATURE_KEYWORDS = {
+    "description": ('@description', '描述', '说明'),
+    "author": ('@author', '作者'),
+    "version": ('@version', '版本'),
+    "toc": ('目录', 'TOC'),
+    "technical": ('API', '接口', '函数', '类', '方法', '参数', '返回值'),
+    "example": ('示例', '例子', 'demo', 'Demo'),
+}
+VERSION_NUMBER_RE = re.compile(r'v\d+\.\d+\.\d+')
+NUMBERED_HEADING_RE = re.compile(r'^\d+\.')
 
 
 @dataclass
@@ -70,9 +93,14 @@ class DocumentQualityReport:
 class DocumentQualityAssessor:
     """文档质量评估器"""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, corpus: Optional[DocumentCorpus] = None,
+                 manifest_file: Path = DEFAULT_MANIFEST_FILE):
         self.base_path = Path(base_path)
         self.reports: List[DocumentQualityReport] = []
+        self.corpus = corpus or DocumentCorpus()
+        self.manifest_file = Path(manifest_file)
+        self.manifest: Dict[str, Dict] = {}
+        self.incremental_stats = {"reused": 0, "assessed": 0}
         
         # 标准章节列表
         self.standard_sections = [
@@ -126,74 +154,44 @@ class DocumentQualityAssessor:
         else:
             return "technique"  # 默认
     
-    def extract_metadata(self, content: str) -> Dict[str, bool]:
+    def extract_features(self, content: str) -> Set[str]:
+        """返回原文中命中的关键词特征分组"""
+        features = {
+            name for name, keywords in FEATURE_KEYWORDS.items()
+            if any(keyword in content for keyword in keywords)
+        }
+        if "version" not in features and VERSION_NUMBER_RE.search(content):
+            features.add("version")
+        return features
+    
+    def extract_metadata(self, parsed: ParsedDocument, features: Set[str]) -> Dict[str, bool]:
         """提取文档元数据"""
-        metadata = {
-            "has_title": False,
-            "has_description": False,
-            "has_author": False,
-            "has_version": False,
-            "has_table_of_contents": False
+        return {
+            "has_title": any(h.level == 1 for h in parsed.headings),
+            "has_description": "description" in features,
+            "has_author": "author" in features,
+            "has_version": "version" in features,
+            # 目录：目录/TOC字样或编号的章节标题
+            "has_table_of_contents": "toc" in features or any(
+                h.level >= 2 and NUMBERED_HEADING_RE.match(h.text) for h in parsed.headings
+            )
         }
-        
-        # 检查标题
-        if re.search(r'^#\s+.+', content, re.MULTILINE):
-            metadata["has_title"] = True
-        
-        # 检查描述
-        if re.search(r'@description|描述|说明', content):
-            metadata["has_description"] = True
-        
-        # 检查作者
-        if re.search(r'@author|作者', content):
-            metadata["has_author"] = True
-        
-        # 检查版本
-        if re.search(r'@version|版本|v\d+\.\d+\.\d+', content):
-            metadata["has_version"] = True
-        
-        # 检查目录
-        if re.search(r'目录|TOC|##\s+\d+\.', content):
-            metadata["has_table_of_contents"] = True
-        
-        return metadata
     
-    def count_sections(self, content: str) -> int:
-        """统计章节数量"""
-        # 统计二级标题（##）
-        sections = re.findall(r'^##\s+.+', content, re.MULTILINE)
-        return len(sections)
+    def count_sections(self, parsed: ParsedDocument) -> int:
+        """统计章节数量（二级标题）"""
+        return len(parsed.sections)
     
-    def count_code_blocks(self, content: str) -> Tuple[int, int]:
+    def count_code_blocks(self, parsed: ParsedDocument) -> Tuple[int, int]:
         """统计代码块数量和代码行数"""
-        # 统计代码块
-        code_blocks = re.findall(r'```[\s\S]*?```', content)
-        block_count = len(code_blocks)
-        
-        # 统计代码行数
-        code_lines = 0
-        for block in code_blocks:
-            lines = block.split('\n')
-            # 排除代码块标记行
-            code_lines += len([l for l in lines if l and not l.startswith('```')])
-        
-        return block_count, code_lines
-    
-    def check_standard_sections(self, content: str) -> Dict[str, bool]:
-        """检查标准章节是否存在"""
-        sections_found = {}
-        
-        for section in self.standard_sections:
-            # 检查章节标题
-            pattern = rf'^##\s*.*{section}.*$'
-            if re.search(pattern, content, re.MULTILINE | re.IGNORECASE):
-                sections_found[section] = True
-            else:
-                sections_found[section] = False
-        
-        return sections_found
+        return len(parsed.code_blocks), parsed.code_lines
+    
+    def check_standard_sections(self, parsed: ParsedDocument) -> Dict[str, bool]:
+        """检查标准章节是否存在（二级及以下标题中包含章节名）"""
+        titles = "\n".join(h.text for h in parsed.headings if h.level >= 2)
+        found = get_automaton(self.standard_sections, ignore_case=True).find_all(titles)
+        return {section: section in found for section in self.standard_sections}
     
-    def assess_completeness(self, content: str, metrics: DocumentQualityMetrics) -> float:
+    def assess_completeness(self, parsed: ParsedDocument, metrics: DocumentQualityMetrics) -> float:
         """评估完整性"""
         score = 0.0
         max_score = 100.0
@@ -213,7 +211,7 @@ class DocumentQualityAssessor:
         score += metadata_score
         
         # 章节完整性 (40分)
-        sections = self.check_standard_sections(content)
+        sections = self.check_standard_sections(parsed)
         sections_score = sum(sections.values()) / len(sections) * 40
         score += sections_score
         
@@ -231,7 +229,7 @@ class DocumentQualityAssessor:
         
         return score / max_score
     
-    def assess_accuracy(self, content: str, metrics: DocumentQualityMetrics) -> float:
+    def assess_accuracy(self, features: Set[str], metrics: DocumentQualityMetrics) -> float:
         """评估准确性"""
         score = 0.0
         max_score = 100.0
@@ -244,9 +242,9 @@ class DocumentQualityAssessor:
         
         # 检查技术准确性 (30分)
         # 检查是否有具体的技术细节
-        if re.search(r'(API|接口|函数|类|方法|参数|返回值)', content):
+        if "technical" in features:
             score += 15
-        if re.search(r'(示例|例子|demo|Demo)', content):
+        if "example" in features:
             score += 15
         
         # 检查版本信息 (30分)
@@ -255,38 +253,34 @@ class DocumentQualityAssessor:
         
         return score / max_score
     
-    def assess_readability(self, content: str, metrics: DocumentQualityMetrics) -> float:
+    def assess_readability(self, parsed: ParsedDocument, metrics: DocumentQualityMetrics) -> float:
         """评估可读性"""
         score = 0.0
         max_score = 100.0
         
         # 段落长度 (20分)
-        paragraphs = content.split('\n\n')
-        avg_para_length = sum(len(p) for p in paragraphs) / len(paragraphs) if paragraphs else 0
+        avg_para_length = parsed.paragraph_chars / parsed.paragraphs if parsed.paragraphs else 0
         if 100 <= avg_para_length <= 500:
             score += 20
         elif 50 <= avg_para_length < 100 or 500 < avg_para_length <= 800:
             score += 10
         
         # 标题层级 (20分)
-        headers = re.findall(r'^#+\s+.+', content, re.MULTILINE)
-        if len(headers) >= 5:
+        if len(parsed.headings) >= 5:
             score += 20
-        elif len(headers) >= 3:
+        elif len(parsed.headings) >= 3:
             score += 10
         
         # 列表使用 (20分)
-        lists = re.findall(r'^\s*[-*+]\s+', content, re.MULTILINE)
-        if len(lists) >= 10:
+        if parsed.list_items >= 10:
             score += 20
-        elif len(lists) >= 5:
+        elif parsed.list_items >= 5:
             score += 10
         
         # 表格使用 (20分)
-        tables = re.findall(r'\|.*\|', content)
-        if len(tables) >= 3:
+        if parsed.table_rows >= 3:
             score += 20
-        elif len(tables) >= 1:
+        elif parsed.table_rows >= 1:
             score += 10
         
         # 代码注释 (20分)
@@ -295,7 +289,7 @@ class DocumentQualityAssessor:
         
         return score / max_score
     
-    def assess_practicality(self, content: str, metrics: DocumentQualityMetrics) -> float:
+    def assess_practicality(self, parsed: ParsedDocument, metrics: DocumentQualityMetrics) -> float:
         """评估实用性"""
         score = 0.0
         max_score = 100.0
@@ -321,29 +315,24 @@ class DocumentQualityAssessor:
         
         return score / max_score
     
-    def assess_consistency(self, content: str, metrics: DocumentQualityMetrics) -> float:
+    def assess_consistency(self, parsed: ParsedDocument, metrics: DocumentQualityMetrics) -> float:
         """评估一致性"""
         score = 0.0
         max_score = 100.0
         
         # 命名一致性 (30分)
         # 检查术语是否一致
-        terms = re.findall(r'\b[A-Z][a-zA-Z]+\b', content)
-        term_counts = Counter(terms)
         # 如果有重复的大写术语，说明命名一致
-        if term_counts.most_common(1)[0][1] >= 3:
+        top_term_count = max(parsed.term_counts.values(), default=0)
+        if top_term_count >= 3:
             score += 30
-        elif term_counts.most_common(1)[0][1] >= 2:
+        elif top_term_count >= 2:
             score += 15
         
         # 格式一致性 (30分)
-        # 检查标题格式
-        headers = re.findall(r'^#+\s+.+', content, re.MULTILINE)
-        if len(headers) > 0:
-            # 检查是否使用了统一的标题格式
-            consistent = all(re.match(r'^#+\s+', h) for h in headers)
-            if consistent:
-                score += 30
+        # 扫描器只识别 "#+ 空格 标题" 形式的标题，有标题即格式统一
+        if parsed.headings:
+            score += 30
         
         # 代码风格一致性 (20分)
         if metrics.code_blocks > 0:
@@ -499,24 +488,27 @@ class DocumentQualityAssessor:
     
     def assess_document(self, file_path: Path) -> DocumentQualityReport:
         """评估单个文档"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
+        parsed = self.corpus.get(file_path)
+        return self.assess_parsed(file_path, parsed, self.corpus.text(parsed))
+    
+    def assess_parsed(self, file_path: Path, parsed: ParsedDocument, content: str) -> DocumentQualityReport:
+        """基于已解析的文档结构和原文进行评估（不访问文件系统，可在子进程中执行）"""
         # 检测文档类型
         doc_type = self.detect_doc_type(file_path)
         
-        # 提取元数据
-        metadata = self.extract_metadata(content)
+        # 提取元数据（原文只做关键词查找，其余指标都来自解析结构）
+        features = self.extract_features(content)
+        metadata = self.extract_metadata(parsed, features)
         
         # 统计信息
-        total_sections = self.count_sections(content)
-        code_blocks, code_lines = self.count_code_blocks(content)
-        total_lines = len(content.split('\n'))
-        word_count = len(content.split())
+        total_sections = self.count_sections(parsed)
+        code_blocks, code_lines = self.count_code_blocks(parsed)
+        total_lines = parsed.line_count
+        word_count = parsed.word_count
         avg_section_length = total_lines / total_sections if total_sections > 0 else 0
         
         # 检查标准章节
-        sections = self.check_standard_sections(content)
+        sections = self.check_standard_sections(parsed)
         
         # 创建指标对象
         metrics = DocumentQualityMetrics(
@@ -539,11 +531,11 @@ class DocumentQualityAssessor:
         )
         
         # 评估各个维度
-        metrics.completeness = self.assess_completeness(content, metrics)
-        metrics.accuracy = self.assess_accuracy(content, metrics)
-        metrics.readability = self.assess_readability(content, metrics)
-        metrics.practicality = self.assess_practicality(content, metrics)
-        metrics.consistency = self.assess_consistency(content, metrics)
+        metrics.completeness = self.assess_completeness(parsed, metrics)
+        metrics.accuracy = self.assess_accuracy(features, metrics)
+        metrics.readability = self.assess_readability(parsed, metrics)
+        metrics.practicality = self.assess_practicality(parsed, metrics)
+        metrics.consistency = self.assess_consistency(parsed, metrics)
         
         # 计算综合评分
         weights = self.doc_type_weights.get(doc_type, self.doc_type_weights["technique"])
@@ -572,23 +564,136 @@ class DocumentQualityAssessor:
         
         return report
     
-    def assess_all_documents(self, directory: Path) -> List[DocumentQualityReport]:
-        """评估目录下的所有文档"""
-        reports = []
+    def assess_all_documents(self, directory: Path, incremental: bool = False,
+                             workers: int = 1) -> List[DocumentQualityReport]:
+        """评估目录下的所有文档
+        
+        文档按路径排序后评估，结果顺序与并行度无关。增量模式下只重新评估新增或内容变化的文档，
+        其余文档直接复用清单中的评估结果；workers > 1 时待评估文档分块交给进程池处理。
+        """
+        manifest = self.load_manifest() if incremental else {}
+        files = sorted(f for f in directory.rglob("*.md") if f.name != "README.md")
+        
+        results: List[Optional[DocumentQualityReport]] = [None] * len(files)
+        entries: List[Optional[Dict]] = [None] * len(files)
+        pending = []  # (索引, 文件, 解析结果, 原文)
+        
+        with stage("load_documents", items=len(files)):
+            for index, file in enumerate(files):
+                try:
+                    stat = file.stat()
+                    entry = manifest.get(str(file.resolve()))
+                    valid = entry is not None and entry["rules_version"] == ASSESSOR_RULES_VERSION
+                    
+                    if valid and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                        results[index] = self.report_from_dict(entry["report"])
+                        entries[index] = dict(entry)
+                        continue
+                    
+                    parsed = self.corpus.get(file)
+                    entries[index] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": parsed.sha256}
+                    if valid and entry["sha256"] == parsed.sha256:
+                        results[index] = self.report_from_dict(entry["report"])
+                    else:
+                        pending.append((index, file, parsed, self.corpus.text(parsed)))
+                except Exception as e:
+                    print(f"✗ 评估失败: {file.name} - {e}")
+            
+            self.corpus.commit()
+        self.incremental_stats["assessed"] = len(pending)
+        self.incremental_stats["reused"] = sum(1 for r in results if r is not None)
+        
+        with stage("assess_documents", items=len(pending), workers=workers):
+            outcomes = self._assess_pending(pending, workers)
+        
+        for (index, file, _, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, DocumentQualityReport):
+                results[index] = outcome
+                print(f"✓ 已评估: {file.name} - 评分: {outcome.metrics.overall_score:.1f} - 等级: {outcome.grade}")
+            else:
+                print(f"✗ 评估失败: {file.name} - {outcome}")
+        
+        if incremental:
+            print(f"增量评估: 重新评估 {self.incremental_stats['assessed']} 个, 复用 {self.incremental_stats['reused']} 个")
         
-        for file in directory.rglob("*.md"):
-            if file.name == "README.md":
+        reports = []
+        self.manifest = {}
+        for file, report, entry in zip(files, results, entries):
+            if report is None:
                 continue
-            
-            try:
-                report = self.assess_document(file)
-                reports.append(report)
-                print(f"✓ 已评估: {file.name} - 评分: {report.metrics.overall_score:.1f} - 等级: {report.grade}")
-            except Exception as e:
-                print(f"✗ 评估失败: {file.name} - {e}")
+            reports.append(report)
+            entry["rules_version"] = ASSESSOR_RULES_VERSION
+            entry["report"] = self.report_to_dict(report)
+            self.manifest[str(file.resolve())] = entry
         
+        self.save_manifest()
         return reports
     
+    def _assess_pending(self, pending: List[Tuple], workers: int) -> List:
+        """评估待处理文档，返回与输入顺序一致的评估报告（失败时为错误信息）"""
+        items = [(str(file), parsed, content) for _, file, parsed, content in pending]
+        
+        if workers <= 1 or len(items) < 2:
+            return _assess_items(items, assessor=self)
+        
+        chunk_size = max(1, len(items) // (workers * 4))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        
+        outcomes = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.base_path),)) as executor:
+            for chunk_outcomes in executor.map(_assess_items, chunks):
+                outcomes.extend(chunk_outcomes)
+        return outcomes
+    
+    def report_to_dict(self, report: DocumentQualityReport) -> Dict:
+        """将评估报告转换为可序列化的字典"""
+        return asdict(report)
+    
+    def report_from_dict(self, data: Dict) -> DocumentQualityReport:
+        """从字典还原评估报告"""
+        return DocumentQualityReport(
+            file_path=data["file_path"],
+            file_name=data["file_name"],
+            doc_type=data["doc_type"],
+            metrics=DocumentQualityMetrics(**data["metrics"]),
+            issues=[QualityIssue(**i) for i in data["issues"]],
+            suggestions=list(data["suggestions"]),
+            grade=data["grade"]
+        )
+    
+    def load_manifest(self) -> Dict[str, Dict]:
+        """加载增量评估清单"""
+        if not self.manifest_file.exists():
+            return {}
+        
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠ 增量评估清单无法读取，将全量评估: {e}")
+            return {}
+        
+        if data.get("rules_version") != ASSESSOR_RULES_VERSION:
+            return {}
+        return data.get("documents", {})
+    
+    @profiled("save_manifest")
+    def save_manifest(self):
+        """保存增量评估清单（先写临时文件再替换，避免中断时损坏）"""
+        self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.manifest_file.with_name(self.manifest_file.name + ".tmp")
+        
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "rules_version": ASSESSOR_RULES_VERSION,
+                "updated_at": datetime.now().isoformat(),
+                "documents": self.manifest
+            }, f, ensure_ascii=False)
+        
+        os.replace(tmp_file, self.manifest_file)
+    
+    @profiled("save_report")
     def save_report(self, reports: List[DocumentQualityReport], suffix: str = ""):
         """保存评估报告"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -721,6 +826,31 @@ class DocumentQualityAssessor:
         print(f"Markdown报告已保存到: {report_file}")
 
 
+_worker_assessor: Optional[DocumentQualityAssessor] = None
+
+
+def _init_worker(base_path: str):
+    """进程池初始化：每个子进程只创建一次评估器（仅内存缓存，不访问SQLite）"""
+    global _worker_assessor
+    # 子进程中的文档耗时不回传，剖析只覆盖主进程
+    profiler.disable()
+    _worker_assessor = DocumentQualityAssessor(base_path, corpus=DocumentCorpus(cache_file=None))
+
+
+def _assess_items(items: List[Tuple[str, ParsedDocument, str]],
+                  assessor: Optional[DocumentQualityAssessor] = None) -> List:
+    """评估一组文档，单个文档失败时返回错误信息而不中断整组"""
+    assessor = assessor or _worker_assessor
+    outcomes = []
+    for file_path, parsed, content in items:
+        try:
+            with document(file_path):
+                outcomes.append(assessor.assess_parsed(Path(file_path), parsed, content))
+        except Exception as e:
+            outcomes.append(str(e))
+    return outcomes
+
+
 def main():
     """主函数"""
     import argparse
@@ -729,6 +859,13 @@ def main():
     parser.add_argument('--base-path', type=str,
                        default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环',
                        help='文档根目录路径')
+    parser.add_argument('--incremental', action='store_true',
+                       help='增量模式：只评估新增或变化的文档，其余复用上次结果')
+    parser.add_argument('--manifest', type=str, default=str(DEFAULT_MANIFEST_FILE),
+                       help='增量评估清单路径')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='并行评估的进程数（默认1，即串行）')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -739,34 +876,36 @@ def main():
     print("=" * 80)
     print()
     
-    assessor = DocumentQualityAssessor(args.base_path)
-    reports = assessor.assess_all_documents(Path(args.base_path))
+    with profiling_from_args(args):
+        assessor = DocumentQualityAssessor(args.base_path, manifest_file=Path(args.manifest))
+        reports = assessor.assess_all_documents(Path(args.base_path), incremental=args.incremental,
+                                                workers=args.workers)
     
-    print()
-    print("=" * 80)
-    print("评估完成统计")
-    print("=" * 80)
+        print()
+        print("=" * 80)
+        print("评估完成统计")
+        print("=" * 80)
     
-    if reports:
-        avg_score = sum(r.metrics.overall_score for r in reports) / len(reports)
-        grade_dist = {
-            "A": sum(1 for r in reports if r.grade == "A"),
-            "B": sum(1 for r in reports if r.grade == "B"),
-            "C": sum(1 for r in reports if r.grade == "C"),
-            "D": sum(1 for r in reports if r.grade == "D"),
-            "F": sum(1 for r in reports if r.grade == "F")
-        }
+        if reports:
+            avg_score = sum(r.metrics.overall_score for r in reports) / len(reports)
+            grade_dist = {
+                "A": sum(1 for r in reports if r.grade == "A"),
+                "B": sum(1 for r in reports if r.grade == "B"),
+                "C": sum(1 for r in reports if r.grade == "C"),
+                "D": sum(1 for r in reports if r.grade == "D"),
+                "F": sum(1 for r in reports if r.grade == "F")
+            }
         
-        print(f"\n总文档数: {len(reports)}")
-        print(f"平均评分: {avg_score:.1f}")
-        print(f"通过率: {sum(1 for r in reports if r.metrics.overall_score >= 60) / len(reports) * 100:.1f}%")
-        print(f"\n等级分布:")
-        for grade in ["A", "B", "C", "D", "F"]:
-            print(f"  {grade}: {grade_dist[grade]} 个")
+            print(f"\n总文档数: {len(reports)}")
+            print(f"平均评分: {avg_score:.1f}")
+            print(f"通过率: {sum(1 for r in reports if r.metrics.overall_score >= 60) / len(reports) * 100:.1f}%")
+            print(f"\n等级分布:")
+            for grade in ["A", "B", "C", "D", "F"]:
+                print(f"  {grade}: {grade_dist[grade]} 个")
     
-    print("=" * 80)
+        print("=" * 80)
     
-    assessor.save_report(reports)
+        assessor.save_report(reports)
     
     print("\n✓ 文档质量评估完成！")
 
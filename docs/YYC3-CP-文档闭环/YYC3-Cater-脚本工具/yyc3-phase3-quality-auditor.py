@@ -11,6 +11,8 @@ from datetime import datetime
 from dataclasses import dataclass, field
 from collections import Counter, defaultdict
 
+from yyc3_profiling import add_profile_arguments, profiled, profiling_from_args
+
 
 @dataclass
 class AuditFinding:
@@ -53,6 +55,7 @@ class DocumentQualityAuditor:
         self.audit_report: AuditReport = None
         self.load_report()
     
+    @profiled("load_report")
     def load_report(self):
         """加载质量评估报告"""
         with open(self.report_file, 'r', encoding='utf-8') as f:
@@ -90,6 +93,7 @@ class DocumentQualityAuditor:
         
         return low_score_docs, common_issues, avg_score
     
+    @profiled("identify_critical_issues")
     def identify_critical_issues(self) -> List[AuditFinding]:
         """识别关键问题"""
         findings = []
@@ -156,6 +160,7 @@ class DocumentQualityAuditor:
         
         return findings
     
+    @profiled("analyze_quality_trends")
     def analyze_quality_trends(self) -> List[QualityTrend]:
         """分析质量趋势"""
         trends = []
@@ -199,6 +204,7 @@ class DocumentQualityAuditor:
         
         return trends
     
+    @profiled("generate_improvement_plan")
     def generate_improvement_plan(self) -> Dict[str, List[str]]:
         """生成改进计划"""
         plan = {
@@ -241,6 +247,7 @@ class DocumentQualityAuditor:
         
         return plan
     
+    @profiled("generate_audit_report")
     def generate_audit_report(self) -> AuditReport:
         """生成审计报告"""
         self.audit_report.findings = self.identify_critical_issues()
@@ -249,6 +256,7 @@ class DocumentQualityAuditor:
         
         return self.audit_report
     
+    @profiled("save_audit_report")
     def save_audit_report(self, output_dir: Path):
         """保存审计报告"""
         output_dir.mkdir(exist_ok=True)
@@ -290,6 +298,7 @@ class DocumentQualityAuditor:
         # 保存Markdown格式
         self.save_markdown_report(output_dir)
     
+    @profiled("save_markdown_report")
     def save_markdown_report(self, output_dir: Path):
         """保存Markdown格式的审计报告"""
         md_file = output_dir / f"YYC3-文档质量审计报告_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
@@ -394,6 +403,7 @@ def main():
     parser.add_argument('--output-dir', type=str,
                        default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环/YYC3-Cater-审核报告',
                        help='审计报告输出目录')
+    add_profile_arguments(parser)
     
     args = parser.parse_args()
     
@@ -405,9 +415,10 @@ def main():
     print("=" * 80)
     print()
     
-    auditor = DocumentQualityAuditor(Path(args.report_file))
-    auditor.generate_audit_report()
-    auditor.save_audit_report(Path(args.output_dir))
+    with profiling_from_args(args):
+        auditor = DocumentQualityAuditor(Path(args.report_file))
+        auditor.generate_audit_report()
+        auditor.save_audit_report(Path(args.output_dir))
     
     print()
     print("=" * 80)
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+YYC³ 文档推荐服务 - 第三阶段（P2）
+常驻的本地 HTTP/JSON 推荐服务：知识图谱与索引只加载一次，图谱文件更新后自动热切换
+"""
+
+import asyncio
+import contextlib
+import importlib.util
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from yyc3_graph_store import resolve_graph_file
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
+
+def _load_recommender_module():
+    """加载推荐系统脚本（文件名含连字符，不能直接import）"""
+    module_file = Path(__file__).resolve().parent / "yyc3-phase3-document-recommender.py"
+    spec = importlib.util.spec_from_file_location("yyc3_document_recommender", module_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+recommender_module = _load_recommender_module()
+IntelligentDocumentRecommender = recommender_module.IntelligentDocumentRecommender
+UserContext = recommender_module.UserContext
+
+GRAPH_FILE_PATTERN = "YYC3-文档知识图谱_*.json"
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class RequestError(Exception):
+    """请求错误（携带HTTP状态码）"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class RecommendationService:
+    """推荐服务：持有当前推荐器，监视图谱文件并热切换"""
+
+    def __init__(self, graph_file: Optional[str] = None, graph_dir: Optional[str] = None,
+                 cache_size: int = 1024):
+        """
+        Args:
+            graph_file: 固定的图谱文件（文件被重新生成时自动重载）
+            graph_dir: 图谱目录（出现更新的图谱文件时自动切换）
+            cache_size: 响应缓存条数（0表示不缓存）
+        """
+        if not graph_file and not graph_dir:
+            raise ValueError("需要指定 graph_file 或 graph_dir")
+        self.graph_file = Path(graph_file) if graph_file else None
+        self.graph_dir = Path(graph_dir) if graph_dir else None
+        self.cache_size = cache_size
+
+        self.recommender = None
+        self.signature: Optional[Tuple[str, int, int]] = None
+        self.loaded_at: Optional[str] = None
+        self.generation = 0
+        self.cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.requests = 0
+
+        self._reload_lock = asyncio.Lock()
+
+    def locate_graph(self) -> Optional[Path]:
+        """定位当前应加载的图谱文件（优先二进制图谱）"""
+        if self.graph_file:
+            candidate = self.graph_file
+        else:
+            graphs = list(self.graph_dir.glob(GRAPH_FILE_PATTERN)) + list(
+                self.graph_dir.glob(Path(GRAPH_FILE_PATTERN).with_suffix(".ygraph").name)
+            )
+            if not graphs:
+                return None
+            candidate = max(graphs, key=lambda p: (p.stat().st_mtime_ns, p.name))
+        resolved = resolve_graph_file(candidate)
+        return resolved if resolved.exists() else None
+
+    @staticmethod
+    def _signature(graph_file: Path) -> Tuple[str, int, int]:
+        stat = graph_file.stat()
+        return str(graph_file), stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _build_recommender(graph_file: Path):
+        # 推荐器在线程中加载，不能替换进程级的stdout，关闭其进度输出，服务中只保留自己的日志
+        with stage("load_graph", graph=graph_file.name):
+            return IntelligentDocumentRecommender(str(graph_file), verbose=False)
+
+    async def reload_if_changed(self) -> bool:
+        """图谱文件有变化时在线程中加载新图谱，完成后再替换，期间请求继续由旧图谱处理"""
+        async with self._reload_lock:
+            graph_file = self.locate_graph()
+            if graph_file is None:
+                return False
+            try:
+                signature = self._signature(graph_file)
+            except FileNotFoundError:
+                return False
+            if signature == self.signature:
+                return False
+
+            started = time.perf_counter()
+            try:
+                recommender = await asyncio.to_thread(self._build_recommender, graph_file)
+            except Exception as e:
+                # 图谱可能尚未写完，保留旧图谱，下次轮询重试
+                print(f"✗ 加载图谱失败: {graph_file.name} - {e}")
+                return False
+
+            self.recommender = recommender
+            self.signature = signature
+            self.loaded_at = datetime.now().isoformat()
+            self.generation += 1
+            self.cache.clear()
+            print(f"✓ 已加载图谱: {graph_file.name} "
+                  f"({len(recommender.documents)} 个文档, {(time.perf_counter() - started) * 1000:.1f} ms)")
+            return True
+
+    async def watch(self, interval: float):
+        """轮询图谱文件"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                print(f"⚠ 检查图谱更新失败: {e}")
+
+    # ---- 请求处理 ----
+
+    @staticmethod
+    def _param(params: Dict[str, List[str]], name: str, required: bool = False) -> Optional[str]:
+        values = params.get(name)
+        value = values[-1].strip() if values else ""
+        if required and not value:
+            raise RequestError(400, f"缺少参数: {name}")
+        return value or None
+
+    @staticmethod
+    def _list_param(params: Dict[str, List[str]], name: str) -> List[str]:
+        items = []
+        for value in params.get(name, []):
+            items.extend(part.strip() for part in value.replace(",", " ").split())
+        return [item for item in items if item]
+
+    def _limit(self, params: Dict[str, List[str]]) -> int:
+        value = self._param(params, "limit") or "10"
+        try:
+            limit = int(value)
+        except ValueError:
+            raise RequestError(400, f"limit 不是整数: {value}")
+        if not 1 <= limit <= 1000:
+            raise RequestError(400, "limit 需在 1-1000 之间")
+        return limit
+
+    def recommend(self, kind: str, params: Dict[str, List[str]]) -> Dict:
+        """执行一次推荐，参数与命令行工具一致"""
+        recommender = self.recommender
+        limit = self._limit(params)
+        query = self._param(params, "q") or ""
+
+        if kind == "keyword":
+            keywords = self._list_param(params, "q")
+            if not keywords:
+                raise RequestError(400, "缺少参数: q")
+            results = recommender.search_by_keywords(keywords, limit)
+        elif kind == "concept":
+            self._param(params, "q", required=True)
+            results = recommender.recommend_by_concepts(recommender.extract_concepts(query), limit)
+        elif kind == "document":
+            document = self._param(params, "document", required=True)
+            results = recommender.recommend_by_document(document, limit)
+        elif kind == "category":
+            category = self._param(params, "category", required=True)
+            results = recommender.recommend_by_category(category, limit)
+        elif kind == "personalized":
+            user_context = UserContext(
+                current_document=self._param(params, "document"),
+                viewed_documents=self._list_param(params, "viewed"),
+                interests=self._list_param(params, "interests") or self._list_param(params, "q"),
+                role=self._param(params, "role") or "developer"
+            )
+            results = recommender.personalized_recommend(user_context, limit)
+        elif kind == "hybrid":
+            self._param(params, "q", required=True)
+            user_context = UserContext(
+                current_document=self._param(params, "document"),
+                viewed_documents=self._list_param(params, "viewed"),
+                interests=self._list_param(params, "interests")
+            )
+            results = recommender.hybrid_recommend(query, user_context, limit)
+        else:
+            raise RequestError(404, f"未知的推荐类型: {kind}")
+
+        return {
+            "type": kind,
+            "query": query,
+            "total_results": len(results),
+            "results": [asdict(r) for r in results],
+        }
+
+    def health(self) -> Dict:
+        recommender = self.recommender
+        return {
+            "status": "ok" if recommender else "loading",
+            "graph_file": self.signature[0] if self.signature else None,
+            "loaded_at": self.loaded_at,
+            "generation": self.generation,
+            "documents": len(recommender.documents) if recommender else 0,
+            "concepts": len(recommender.concepts) if recommender else 0,
+            "requests": self.requests,
+        }
+
+    def handle(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        """处理一个请求，返回 (状态码, JSON响应体)"""
+        self.requests += 1
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/health":
+            return 200, _json_bytes(self.health())
+
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "recommend":
+            raise RequestError(404, f"未知路径: {url.path}")
+        if method not in ("GET", "POST"):
+            raise RequestError(405, f"不支持的方法: {method}")
+        if self.recommender is None:
+            raise RequestError(503, "知识图谱尚未加载")
+
+        params = parse_qs(url.query)
+        if method == "POST" and body:
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise RequestError(400, f"请求体不是合法JSON: {e}")
+            if not isinstance(payload, dict):
+                raise RequestError(400, "请求体必须是JSON对象")
+            for key, value in payload.items():
+                values = value if isinstance(value, list) else [value]
+                params[key] = [str(v) for v in values]
+
+        cache_key = (self.generation, parts[1], tuple(sorted((k, tuple(v)) for k, v in params.items())))
+        if self.cache_size:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.cache.move_to_end(cache_key)
+                return 200, cached
+
+        response = _json_bytes(self.recommend(parts[1], params))
+        if self.cache_size:
+            self.cache[cache_key] = response
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        return 200, response
+
+
+def _json_bytes(data: Dict) -> bytes:
+    return json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+
+class RecommendationHTTPServer:
+    """基于 asyncio streams 的最小 HTTP/1.1 服务（支持keep-alive）"""
+
+    MAX_BODY = 1 << 20
+
+    def __init__(self, service: RecommendationService, host: str, port: int):
+        self.service = service
+        self.host = host
+        self.port = port
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, _json_bytes({"error": "请求行格式错误"}), False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              if version == "HTTP/1.1" else headers.get("connection", "").lower() == "keep-alive")
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError
+                except ValueError:
+                    # 无法确定请求体边界，不能继续复用连接
+                    await self._respond(writer, 400, _json_bytes({"error": "Content-Length 无效"}), False)
+                    break
+                if length > self.MAX_BODY:
+                    await self._respond(writer, 413, _json_bytes({"error": "请求体过大"}), False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                try:
+                    status, payload = self.service.handle(method.upper(), target, body)
+                except RequestError as e:
+                    status, payload = e.status, _json_bytes({"error": str(e)})
+                except Exception as e:
+                    status, payload = 500, _json_bytes({"error": f"{type(e).__name__}: {e}"})
+
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _respond(writer: asyncio.StreamWriter, status: int, payload: bytes, keep_alive: bool):
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        writer.write(head + payload)
+        await writer.drain()
+
+    async def serve(self, reload_interval: float):
+        await self.service.reload_if_changed()
+        if self.service.recommender is None:
+            print("⚠ 未找到知识图谱文件，等待图谱生成...")
+        watcher = asyncio.create_task(self.service.watch(reload_interval))
+        server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        print(f"✓ 推荐服务已启动: http://{self.host}:{self.port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+
+
+def main():
+    """主函数"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文档推荐服务')
+    parser.add_argument('--graph-file', type=str, help='知识图谱文件路径（文件更新后自动重载）')
+    parser.add_argument('--graph-dir', type=str,
+                       default='/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环/YYC3-Cater-审核报告',
+                       help='知识图谱目录（未指定 --graph-file 时使用其中最新的图谱）')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=8765, help='监听端口')
+    parser.add_argument('--reload-interval', type=float, default=2.0, help='检查图谱更新的间隔（秒）')
+    parser.add_argument('--cache-size', type=int, default=1024, help='响应缓存条数（0表示不缓存）')
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("YYC³ 文档推荐服务 - 第三阶段（P2）")
+    print("=" * 80)
+    print(f"知识图谱: {args.graph_file or args.graph_dir}")
+    print(f"监听地址: {args.host}:{args.port}")
+    print("=" * 80)
+    print()
+
+    service = RecommendationService(
+        graph_file=args.graph_file,
+        graph_dir=None if args.graph_file else args.graph_dir,
+        cache_size=args.cache_size
+    )
+    server = RecommendationHTTPServer(service, args.host, args.port)
+    # 剖析结果在服务停止时写出，覆盖图谱加载与全部请求
+    with profiling_from_args(args):
+        try:
+            asyncio.run(server.serve(args.reload_interval))
+        except KeyboardInterrupt:
+            print("\n✓ 推荐服务已停止")
+
+
+if __name__ == "__main__":
+    main()
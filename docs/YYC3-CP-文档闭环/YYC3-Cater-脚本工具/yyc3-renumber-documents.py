@@ -9,6 +9,8 @@ YYC³ 文档编号重新编号脚本
 from pathlib import Path
 import re
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 def extract_number_from_filename(filename: str) -> tuple[int, str]:
     """
@@ -59,6 +61,12 @@ def main():
     """
     主函数
     """
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='YYC³ 文档重新编号工具')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    
     base_path = Path(__file__).parent
     
     print("=" * 80)
@@ -67,17 +75,20 @@ def main():
     
     total_renamed = 0
     
-    # 遍历所有分类目录
-    for category_dir in sorted(base_path.iterdir()):
-        if not category_dir.is_dir():
-            continue
-        
-        # 检查架构类和技巧类子目录
-        for sub_dir in ['架构类', '技巧类']:
-            sub_path = category_dir / sub_dir
-            if sub_path.exists() and sub_path.is_dir():
-                renamed = renumber_directory(sub_path)
-                total_renamed += renamed
+    with profiling_from_args(args):
+        # 遍历所有分类目录
+        for category_dir in sorted(base_path.iterdir()):
+            if not category_dir.is_dir():
+                continue
+            
+            # 检查架构类和技巧类子目录
+            for sub_dir in ['架构类', '技巧类']:
+                sub_path = category_dir / sub_dir
+                if sub_path.exists() and sub_path.is_dir():
+                    with stage("renumber_directory", directory=str(sub_path)) as record:
+                        renamed = renumber_directory(sub_path)
+                        record.items = renamed
+                    total_renamed += renamed
     
     print("\n" + "=" * 80)
     print("重新编号完成")
@@ -18,6 +18,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple
 import shutil
 
+from yyc3_profiling import add_profile_arguments, profiling_from_args, stage
+
 
 class DocumentNameStandardizer:
     """文档命名规范化工具"""
@@ -402,47 +404,57 @@ python3 yyc3-standardize-document-names.py --apply
 
 def main():
     """主函数"""
-    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description='YYC³ 文档命名规范化工具')
+    parser.add_argument('--apply', action='store_true', help='实际执行重命名（默认试运行）')
+    add_profile_arguments(parser)
+    args = parser.parse_args()
 
     # 设置基础路径
     base_path = '/Users/yanyu/yyc3-catering-platform/docs/YYC3-Cater-Platform-文档闭环'
 
-    # 创建规范化工具
-    standardizer = DocumentNameStandardizer(base_path)
-
-    # 分析问题
-    print('分析文档命名问题...')
-    issues = standardizer.analyze_naming_issues()
-
-    print(f'发现 {len(issues["missing_numbers"])} 个编号断层')
-    print(f'发现 {len(issues["duplicate_names"])} 组重复名称')
-    print(f'发现 {len(issues["invalid_format"])} 个格式无效')
-
-    # 生成建议
-    print('生成重命名建议...')
-    suggestions = standardizer.suggest_renames()
-    print(f'共 {len(suggestions)} 个重命名建议')
-
-    # 应用重命名
-    apply = '--apply' in sys.argv
-    if apply:
-        print('应用重命名...')
-        results = standardizer.apply_renames(dry_run=False)
-        print(f'成功重命名 {sum(1 for r in results if r["status"] == "success")} 个文件')
-    else:
-        print('试运行模式（不实际重命名）...')
-        results = standardizer.apply_renames(dry_run=True)
-        print(f'将重命名 {sum(1 for r in results if r["status"] == "dry_run")} 个文件')
-
-    # 生成报告
-    print('生成规范化报告...')
-    report = standardizer.generate_report()
-
-    # 保存报告
-    report_path = Path(base_path) / 'YYC3-Cater-审核报告' / 'YYC3-文档命名规范化报告.md'
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    with profiling_from_args(args):
+        # 创建规范化工具
+        standardizer = DocumentNameStandardizer(base_path)
+
+        # 分析问题
+        print('分析文档命名问题...')
+        with stage("analyze_naming_issues"):
+            issues = standardizer.analyze_naming_issues()
+
+        print(f'发现 {len(issues["missing_numbers"])} 个编号断层')
+        print(f'发现 {len(issues["duplicate_names"])} 组重复名称')
+        print(f'发现 {len(issues["invalid_format"])} 个格式无效')
+
+        # 生成建议
+        print('生成重命名建议...')
+        with stage("suggest_renames") as record:
+            suggestions = standardizer.suggest_renames()
+            record.items = len(suggestions)
+        print(f'共 {len(suggestions)} 个重命名建议')
+
+        # 应用重命名
+        with stage("apply_renames"):
+            if args.apply:
+                print('应用重命名...')
+                results = standardizer.apply_renames(dry_run=False)
+                print(f'成功重命名 {sum(1 for r in results if r["status"] == "success")} 个文件')
+            else:
+                print('试运行模式（不实际重命名）...')
+                results = standardizer.apply_renames(dry_run=True)
+                print(f'将重命名 {sum(1 for r in results if r["status"] == "dry_run")} 个文件')
+
+        # 生成报告
+        print('生成规范化报告...')
+        with stage("generate_report"):
+            report = standardizer.generate_report()
+
+        # 保存报告
+        report_path = Path(base_path) / 'YYC3-Cater-审核报告' / 'YYC3-文档命名规范化报告.md'
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            f.write(report)
 
     print(f'规范化报告已保存到：{report_path}')
     print('规范化完成！')
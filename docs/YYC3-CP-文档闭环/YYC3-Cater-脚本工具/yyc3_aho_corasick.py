@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_aho_corasick.py
+@description: YYC³ Aho-Corasick 多模式匹配自动机 - 一次扫描文本即可找出词表中的全部命中
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import re
+from collections import Counter, deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """与正则 \\w 一致的单词字符判断（Unicode字母数字和下划线）"""
+    return char.isalnum() or char == '_'
+
+
+def is_word_boundary(text: str, index: int) -> bool:
+    """text 的 index 位置是否为单词边界（与正则 \\b 的语义一致）"""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class AhoCorasick:
+    """Aho-Corasick 自动机（纯Python实现）"""
+
+    def __init__(self, patterns: Iterable[str], ignore_case: bool = False):
+        """
+        构建自动机
+
+        Args:
+            patterns: 模式串（空串会被忽略，重复模式只保留一次）
+            ignore_case: 是否忽略大小写
+        """
+        self.ignore_case = ignore_case
+        self.patterns: List[str] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        seen = set()
+        for pattern in patterns:
+            if not pattern or pattern in seen:
+                continue
+            seen.add(pattern)
+            self._add(pattern)
+        self._build()
+        
+        # 根状态只能由这些字符离开，在根状态时用正则直接跳到下一个候选位置
+        first_chars = ''.join(re.escape(char) for char in self._goto[0])
+        self._skip = re.compile(f'[{first_chars}]') if first_chars else None
+
+    def _add(self, pattern: str):
+        key = pattern.lower() if self.ignore_case else pattern
+        state = 0
+        for char in key:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + (len(self.patterns),)
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter_matches(self, text: str, whole_words: bool = False) -> Iterator[Tuple[int, int, str]]:
+        """
+        扫描文本，按结束位置依次产出 (起始位置, 结束位置, 模式串)
+
+        Args:
+            text: 待扫描文本
+            whole_words: 只产出两端都是单词边界的命中（等价于正则 \\b模式\\b）
+
+        Returns:
+            命中迭代器，位置为半开区间 [start, end)
+        """
+        if self._skip is None:
+            return
+        if self.ignore_case:
+            text = text.lower()
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        search = self._skip.search
+        state = 0
+        index = 0
+        length = len(text)
+        while index < length:
+            if not state:
+                match = search(text, index)
+                if match is None:
+                    return
+                index = match.start()
+            char = text[index]
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            index += 1
+            for pattern_id in out[state]:
+                pattern = patterns[pattern_id]
+                start = index - len(pattern)
+                if whole_words and not (is_word_boundary(text, start) and is_word_boundary(text, index)):
+                    continue
+                yield start, index, pattern
+
+    def find_all(self, text: str, whole_words: bool = False) -> Set[str]:
+        """返回文本中出现过的所有模式串"""
+        return {pattern for _, _, pattern in self.iter_matches(text, whole_words)}
+
+    def count(self, text: str, whole_words: bool = False) -> Counter:
+        """统计每个模式串在文本中出现的次数（允许重叠）"""
+        return Counter(pattern for _, _, pattern in self.iter_matches(text, whole_words))
+
+
+@lru_cache(maxsize=64)
+def _cached_automaton(patterns: Tuple[str, ...], ignore_case: bool) -> AhoCorasick:
+    return AhoCorasick(patterns, ignore_case=ignore_case)
+
+
+def get_automaton(patterns: Iterable[str], ignore_case: bool = False) -> AhoCorasick:
+    """
+    获取词表对应的自动机，同一词表只构建一次
+
+    Args:
+        patterns: 词表（顺序和内容相同即视为同一词表）
+        ignore_case: 是否忽略大小写
+    """
+    return _cached_automaton(tuple(patterns), ignore_case)
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_doc_corpus.py
+@description: YYC³文档语料共享层 - 每个文档只解析一次，解析结果按路径与内容哈希持久化，供各审核/分析脚本复用
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# 解析器版本，解析逻辑变化时递增，使旧缓存自动失效
+PARSER_VERSION = 3
+
+# 默认缓存位置：与脚本同目录，所有脚本共享同一份缓存
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / ".yyc3-cache"
+DEFAULT_CACHE_FILE = DEFAULT_CACHE_DIR / "corpus.sqlite3"
+
+FENCE_RE = re.compile(r'^\s*(`{3,}|~{3,})\s*([^`\s]*)')
+HEADING_RE = re.compile(r'^(#+)\s+(.+)$')
+LINK_RE = re.compile(r'\[([^\]]+)\]\(((?:[^()]|\([^()]*\))+)\)')
+ANNOTATION_RE = re.compile(r'^\*{0,2}@(\w+)\*{0,2}\s*[:：]\s*(.*)$')
+FRONT_MATTER_RE = re.compile(r'^([\w-]+)\s*:\s*(.*)$')
+LIST_ITEM_RE = re.compile(r'^\s*[-*+]\s+')
+TERM_RE = re.compile(r'\b[A-Z][a-zA-Z]+\b')
+
+
+@dataclass
+class Heading:
+    """标题"""
+    level: int
+    text: str
+    line: int
+
+
+@dataclass
+class CodeBlock:
+    """代码块"""
+    lang: str
+    line: int
+    lines: int  # 代码块内的总行数（不含围栏）
+    nonblank_lines: int  # 代码块内的非空行数
+
+
+@dataclass
+class Link:
+    """Markdown链接"""
+    text: str
+    target: str
+    line: int
+
+
+@dataclass
+class Table:
+    """表格"""
+    line: int
+    rows: int
+
+
+@dataclass
+class ParsedDocument:
+    """解析后的文档结构"""
+    path: str
+    name: str
+    size: int
+    mtime_ns: int
+    sha256: str
+    title: str = ""
+    front_matter: Dict[str, str] = field(default_factory=dict)
+    headings: List[Heading] = field(default_factory=list)
+    code_blocks: List[CodeBlock] = field(default_factory=list)
+    links: List[Link] = field(default_factory=list)
+    tables: List[Table] = field(default_factory=list)
+    line_count: int = 0
+    content_lines: int = 0  # 非空且不以#开头的行数
+    word_count: int = 0
+    char_count: int = 0
+    list_items: int = 0  # 代码块外的列表项数
+    paragraphs: int = 0  # 以空行分隔的段落数（代码块算作所在段落的一部分）
+    paragraph_chars: int = 0  # 段落总字符数（含换行）
+    term_counts: Dict[str, int] = field(default_factory=dict)  # 代码块外大写开头英文术语的出现次数
+
+    @property
+    def sections(self) -> List[Heading]:
+        """二级标题"""
+        return [h for h in self.headings if h.level == 2]
+
+    @property
+    def table_rows(self) -> int:
+        """表格总行数"""
+        return sum(t.rows for t in self.tables)
+
+    @property
+    def code_lines(self) -> int:
+        """代码块内的非空行数"""
+        return sum(c.nonblank_lines for c in self.code_blocks)
+
+    @property
+    def md_links(self) -> List[Link]:
+        """指向Markdown文档的链接"""
+        return [link for link in self.links if link.target.split('#')[0].lower().endswith('.md')]
+
+    def to_dict(self) -> Dict:
+        # 结构只有一层嵌套，逐层复制比 asdict 的递归深拷贝快得多
+        data = dict(vars(self))
+        for key in ('headings', 'code_blocks', 'links', 'tables'):
+            data[key] = [dict(vars(item)) for item in data[key]]
+        data['front_matter'] = dict(self.front_matter)
+        data['term_counts'] = dict(self.term_counts)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParsedDocument':
+        data = dict(data)
+        data['headings'] = [Heading(**h) for h in data.get('headings', [])]
+        data['code_blocks'] = [CodeBlock(**c) for c in data.get('code_blocks', [])]
+        data['links'] = [Link(**l) for l in data.get('links', [])]
+        data['tables'] = [Table(**t) for t in data.get('tables', [])]
+        return cls(**data)
+
+
+def _starts_with_front_matter(lines: List[str]) -> bool:
+    """开头的 --- 后第一个非空行是 key: value 时才视为头部信息，否则只是分隔线"""
+    if not lines or lines[0].strip() != '---':
+        return False
+    for line in lines[1:]:
+        stripped = line.strip()
+        if stripped:
+            return stripped != '---' and bool(FRONT_MATTER_RE.match(stripped))
+    return False
+
+
+def parse_markdown(content: str, path: str = "", size: int = 0, mtime_ns: int = 0,
+                   sha256: str = "") -> ParsedDocument:
+    """逐行扫描一次文档，提取标题、代码块、链接、表格、列表、段落、术语和统计信息"""
+    lines = content.split('\n')
+    doc = ParsedDocument(
+        path=path,
+        name=Path(path).name if path else "",
+        size=size,
+        mtime_ns=mtime_ns,
+        sha256=sha256,
+        line_count=len(lines),
+        word_count=len(content.split()),
+        char_count=len(content)
+    )
+
+    fence = None  # 当前代码块的围栏字符串
+    block = None
+    table = None
+    in_front_matter = _starts_with_front_matter(lines)
+    paragraph_chars = 0  # 当前段落的字符数，0表示不在段落中
+    terms: Dict[str, int] = {}
+
+    for index, line in enumerate(lines):
+        line_no = index + 1
+        stripped = line.strip()
+        if stripped and not stripped.startswith('#'):
+            doc.content_lines += 1
+
+        if stripped or (fence is not None and paragraph_chars):
+            paragraph_chars += len(line) + 1
+        elif paragraph_chars:
+            doc.paragraphs += 1
+            doc.paragraph_chars += paragraph_chars
+            paragraph_chars = 0
+
+        if in_front_matter:
+            if index > 0 and stripped == '---':
+                in_front_matter = False
+            elif index > 0:
+                match = FRONT_MATTER_RE.match(stripped)
+                if match:
+                    doc.front_matter.setdefault(match.group(1), match.group(2).strip())
+            continue
+
+        if fence is not None:
+            if stripped.startswith(fence) and not stripped[len(fence):].strip(fence[0]).strip():
+                fence = None
+                block = None
+            else:
+                block.lines += 1
+                if line:
+                    block.nonblank_lines += 1
+            continue
+
+        fence_match = FENCE_RE.match(line)
+        if fence_match:
+            fence = fence_match.group(1)
+            block = CodeBlock(lang=fence_match.group(2), line=line_no, lines=0, nonblank_lines=0)
+            doc.code_blocks.append(block)
+            table = None
+            continue
+
+        heading_match = HEADING_RE.match(line)
+        if heading_match:
+            heading = Heading(level=len(heading_match.group(1)), text=heading_match.group(2).strip(), line=line_no)
+            doc.headings.append(heading)
+            if heading.level == 1 and not doc.title:
+                doc.title = heading.text
+
+        if stripped.startswith('|'):
+            if table is None:
+                table = Table(line=line_no, rows=0)
+                doc.tables.append(table)
+            table.rows += 1
+        else:
+            table = None
+
+        annotation = ANNOTATION_RE.match(stripped)
+        if annotation:
+            doc.front_matter.setdefault(annotation.group(1), annotation.group(2).strip())
+
+        if '](' in line:
+            for text, target in LINK_RE.findall(line):
+                doc.links.append(Link(text=text, target=target.strip(), line=line_no))
+
+        if LIST_ITEM_RE.match(line):
+            doc.list_items += 1
+
+        for term in TERM_RE.findall(line):
+            terms[term] = terms.get(term, 0) + 1
+
+    if paragraph_chars:
+        doc.paragraphs += 1
+        doc.paragraph_chars += paragraph_chars
+    doc.term_counts = terms
+    return doc
+
+
+class DocumentCorpus:
+    """文档语料库：解析结果按 (路径, mtime, 大小, sha256) 缓存在SQLite中"""
+
+    def __init__(self, cache_file: Optional[Path] = DEFAULT_CACHE_FILE):
+        """
+        初始化语料库
+
+        Args:
+            cache_file: 缓存文件路径，为None时只在内存中缓存
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.documents: Dict[str, ParsedDocument] = {}
+        self._texts: Dict[str, str] = {}
+        self._conn = None
+        self.stats = {'cached': 0, 'parsed': 0}
+
+        if self.cache_file:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_file), timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documents ("
+                " path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, sha256 TEXT,"
+                " parser_version INTEGER, parsed TEXT, content TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_documents_sha256 ON documents (sha256)")
+
+    def _lookup(self, key: str):
+        if not self._conn:
+            return None
+        return self._conn.execute(
+            "SELECT mtime_ns, size, sha256, parser_version, parsed FROM documents WHERE path = ?",
+            (key,)
+        ).fetchone()
+
+    def get(self, file_path: Path, keep: bool = True) -> ParsedDocument:
+        """
+        获取文档解析结果，未变化的文档直接使用缓存而不读取文件
+
+        Args:
+            file_path: 文档路径
+            keep: 是否在内存中保留解析结果；每个文档只用一次的调用方可以关闭以限制内存
+        """
+        file_path = Path(file_path)
+        key = str(file_path.resolve())
+        if key in self.documents:
+            return self.documents[key]
+
+        stat = file_path.stat()
+        row = self._lookup(key)
+        if row and row[0] == stat.st_mtime_ns and row[1] == stat.st_size and row[3] == PARSER_VERSION:
+            doc = ParsedDocument.from_dict(json.loads(row[4]))
+            doc.path = str(file_path)
+            if keep:
+                self.documents[key] = doc
+            self.stats['cached'] += 1
+            return doc
+
+        raw = file_path.read_bytes()
+        sha256 = hashlib.sha256(raw).hexdigest()
+        content = raw.decode('utf-8')
+
+        if row and row[2] == sha256 and row[3] == PARSER_VERSION:
+            # 仅mtime变化（如touch、checkout），内容未变，复用解析结果
+            doc = ParsedDocument.from_dict(json.loads(row[4]))
+            doc.path = str(file_path)
+            doc.mtime_ns = stat.st_mtime_ns
+            self.stats['cached'] += 1
+        else:
+            doc = parse_markdown(content, str(file_path), stat.st_size, stat.st_mtime_ns, sha256)
+            self.stats['parsed'] += 1
+
+        if self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, stat.st_mtime_ns, stat.st_size, sha256, PARSER_VERSION,
+                 json.dumps(doc.to_dict(), ensure_ascii=False), content)
+            )
+        elif keep:
+            self._texts[key] = content
+
+        if keep:
+            self.documents[key] = doc
+        return doc
+
+    def load(self, files: Iterable[Path]) -> List[ParsedDocument]:
+        """批量加载文档（保持传入顺序）"""
+        docs = [self.get(f) for f in files]
+        self.commit()
+        return docs
+
+    def scan(self, directory: Path, pattern: str = "*.md", recursive: bool = True,
+             exclude_names: Iterable[str] = ("README.md",)) -> List[ParsedDocument]:
+        """扫描目录并加载其中的文档"""
+        excluded = set(exclude_names)
+        files = Path(directory).rglob(pattern) if recursive else Path(directory).glob(pattern)
+        return self.load(f for f in files if f.name not in excluded)
+
+    def text(self, doc: ParsedDocument) -> str:
+        """获取文档原文：优先从缓存读取，不常驻内存"""
+        key = str(Path(doc.path).resolve())
+        if key in self._texts:
+            return self._texts[key]
+        if self._conn:
+            row = self._conn.execute(
+                "SELECT content FROM documents WHERE path = ? AND sha256 = ?",
+                (key, doc.sha256)
+            ).fetchone()
+            if row:
+                return row[0]
+        return Path(doc.path).read_text(encoding='utf-8')
+
+    def commit(self):
+        """提交缓存写入"""
+        if self._conn:
+            self._conn.commit()
+
+    def close(self):
+        """关闭缓存"""
+        if self._conn:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_doc_diff.py
+@description: YYC³文档差异引擎 - 单个文档两个版本间的行级和章节级（## 标题）差异，按 (blob_a, blob_b) 内容寻址缓存
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import difflib
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from yyc3_doc_corpus import DEFAULT_CACHE_DIR, FENCE_RE, HEADING_RE
+
+
+# 差异算法或结果结构变化时递增，使旧缓存自动失效
+DIFF_ENGINE_VERSION = 1
+
+DEFAULT_DIFF_CACHE_FILE = DEFAULT_CACHE_DIR / "diffs.sqlite3"
+
+# 统一diff的上下文行数
+CONTEXT_LINES = 3
+
+# 不存在的文件（新增或删除）在缓存键中使用的对象ID
+MISSING_BLOB = "-"
+
+PREAMBLE = "（前言）"
+
+
+@dataclass
+class SectionChange:
+    """章节（二级标题）级别的变更"""
+    title: str
+    change: str  # added / removed / modified
+    additions: int = 0
+    deletions: int = 0
+
+
+@dataclass
+class DocumentDiff:
+    """单个文档两个版本间的差异"""
+    blob_a: str
+    blob_b: str
+    additions: int = 0
+    deletions: int = 0
+    sections: List[SectionChange] = field(default_factory=list)
+    unified_diff: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return self.additions > 0 or self.deletions > 0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'DocumentDiff':
+        data = dict(data)
+        data['sections'] = [SectionChange(**s) for s in data.get('sections', [])]
+        return cls(**data)
+
+
+def split_sections(lines: List[str]) -> List[Tuple[str, List[str]]]:
+    """按二级标题切分文档（忽略代码块中的 ##），第一个二级标题前的内容归入前言"""
+    sections = [(PREAMBLE, [])]
+    in_code = False
+    for line in lines:
+        if FENCE_RE.match(line):
+            in_code = not in_code
+        elif not in_code:
+            match = HEADING_RE.match(line)
+            if match and len(match.group(1)) == 2:
+                sections.append((match.group(2).strip(), []))
+        sections[-1][1].append(line)
+    if not sections[0][1]:
+        sections.pop(0)
+    return sections
+
+
+def _count_changes(matcher: difflib.SequenceMatcher) -> Tuple[int, int]:
+    additions = deletions = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            deletions += i2 - i1
+        if tag in ('replace', 'insert'):
+            additions += j2 - j1
+    return additions, deletions
+
+
+def _unified_diff(matcher: difflib.SequenceMatcher, old: List[str], new: List[str]) -> List[str]:
+    """由已计算的匹配结果生成统一diff（不再重复比较）"""
+    output = []
+    for group in matcher.get_grouped_opcodes(CONTEXT_LINES):
+        first, last = group[0], group[-1]
+        old_start, old_len = first[1], last[2] - first[1]
+        new_start, new_len = first[3], last[4] - first[3]
+        output.append(f"@@ -{old_start + 1 if old_len else old_start},{old_len} "
+                      f"+{new_start + 1 if new_len else new_start},{new_len} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+                output.extend(' ' + line for line in old[i1:i2])
+                continue
+            if tag in ('replace', 'delete'):
+                output.extend('-' + line for line in old[i1:i2])
+            if tag in ('replace', 'insert'):
+                output.extend('+' + line for line in new[j1:j2])
+    return output
+
+
+def _section_key_counts(sections: List[Tuple[str, List[str]]]) -> List[Tuple[str, int]]:
+    """同名章节按出现次序区分"""
+    seen: Dict[str, int] = {}
+    keys = []
+    for title, _ in sections:
+        seen[title] = seen.get(title, 0) + 1
+        keys.append((title, seen[title]))
+    return keys
+
+
+def diff_documents(old_text: str, new_text: str, blob_a: str = MISSING_BLOB,
+                   blob_b: str = MISSING_BLOB) -> DocumentDiff:
+    """
+    计算文档两个版本间的行级和章节级差异
+
+    Args:
+        old_text: 旧版本内容（不存在时为空字符串）
+        new_text: 新版本内容
+        blob_a: 旧版本的对象ID
+        blob_b: 新版本的对象ID
+
+    Returns:
+        DocumentDiff: 差异结果
+    """
+    old = old_text.splitlines()
+    new = new_text.splitlines()
+    matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+    additions, deletions = _count_changes(matcher)
+    result = DocumentDiff(blob_a=blob_a, blob_b=blob_b, additions=additions, deletions=deletions,
+                          unified_diff=_unified_diff(matcher, old, new))
+    if not result.changed:
+        return result
+
+    old_sections = split_sections(old)
+    new_sections = split_sections(new)
+    old_by_key = dict(zip(_section_key_counts(old_sections), (lines for _, lines in old_sections)))
+    new_keys = _section_key_counts(new_sections)
+
+    for key, (title, lines) in zip(new_keys, new_sections):
+        previous = old_by_key.pop(key, None)
+        if previous is None:
+            result.sections.append(SectionChange(title, "added", additions=len(lines)))
+        elif previous != lines:
+            added, deleted = _count_changes(difflib.SequenceMatcher(None, previous, lines, autojunk=False))
+            result.sections.append(SectionChange(title, "modified", additions=added, deletions=deleted))
+    for (title, _), lines in old_by_key.items():
+        result.sections.append(SectionChange(title, "removed", deletions=len(lines)))
+    return result
+
+
+class DiffCache:
+    """内容寻址的差异缓存：相同的 (blob_a, blob_b) 只计算一次"""
+
+    def __init__(self, cache_file: Optional[Path] = DEFAULT_DIFF_CACHE_FILE, memory_size: int = 1024):
+        """
+        Args:
+            cache_file: SQLite缓存文件，为None时只在内存中缓存
+            memory_size: 内存中保留的差异结果数
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.memory_size = memory_size
+        self._memory: 'OrderedDict[Tuple[str, str], DocumentDiff]' = OrderedDict()
+        self._conn = None
+        self.stats = {'hits': 0, 'computed': 0}
+
+        if self.cache_file:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.cache_file), timeout=30)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS diffs ("
+                " blob_a TEXT, blob_b TEXT, engine_version INTEGER, result TEXT,"
+                " PRIMARY KEY (blob_a, blob_b))"
+            )
+
+    def _remember(self, key: Tuple[str, str], diff: DocumentDiff):
+        self._memory[key] = diff
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, blob_a: str, blob_b: str) -> Optional[DocumentDiff]:
+        """查找缓存的差异"""
+        key = (blob_a, blob_b)
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.stats['hits'] += 1
+            return self._memory[key]
+        if self._conn:
+            row = self._conn.execute(
+                "SELECT result FROM diffs WHERE blob_a = ? AND blob_b = ? AND engine_version = ?",
+                (blob_a, blob_b, DIFF_ENGINE_VERSION)
+            ).fetchone()
+            if row:
+                diff = DocumentDiff.from_dict(json.loads(row[0]))
+                self._remember(key, diff)
+                self.stats['hits'] += 1
+                return diff
+        return None
+
+    def put(self, diff: DocumentDiff):
+        """保存差异结果"""
+        self.put_many([diff])
+
+    def put_many(self, diffs: Iterable[DocumentDiff]):
+        """在一个事务中保存一组差异结果"""
+        diffs = list(diffs)
+        for diff in diffs:
+            self._remember((diff.blob_a, diff.blob_b), diff)
+        if self._conn and diffs:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO diffs VALUES (?, ?, ?, ?)",
+                    [(diff.blob_a, diff.blob_b, DIFF_ENGINE_VERSION, json.dumps(diff.to_dict(), ensure_ascii=False))
+                     for diff in diffs]
+                )
+
+    def diff(self, blob_a: str, blob_b: str, old_text: str, new_text: str) -> DocumentDiff:
+        """返回缓存的差异，没有时计算并缓存"""
+        cached = self.get(blob_a, blob_b)
+        if cached is not None:
+            return cached
+        return self.compute_many([(blob_a, blob_b, old_text, new_text)])[0]
+
+    def compute_many(self, items: Iterable[Tuple[str, str, str, str]]) -> List[DocumentDiff]:
+        """
+        计算一组未缓存的差异，全部算完后在一个事务中写入缓存
+        
+        Args:
+            items: (blob_a, blob_b, 旧文本, 新文本) 列表
+        """
+        diffs = [diff_documents(old_text, new_text, blob_a, blob_b) for blob_a, blob_b, old_text, new_text in items]
+        self.stats['computed'] += len(diffs)
+        self.put_many(diffs)
+        return diffs
+
+    def close(self):
+        """关闭缓存"""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_git.py
+@description: YYC³ Git访问层 - 直接读取引用文件获取HEAD，一次 diff --numstat -z 统计多个文件，常驻 cat-file --batch 进程批量读取对象
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import os
+import re
+import subprocess
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# 完整的提交哈希（SHA-1 / SHA-256），对应的diff结果不会变化，可以缓存
+FULL_HASH_RE = re.compile(r'^(?:[0-9a-f]{40}|[0-9a-f]{64})$')
+
+# 路径过多时不再逐个传pathspec，而是统计整个仓库后过滤
+MAX_PATHSPECS = 256
+
+
+class GitError(RuntimeError):
+    """Git命令执行失败"""
+
+
+@dataclass
+class GitObject:
+    """cat-file 读取到的对象"""
+    oid: str
+    type: str
+    data: bytes
+
+    def text(self) -> str:
+        return self.data.decode('utf-8', errors='replace')
+
+
+def parse_numstat(output: bytes) -> Dict[str, Tuple[int, int]]:
+    """
+    解析 git diff --numstat -z 的输出
+
+    Returns:
+        Dict[str, Tuple[int, int]]: 仓库相对路径 -> (新增行数, 删除行数)，二进制文件记为 (0, 0)
+    """
+    stats = {}
+    fields = output.split(b'\0')
+    i = 0
+    while i < len(fields):
+        entry = fields[i]
+        i += 1
+        if not entry:
+            continue
+        added, deleted, path = entry.split(b'\t', 2)
+        if not path:
+            # 重命名/复制：路径为随后的 旧路径\0新路径
+            path = fields[i + 1]
+            i += 2
+        stats[path.decode('utf-8', errors='surrogateescape')] = (
+            int(added) if added != b'-' else 0,
+            int(deleted) if deleted != b'-' else 0,
+        )
+    return stats
+
+
+class GitRepository:
+    """
+    Git仓库访问层
+
+    - HEAD 直接从 .git 下的引用文件（含 packed-refs）解析，不启动子进程
+    - 工作区/提交间的增删行数用一次 git diff --numstat -z 得到
+    - 对象内容和对象ID通过常驻的 git cat-file --batch / --batch-check 进程批量读取
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path: 仓库内任意目录，pathspec 相对该目录解析
+        """
+        self.cwd = Path(path)
+        self._toplevel: Optional[Path] = None
+        self._git_dir: Optional[Path] = None
+        self._common_dir: Optional[Path] = None
+        self._packed_refs: Dict[str, str] = {}
+        self._packed_refs_mtime: Optional[int] = None
+        self._numstat_cache: Dict[Tuple, Dict[str, Tuple[int, int]]] = {}
+        self._cat_files: Dict[str, subprocess.Popen] = {}  # --batch / --batch-check -> 常驻进程
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """关闭常驻的 cat-file 进程"""
+        with self._lock:
+            processes, self._cat_files = list(self._cat_files.values()), {}
+        for proc in processes:
+            try:
+                proc.stdin.close()
+                proc.wait(timeout=5)
+            except Exception:
+                proc.kill()
+
+    # ---- 基础 ----
+
+    def run(self, *args: str, input: Optional[bytes] = None) -> bytes:
+        """执行一条git命令，返回stdout"""
+        result = subprocess.run(
+            ['git', *args],
+            cwd=self.cwd,
+            input=input,
+            capture_output=True,
+        )
+        if result.returncode != 0:
+            message = result.stderr.decode('utf-8', errors='replace').strip()
+            raise GitError(f"git {args[0]} 失败: {message}")
+        return result.stdout
+
+    def _discover(self):
+        if self._toplevel is not None:
+            return
+        output = self.run('rev-parse', '--show-toplevel', '--absolute-git-dir', '--git-common-dir')
+        toplevel, git_dir, common_dir = output.decode('utf-8').splitlines()[:3]
+        self._toplevel = Path(toplevel)
+        self._git_dir = Path(git_dir)
+        common = Path(common_dir)
+        if not common.is_absolute():
+            # 旧版本git输出的相对路径有时相对仓库根目录而非当前目录
+            common = next((base / common for base in (self.cwd, self._toplevel) if (base / common).is_dir()),
+                          self._git_dir)
+        self._common_dir = common.resolve()
+
+    @property
+    def toplevel(self) -> Path:
+        """仓库根目录"""
+        self._discover()
+        return self._toplevel
+
+    def repo_path(self, path) -> str:
+        """把相对 cwd 的路径或绝对路径转换为仓库相对路径（/ 分隔）"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.cwd / path
+        return Path(os.path.relpath(os.path.abspath(path), self.toplevel)).as_posix()
+
+    # ---- 引用 ----
+
+    def head(self) -> Optional[str]:
+        """当前HEAD的提交哈希，尚无提交时返回None"""
+        self._discover()
+        if (self._common_dir / 'reftable').exists():
+            # reftable 格式不是纯文本文件，交给git解析
+            return self.rev_parse('HEAD')
+
+        head = (self._git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+        seen = set()
+        while head.startswith('ref: '):
+            ref = head[5:].strip()
+            if ref in seen:
+                raise GitError(f"符号引用循环: {ref}")
+            seen.add(ref)
+            head = self._read_ref(ref)
+            if head is None:
+                return None
+        return head
+
+    def _read_ref(self, ref: str) -> Optional[str]:
+        for base in (self._git_dir, self._common_dir):
+            ref_file = base / ref
+            if ref_file.is_file():
+                return ref_file.read_text(encoding='utf-8').strip()
+        return self._read_packed_refs().get(ref)
+
+    def _read_packed_refs(self) -> Dict[str, str]:
+        packed = self._common_dir / 'packed-refs'
+        try:
+            mtime = packed.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        if mtime != self._packed_refs_mtime:
+            refs = {}
+            with open(packed, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith(('#', '^')):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2:
+                        refs[parts[1]] = parts[0]
+            self._packed_refs, self._packed_refs_mtime = refs, mtime
+        return self._packed_refs
+
+    def rev_parse(self, rev: str) -> Optional[str]:
+        """解析任意修订为对象哈希（会启动子进程）"""
+        try:
+            return self.run('rev-parse', '--verify', '--quiet', rev).decode('utf-8').strip() or None
+        except GitError:
+            return None
+
+    # ---- 差异统计 ----
+
+    def numstat(
+        self,
+        paths: Optional[Iterable] = None,
+        rev_a: Optional[str] = None,
+        rev_b: Optional[str] = None,
+        cached: bool = False,
+        diff_filter: Optional[str] = None
+    ) -> Dict[str, Tuple[int, int]]:
+        """
+        一次 git diff --numstat -z 统计多个文件的增删行数
+
+        不做重命名检测：重命名的文件按旧路径删除、新路径新增统计。限定路径时 git 看不到
+        路径范围外的旧文件，检测结果会随传入的路径数变化，关闭后两种方式的结果一致。
+
+        Args:
+            paths: 限定的文件（相对 cwd 或绝对路径），None 表示全部
+            rev_a: 起始修订（也可以是 A..B / A...B 范围），None 表示与索引比较工作区
+            rev_b: 结束修订，None 表示工作区（cached 为真时为索引）
+            cached: 比较索引而非工作区
+            diff_filter: 传给 --diff-filter，如 "d" 排除已删除的文件
+
+        Returns:
+            Dict[str, Tuple[int, int]]: 仓库相对路径 -> (新增行数, 删除行数)
+        """
+        wanted = None if paths is None else {self.repo_path(p) for p in paths}
+        if wanted is not None and not wanted:
+            return {}
+
+        revs = [rev for rev in (rev_a, rev_b) if rev]
+        cacheable = rev_a and rev_b and FULL_HASH_RE.match(rev_a) and FULL_HASH_RE.match(rev_b)
+        cache_key = (rev_a, rev_b, diff_filter)
+        if cacheable and cache_key in self._numstat_cache:
+            stats = self._numstat_cache[cache_key]
+        else:
+            args = ['diff', '--numstat', '-z', '--no-renames']
+            if cached:
+                args.append('--cached')
+            if diff_filter:
+                args.append(f'--diff-filter={diff_filter}')
+            args.extend(revs)
+            args.append('--')
+            if wanted is not None and not cacheable and len(wanted) <= MAX_PATHSPECS:
+                args.extend(f":(top,literal){path}" for path in sorted(wanted))
+            stats = parse_numstat(self.run(*args))
+            if cacheable:
+                self._numstat_cache[cache_key] = stats
+
+        if wanted is None:
+            return dict(stats)
+        return {path: counts for path, counts in stats.items() if path in wanted}
+
+    def changed_files(self, rev_a: Optional[str] = None, rev_b: Optional[str] = None) -> List[str]:
+        """有改动的文件（仓库相对路径）"""
+        return list(self.numstat(rev_a=rev_a, rev_b=rev_b))
+
+    # ---- 对象 ----
+
+    def _start_cat_file(self, mode: str) -> subprocess.Popen:
+        proc = self._cat_files.get(mode)
+        if proc is None or proc.poll() is not None:
+            proc = self._cat_files[mode] = subprocess.Popen(
+                ['git', 'cat-file', mode],
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        return proc
+
+    @staticmethod
+    def _write_requests(proc: subprocess.Popen, request: bytes):
+        try:
+            proc.stdin.write(request)
+            proc.stdin.flush()
+        except (BrokenPipeError, ValueError):
+            pass
+
+    def _batch(self, mode: str, specs: Iterable[str]) -> Dict[str, Optional[GitObject]]:
+        specs = list(dict.fromkeys(specs))
+        results: Dict[str, Optional[GitObject]] = {spec: None for spec in specs}
+        specs = [spec for spec in specs if spec and '\n' not in spec]
+        if not specs:
+            return results
+
+        with_content = mode == '--batch'
+        with self._lock:
+            proc = self._start_cat_file(mode)
+            request = ''.join(f"{spec}\n" for spec in specs).encode('utf-8')
+            # 请求在线程中写入，避免双方管道缓冲区写满时互相等待
+            writer = threading.Thread(target=self._write_requests, args=(proc, request), daemon=True)
+            writer.start()
+            try:
+                for spec in specs:
+                    header = proc.stdout.readline()
+                    if not header:
+                        raise GitError("git cat-file 意外退出")
+                    if header.endswith((b' missing\n', b' ambiguous\n')):
+                        continue
+                    oid, obj_type, size = header.split()
+                    data = b''
+                    if with_content:
+                        data = proc.stdout.read(int(size))
+                        proc.stdout.read(1)  # 内容后的换行
+                    results[spec] = GitObject(oid.decode('ascii'), obj_type.decode('ascii'), data)
+            except Exception:
+                # 输出流已经错位，丢弃这个进程
+                proc.kill()
+                self._cat_files.pop(mode, None)
+                raise
+            finally:
+                writer.join()
+        return results
+
+    def cat_objects(self, specs: Iterable[str]) -> Dict[str, Optional[GitObject]]:
+        """
+        一次往返读取多个对象
+
+        Args:
+            specs: 对象名，如 "<commit>:<仓库相对路径>" 或对象哈希
+
+        Returns:
+            Dict[str, Optional[GitObject]]: 不存在的对象为None
+        """
+        return self._batch('--batch', specs)
+
+    def object_ids(self, specs: Iterable[str]) -> Dict[str, Optional[str]]:
+        """一次往返解析多个对象名的对象ID（不读取内容），不存在的为None"""
+        return {spec: obj.oid if obj else None for spec, obj in self._batch('--batch-check', specs).items()}
+
+    def blob_ids(self, rev: str, paths: Iterable) -> Dict[str, Optional[str]]:
+        """同一修订下多个文件的blob ID，键为仓库相对路径"""
+        repo_paths = [self.repo_path(p) for p in paths]
+        ids = self.object_ids(f"{rev}:{path}" for path in repo_paths)
+        return {path: ids[f"{rev}:{path}"] for path in repo_paths}
+
+    def read_blobs(self, rev: str, paths: Iterable) -> Dict[str, Optional[GitObject]]:
+        """读取同一修订下多个文件的内容，键为仓库相对路径"""
+        repo_paths = [self.repo_path(p) for p in paths]
+        objects = self.cat_objects(f"{rev}:{path}" for path in repo_paths)
+        return {path: objects[f"{rev}:{path}"] for path in repo_paths}
+
+    def read_blob(self, rev: str, path) -> Optional[GitObject]:
+        """读取单个文件在指定修订下的内容"""
+        return next(iter(self.read_blobs(rev, [path]).values()))
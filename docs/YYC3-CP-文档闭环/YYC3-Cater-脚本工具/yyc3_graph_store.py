@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_graph_store.py
+@description: YYC³知识图谱二进制存储 - 字符串表 + 整数ID数组 + CSR边，内存映射加载，按需构造文档/概念记录
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set
+
+import numpy as np
+
+
+# 文件格式：MAGIC + 头部长度(uint64, 小端) + 头部JSON + 按64字节对齐的数组数据
+MAGIC = b"YYC3GRPH"
+FORMAT_VERSION = 2
+BINARY_SUFFIX = ".ygraph"
+_ALIGN = 64
+
+# 文档数值属性（float64，保证与JSON图谱的评分完全一致）
+DOC_FLOAT_FIELDS = ("quality_score", "centrality", "importance", "hub_score", "authority_score", "betweenness")
+
+
+def binary_graph_path(graph_file: Path) -> Path:
+    """JSON图谱对应的二进制图谱路径（同名，后缀为 .ygraph）"""
+    return Path(graph_file).with_suffix(BINARY_SUFFIX)
+
+
+def resolve_graph_file(graph_file: Path) -> Path:
+    """优先使用不早于JSON图谱的二进制图谱"""
+    graph_file = Path(graph_file)
+    if graph_file.suffix == BINARY_SUFFIX:
+        return graph_file
+    binary_file = binary_graph_path(graph_file)
+    if binary_file.exists() and (
+        not graph_file.exists() or binary_file.stat().st_mtime_ns >= graph_file.stat().st_mtime_ns
+    ):
+        return binary_file
+    return graph_file
+
+
+class StringTable(Sequence):
+    """UTF-8字符串表：拼接后的字节 + 偏移数组，按需解码（解码结果会缓存）"""
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray, order: Optional[np.ndarray] = None):
+        """
+        Args:
+            data: uint8 字节数组
+            offsets: int64 偏移数组，长度为字符串数 + 1
+            order: 按字节序排列的字符串ID（用于二分查找，重复字符串中ID大的在前）
+        """
+        self._data = memoryview(data)
+        self._offsets = offsets
+        self._order = order
+        self._decoded: Dict[int, str] = {}
+
+    @staticmethod
+    def encode(strings: List[str]) -> Dict[str, np.ndarray]:
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        order = np.array(sorted(range(len(encoded)), key=lambda i: (encoded[i], -i)), dtype=np.int32)
+        return {
+            "data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            "offsets": offsets,
+            "order": order,
+        }
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        index = int(index)
+        value = self._decoded.get(index)
+        if value is None:
+            if index < 0:
+                index += len(self)
+            value = str(self._data[self._offsets[index]:self._offsets[index + 1]], 'utf-8')
+            self._decoded[index] = value
+        return value
+
+    def index(self, value: str, *args) -> int:
+        """二分查找字符串ID（按UTF-8字节序，与码点序一致），不存在时抛出 ValueError"""
+        lo, hi = 0, len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self[self._order[mid]] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._order) and self[self._order[lo]] == value:
+            return int(self._order[lo])
+        raise ValueError(value)
+
+    def get(self, value: str) -> Optional[int]:
+        try:
+            return self.index(value)
+        except ValueError:
+            return None
+
+    def __contains__(self, value) -> bool:
+        return isinstance(value, str) and self.get(value) is not None
+
+
+def _csr(lists: List[List[int]]):
+    indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+    np.cumsum([len(items) for items in lists], out=indptr[1:])
+    ids = np.fromiter((i for items in lists for i in items), dtype=np.int32, count=int(indptr[-1]))
+    return indptr, ids
+
+
+def _transpose(indptr: np.ndarray, ids: np.ndarray, num_rows: int):
+    """CSR转置（行内按原行号升序）"""
+    rows = np.repeat(np.arange(len(indptr) - 1, dtype=np.int32), np.diff(indptr))
+    order = np.argsort(ids, kind='stable')
+    t_indptr = np.zeros(num_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ids, minlength=num_rows), out=t_indptr[1:])
+    return t_indptr, rows[order]
+
+
+def graph_data_to_arrays(data: Dict) -> Dict[str, np.ndarray]:
+    """将知识图谱JSON结构转换为二进制存储所需的数组"""
+    documents = data["documents"]
+    concepts = data["concepts"]
+
+    def table(prefix: str, strings: List[str], arrays: Dict):
+        for key, value in StringTable.encode(strings).items():
+            arrays[f"{prefix}_{key}"] = value
+
+    def intern(values: List[str], vocab: Dict[str, int]) -> List[int]:
+        return [vocab.setdefault(v, len(vocab)) for v in values]
+
+    arrays: Dict[str, np.ndarray] = {}
+    doc_ids = {doc["name"]: i for i, doc in enumerate(documents)}
+
+    categories: Dict[str, int] = {}
+    keywords: Dict[str, int] = {}
+    concept_ids = {concept["name"]: i for i, concept in enumerate(concepts)}
+    references: Dict[str, int] = {}
+
+    doc_category = intern([doc["category"] for doc in documents], categories)
+    doc_keywords = [intern(doc["keywords"], keywords) for doc in documents]
+    doc_concepts = [intern(doc["concepts"], concept_ids) for doc in documents]
+    doc_references = [intern(doc.get("references", []), references) for doc in documents]
+    concept_category = intern([concept["category"] for concept in concepts], categories)
+    # 文档中出现但概念列表里没有的概念，补齐为空记录
+    missing = len(concept_ids) - len(concepts)
+    concept_category += intern([""] * missing, categories)
+
+    table("doc_name", [doc["name"] for doc in documents], arrays)
+    table("doc_title", [doc["title"] for doc in documents], arrays)
+    table("doc_description", [doc.get("description", "") for doc in documents], arrays)
+    table("category", list(categories), arrays)
+    table("keyword", list(keywords), arrays)
+    table("concept", list(concept_ids), arrays)
+    table("reference", list(references), arrays)
+
+    arrays["doc_category"] = np.array(doc_category, dtype=np.int32)
+    # 同名文档只有最后一个可按名称访问（与按名称建字典的JSON加载方式一致）
+    arrays["doc_primary"] = np.zeros(len(documents), dtype=np.uint8)
+    arrays["doc_primary"][list(doc_ids.values())] = 1
+    for name in DOC_FLOAT_FIELDS:
+        arrays[f"doc_{name}"] = np.array([doc.get(name, 0.0) for doc in documents], dtype=np.float64)
+    arrays["doc_keyword_indptr"], arrays["doc_keyword_ids"] = _csr(doc_keywords)
+    arrays["doc_concept_indptr"], arrays["doc_concept_ids"] = _csr(doc_concepts)
+    arrays["doc_reference_indptr"], arrays["doc_reference_ids"] = _csr(doc_references)
+
+    arrays["concept_category"] = np.array(concept_category, dtype=np.int32)
+    arrays["concept_frequency"] = np.array([c["frequency"] for c in concepts] + [0] * missing, dtype=np.int32)
+    arrays["concept_importance"] = np.array([c["importance"] for c in concepts] + [0.0] * missing, dtype=np.float64)
+
+    # 引用边（有向）与概念边（无向，source < target）分别按起点存为CSR
+    ref_lists: List[List[int]] = [[] for _ in documents]
+    concept_lists: List[List[int]] = [[] for _ in documents]
+    concept_weights: List[List[float]] = [[] for _ in documents]
+    for edge in data["edges"]:
+        source, target = doc_ids.get(edge["source"]), doc_ids.get(edge["target"])
+        if source is None or target is None:
+            continue
+        if edge["type"] == "reference":
+            ref_lists[source].append(target)
+        elif edge["type"] == "concept":
+            concept_lists[source].append(target)
+            concept_weights[source].append(edge["weight"])
+    arrays["ref_indptr"], arrays["ref_ids"] = _csr(ref_lists)
+    arrays["concept_edge_indptr"], arrays["concept_edge_ids"] = _csr(concept_lists)
+    arrays["concept_edge_weights"] = np.array(
+        [w for weights in concept_weights for w in weights], dtype=np.float32
+    )
+    return arrays
+
+
+def save_binary_graph(data: Dict, output_file: Path) -> Path:
+    """将知识图谱JSON结构写为二进制图谱（先写临时文件再原子替换）"""
+    output_file = Path(output_file)
+    arrays = graph_data_to_arrays(data)
+
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        offset = -(-offset // _ALIGN) * _ALIGN
+        layout[name] = [array.dtype.str, list(array.shape), offset]
+        offset += array.nbytes
+
+    header = json.dumps({
+        "format_version": FORMAT_VERSION,
+        "timestamp": data.get("timestamp"),
+        "statistics": data.get("statistics", {}),
+        "arrays": layout,
+    }, ensure_ascii=False).encode('utf-8')
+    prefix = len(MAGIC) + 8 + len(header)
+    base = -(-prefix // _ALIGN) * _ALIGN
+
+    tmp_file = output_file.with_name(output_file.name + ".tmp")
+    with open(tmp_file, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (base + layout[name][2] - f.tell()))
+            f.write(array.tobytes())
+    os.replace(tmp_file, output_file)
+    return output_file
+
+
+class DocumentTable(Mapping):
+    """文档名 -> 文档记录（与JSON图谱中的文档结构一致），访问时才构造"""
+
+    def __init__(self, graph: 'BinaryGraph'):
+        self._graph = graph
+
+    def __getitem__(self, name: str) -> Dict:
+        doc_id = self._graph.doc_names.get(name) if isinstance(name, str) else None
+        if doc_id is None:
+            raise KeyError(name)
+        return self._graph.document(doc_id)
+
+    def __contains__(self, name) -> bool:
+        return name in self._graph.doc_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph.doc_names)
+
+    def __len__(self) -> int:
+        return len(self._graph.doc_names)
+
+
+class ConceptTable(Mapping):
+    """概念名 -> 概念记录，访问时才构造"""
+
+    def __init__(self, graph: 'BinaryGraph'):
+        self._graph = graph
+
+    def __getitem__(self, name: str) -> Dict:
+        concept_id = self._graph.concept_names.get(name) if isinstance(name, str) else None
+        if concept_id is None:
+            raise KeyError(name)
+        return self._graph.concept(concept_id)
+
+    def __contains__(self, name) -> bool:
+        return name in self._graph.concept_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph.concept_names)
+
+    def __len__(self) -> int:
+        return len(self._graph.concept_names)
+
+
+class PostingIndex(Mapping):
+    """键 -> 文档名集合的倒排索引，集合在访问时才从CSR构造"""
+
+    def __init__(self, lookup: Callable[[str], List[int]], keys: Callable[[], Iterable[str]],
+                 indptr: np.ndarray, ids: np.ndarray, names: StringTable):
+        """
+        Args:
+            lookup: 键 -> CSR行号列表（不存在时返回空列表）
+            keys: 返回全部键的函数
+            indptr, ids: 行 -> 文档ID 的CSR
+            names: 文档名表
+        """
+        self._lookup = lookup
+        self._keys = keys
+        self._indptr = indptr
+        self._ids = ids
+        self._names = names
+
+    def ids(self, key: str) -> np.ndarray:
+        rows = self._lookup(key) if isinstance(key, str) else []
+        if len(rows) == 1:
+            return self._ids[self._indptr[rows[0]]:self._indptr[rows[0] + 1]]
+        return np.concatenate([self._ids[self._indptr[r]:self._indptr[r + 1]] for r in rows] or
+                              [np.zeros(0, dtype=np.int32)])
+
+    def __getitem__(self, key: str) -> Set[str]:
+        rows = self._lookup(key) if isinstance(key, str) else []
+        if not rows:
+            raise KeyError(key)
+        return {self._names[i] for i in self.ids(key)}
+
+    def __contains__(self, key) -> bool:
+        return isinstance(key, str) and bool(self._lookup(key))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._keys())
+
+
+class BinaryGraph:
+    """知识图谱的紧凑表示：数组可来自内存映射文件，也可由JSON结构在内存中构建"""
+
+    def __init__(self, arrays: Dict[str, np.ndarray], meta: Optional[Dict] = None, source: Optional[Path] = None):
+        self.arrays = arrays
+        self.meta = meta or {}
+        self.source = source
+
+        def table(prefix: str) -> StringTable:
+            return StringTable(arrays[f"{prefix}_data"], arrays[f"{prefix}_offsets"], arrays[f"{prefix}_order"])
+
+        self.doc_names = table("doc_name")
+        self.doc_titles = table("doc_title")
+        self.doc_descriptions = table("doc_description")
+        self.categories = table("category")
+        self.keywords = table("keyword")
+        self.concept_names = table("concept")
+        self.reference_texts = table("reference")
+
+        self.documents = DocumentTable(self)
+        self.concepts = ConceptTable(self)
+        self._concept_docs = None
+        self._referenced_by = None
+
+    @classmethod
+    def load(cls, graph_file: Path) -> 'BinaryGraph':
+        """以内存映射方式加载二进制图谱"""
+        graph_file = Path(graph_file)
+        with open(graph_file, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"不是YYC³二进制图谱文件: {graph_file}")
+            header_len, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"不支持的二进制图谱版本: {header.get('format_version')}")
+
+        base = -(-(len(MAGIC) + 8 + header_len) // _ALIGN) * _ALIGN
+        with open(graph_file, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        arrays = {}
+        for name, (dtype, shape, offset) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape)) if shape else 1
+            arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count, offset=base + offset).reshape(shape)
+        meta = {key: header.get(key) for key in ("timestamp", "statistics")}
+        return cls(arrays, meta, graph_file)
+
+    @classmethod
+    def from_graph_data(cls, data: Dict) -> 'BinaryGraph':
+        """由JSON图谱结构构建"""
+        meta = {key: data.get(key) for key in ("timestamp", "statistics")}
+        return cls(graph_data_to_arrays(data), meta)
+
+    @property
+    def num_documents(self) -> int:
+        return len(self.doc_names)
+
+    def _row(self, prefix: str, row: int) -> np.ndarray:
+        indptr = self.arrays[f"{prefix}_indptr"]
+        return self.arrays[f"{prefix}_ids"][indptr[row]:indptr[row + 1]]
+
+    def doc_keyword_ids(self, doc_id: int) -> np.ndarray:
+        return self._row("doc_keyword", doc_id)
+
+    def doc_concept_ids(self, doc_id: int) -> np.ndarray:
+        return self._row("doc_concept", doc_id)
+
+    def reference_ids(self, doc_id: int) -> np.ndarray:
+        """文档引用的文档ID"""
+        return self._row("ref", doc_id)
+
+    def _referenced_by_csr(self):
+        if self._referenced_by is None:
+            self._referenced_by = _transpose(self.arrays["ref_indptr"], self.arrays["ref_ids"], self.num_documents)
+        return self._referenced_by
+
+    def _concept_docs_csr(self):
+        if self._concept_docs is None:
+            self._concept_docs = _transpose(
+                self.arrays["doc_concept_indptr"], self.arrays["doc_concept_ids"], len(self.concept_names)
+            )
+        return self._concept_docs
+
+    def referenced_by_ids(self, doc_id: int) -> np.ndarray:
+        """引用该文档的文档ID"""
+        indptr, ids = self._referenced_by_csr()
+        return ids[indptr[doc_id]:indptr[doc_id + 1]]
+
+    def concept_doc_ids(self, concept_id: int) -> np.ndarray:
+        """包含该概念的文档ID（升序）"""
+        indptr, ids = self._concept_docs_csr()
+        return ids[indptr[concept_id]:indptr[concept_id + 1]]
+
+    def document(self, doc_id: int) -> Dict:
+        """构造单个文档记录"""
+        arrays = self.arrays
+        record = {
+            "name": self.doc_names[doc_id],
+            "title": self.doc_titles[doc_id],
+            "description": self.doc_descriptions[doc_id],
+            "category": self.categories[int(arrays["doc_category"][doc_id])],
+            "keywords": [self.keywords[i] for i in self.doc_keyword_ids(doc_id)],
+            "concepts": [self.concept_names[i] for i in self.doc_concept_ids(doc_id)],
+        }
+        for name in DOC_FLOAT_FIELDS:
+            record[name] = float(arrays[f"doc_{name}"][doc_id])
+        record["references"] = [self.reference_texts[i] for i in self._row("doc_reference", doc_id)]
+        record["referenced_by"] = list(dict.fromkeys(self.doc_names[i] for i in self.referenced_by_ids(doc_id)))
+        return record
+
+    def concept(self, concept_id: int) -> Dict:
+        """构造单个概念记录"""
+        arrays = self.arrays
+        return {
+            "name": self.concept_names[concept_id],
+            "category": self.categories[int(arrays["concept_category"][concept_id])],
+            "frequency": int(arrays["concept_frequency"][concept_id]),
+            "documents": [self.doc_names[i] for i in self.concept_doc_ids(concept_id)],
+            "importance": float(arrays["concept_importance"][concept_id]),
+        }
+
+    def iter_edges(self) -> Iterator[Dict]:
+        """按JSON图谱的结构逐条产出边"""
+        ref_indptr, ref_ids = self.arrays["ref_indptr"], self.arrays["ref_ids"]
+        for source in range(self.num_documents):
+            for target in ref_ids[ref_indptr[source]:ref_indptr[source + 1]]:
+                yield {"source": self.doc_names[source], "target": self.doc_names[target],
+                       "type": "reference", "weight": 1.0}
+
+        indptr = self.arrays["concept_edge_indptr"]
+        ids, weights = self.arrays["concept_edge_ids"], self.arrays["concept_edge_weights"]
+        for source in range(self.num_documents):
+            source_concepts = set(self.doc_concept_ids(source).tolist())
+            for k in range(indptr[source], indptr[source + 1]):
+                target = int(ids[k])
+                shared = source_concepts & set(self.doc_concept_ids(target).tolist())
+                yield {"source": self.doc_names[source], "target": self.doc_names[target],
+                       "type": "concept", "weight": float(weights[k]),
+                       "concepts": sorted(self.concept_names[i] for i in shared)}
+
+    def keyword_index(self) -> PostingIndex:
+        """小写关键词 -> 文档名集合"""
+        indptr, ids = _transpose(self.arrays["doc_keyword_indptr"], self.arrays["doc_keyword_ids"], len(self.keywords))
+        folded: Dict[str, List[int]] = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            folded.setdefault(keyword.lower(), []).append(keyword_id)
+        return PostingIndex(lambda key: folded.get(key, []), folded.keys, indptr, ids, self.doc_names)
+
+    def concept_index(self) -> PostingIndex:
+        """概念 -> 文档名集合"""
+        indptr, ids = self._concept_docs_csr()
+        return PostingIndex(self._rows(self.concept_names, indptr), lambda: iter(self.concept_names),
+                            indptr, ids, self.doc_names)
+
+    def category_index(self) -> PostingIndex:
+        """分类 -> 文档名集合"""
+        doc_category = self.arrays["doc_category"]
+        indptr, ids = _transpose(np.arange(len(doc_category) + 1, dtype=np.int64), doc_category, len(self.categories))
+        return PostingIndex(self._rows(self.categories, indptr), lambda: iter(self.categories),
+                            indptr, ids, self.doc_names)
+
+    def reference_index(self) -> PostingIndex:
+        """文档名 -> 其引用的文档名集合"""
+        indptr = self.arrays["ref_indptr"]
+        return PostingIndex(self._rows(self.doc_names, indptr), lambda: iter(self.doc_names),
+                            indptr, self.arrays["ref_ids"], self.doc_names)
+
+    def referenced_by_index(self) -> PostingIndex:
+        """文档名 -> 引用它的文档名集合"""
+        indptr, ids = self._referenced_by_csr()
+        return PostingIndex(self._rows(self.doc_names, indptr), lambda: iter(self.doc_names),
+                            indptr, ids, self.doc_names)
+
+    @staticmethod
+    def _rows(table: StringTable, indptr: np.ndarray) -> Callable[[str], List[int]]:
+        """键 -> 非空的CSR行（与defaultdict索引一致：没有条目的键视为不存在）"""
+        def lookup(key: str) -> List[int]:
+            row = table.get(key)
+            return [row] if row is not None and indptr[row + 1] > indptr[row] else []
+        return lookup
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.arrays["ref_ids"]) + len(self.arrays["concept_edge_ids"])
+
+
+def load_graph(graph_file: Path) -> BinaryGraph:
+    """加载知识图谱：存在（且不旧于JSON的）二进制图谱时优先内存映射加载，否则解析JSON"""
+    json_file = Path(graph_file)
+    graph_file = resolve_graph_file(json_file)
+    if graph_file.suffix == BINARY_SUFFIX:
+        try:
+            return BinaryGraph.load(graph_file)
+        except ValueError:
+            # 旧版本的二进制图谱，退回JSON
+            if json_file.suffix == BINARY_SUFFIX or not json_file.exists():
+                raise
+            graph_file = json_file
+    with open(graph_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    graph = BinaryGraph.from_graph_data(data)
+    graph.source = graph_file
+    return graph
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_link_graph.py
+@description: YYC³文档链接图 - 一次扫描整个目录树建立文档间链接图，按相对路径解析链接、索引各文档的标题锚点，增量校验失效链接、孤立文档和不可达文档
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote
+
+from yyc3_doc_corpus import DEFAULT_CACHE_DIR, DocumentCorpus, Heading
+
+
+# 图结构或锚点规则变化时递增，使旧缓存自动失效
+LINK_GRAPH_VERSION = 2
+
+# 带协议的外部链接（http:、mailto: 等）
+EXTERNAL_RE = re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:')
+
+MISSING_DOCUMENT = "missing_document"
+MISSING_ANCHOR = "missing_anchor"
+# 只有按根目录解析才存在的链接：渲染时按所在目录解析，实际是失效的
+ROOT_RELATIVE_LINK = "root_relative_link"
+
+
+def github_slug(text: str) -> str:
+    """GitHub 风格的标题锚点：小写，去掉标点和符号，空格换成 -"""
+    return re.sub(r'[^\w\- ]', '', text.strip().lower()).replace(' ', '-')
+
+
+def loose_anchor(text: str) -> str:
+    """宽松的锚点键：只保留文字和数字，兼容保留emoji、句点等不同编辑器的锚点写法"""
+    return re.sub(r'[\W_]', '', text.lower())
+
+
+def heading_anchors(headings: Iterable[Heading]) -> Set[str]:
+    """文档的全部锚点键（重名标题依次追加 -1、-2 后缀）"""
+    anchors = set()
+    seen: Dict[str, int] = {}
+    for heading in headings:
+        slug = github_slug(heading.text)
+        loose = loose_anchor(heading.text)
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        if count:
+            anchors.update((f"{slug}-{count}", f"{loose}{count}"))
+        else:
+            anchors.update((slug, loose))
+    return anchors
+
+
+def anchor_exists(anchor: str, anchors: Set[str]) -> bool:
+    """锚点是否指向文档中的某个标题"""
+    return anchor in anchors or anchor.lower() in anchors or loose_anchor(anchor) in anchors
+
+
+def split_target(target: str) -> Tuple[str, str]:
+    """把链接目标拆分为 (路径, 锚点)，去掉尖括号和链接标题，并做URL解码"""
+    target = target.strip()
+    if target.startswith('<') and '>' in target:
+        target = target[1:target.index('>')]
+    else:
+        target = target.split()[0] if target else target
+    path, _, anchor = target.partition('#')
+    return unquote(path), unquote(anchor)
+
+
+@dataclass
+class LinkEdge:
+    """文档中的一个链接"""
+    text: str
+    target: str  # 原始链接目标
+    line: int
+    path: str  # 按所在文档的相对路径解析后，相对根目录的路径（posix）
+    anchor: str = ""
+    root_path: str = ""  # 按根目录解析的候选路径（与 path 相同时为空）
+
+    def candidates(self) -> Tuple[str, ...]:
+        """链接可能指向的路径（按优先级）"""
+        return (self.path, self.root_path) if self.root_path else (self.path,)
+
+
+@dataclass
+class LinkProblem:
+    """失效的链接"""
+    source: str
+    kind: str  # missing_document / missing_anchor / root_relative_link
+    text: str
+    target: str
+    line: int
+
+
+@dataclass
+class DocumentNode:
+    """链接图中的文档"""
+    path: str  # 相对根目录的路径（posix）
+    mtime_ns: int
+    size: int
+    anchors: Set[str] = field(default_factory=set)
+    links: List[LinkEdge] = field(default_factory=list)
+
+
+class LinkGraph:
+    """
+    整个目录树的文档链接图
+
+    refresh 只重新解析有变化的文件，并且只重新校验受影响的文档：
+    自身有变化的文档，以及链接指向有变化、新增或删除文档的文档。
+    孤立文档和不可达文档都由同一张图计算。
+    """
+
+    def __init__(self, root: Path, corpus: Optional[DocumentCorpus] = None):
+        self.root = Path(root)
+        self.corpus = corpus or DocumentCorpus()
+        self.nodes: Dict[str, DocumentNode] = {}
+        self.problems: Dict[str, List[LinkProblem]] = {}
+        self._linkers: Dict[str, Set[str]] = {}  # 链接目标路径 -> 链接到它的文档（目标可以不存在）
+        self.stats = {'parsed': 0, 'validated': 0, 'removed': 0}
+        self.modified = False  # 自上次保存以来是否有变化
+
+    # ---- 构建 ----
+
+    def relative(self, file_path: Path) -> str:
+        """文件相对根目录的posix路径"""
+        try:
+            return Path(file_path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(os.path.relpath(file_path, self.root)).as_posix()
+
+    def resolve(self, source: str, target: str) -> Optional[Tuple[str, str, str]]:
+        """
+        解析文档 source 中的链接目标
+
+        相对路径按所在文档的目录解析；自动生成的关联文档链接写的是相对根目录的路径，
+        因此同时保留按根目录解析的候选路径（用于孤立/可达性计算，校验时单独报告）。
+
+        Returns:
+            (相对根目录的路径, 按根目录解析的候选路径, 锚点)；外部链接和非Markdown链接返回None
+        """
+        if not target or EXTERNAL_RE.match(target) or target.startswith('//'):
+            return None
+        path, anchor = split_target(target)
+        if not path:
+            return source, "", anchor
+        if not path.lower().endswith('.md'):
+            return None
+        if path.startswith('/'):
+            return posixpath.normpath(path.lstrip('/')), "", anchor
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+        root_path = posixpath.normpath(path)
+        return resolved, "" if root_path == resolved or root_path.startswith('../') else root_path, anchor
+
+    def target_of(self, edge: LinkEdge) -> Optional[str]:
+        """链接实际指向的图中文档"""
+        for path in edge.candidates():
+            if path in self.nodes:
+                return path
+        return None
+
+    def _parse(self, rel_path: str, file_path: Path, stat: os.stat_result) -> DocumentNode:
+        parsed = self.corpus.get(file_path, keep=False)
+        node = DocumentNode(path=rel_path, mtime_ns=stat.st_mtime_ns, size=stat.st_size,
+                            anchors=heading_anchors(parsed.headings))
+        for link in parsed.links:
+            resolved = self.resolve(rel_path, link.target)
+            if resolved:
+                path, root_path, anchor = resolved
+                node.links.append(LinkEdge(link.text, link.target, link.line, path, anchor, root_path))
+        self.stats['parsed'] += 1
+        return node
+
+    def _unlink(self, node: DocumentNode):
+        for edge in node.links:
+            for path in edge.candidates():
+                sources = self._linkers.get(path)
+                if sources:
+                    sources.discard(node.path)
+                    if not sources:
+                        del self._linkers[path]
+
+    def _link(self, node: DocumentNode):
+        for edge in node.links:
+            for path in edge.candidates():
+                self._linkers.setdefault(path, set()).add(node.path)
+
+    def refresh(self, files: Iterable[Path]) -> Set[str]:
+        """
+        用当前的文件列表更新链接图
+
+        Args:
+            files: 目录树中的全部Markdown文件
+
+        Returns:
+            Set[str]: 重新校验过的文档
+        """
+        current = {self.relative(f): Path(f) for f in files}
+        changed: Set[str] = set()
+
+        for rel_path in [path for path in self.nodes if path not in current]:
+            self._unlink(self.nodes.pop(rel_path))
+            self.problems.pop(rel_path, None)
+            changed.add(rel_path)
+            self.stats['removed'] += 1
+
+        for rel_path, file_path in current.items():
+            stat = file_path.stat()
+            node = self.nodes.get(rel_path)
+            if node and node.mtime_ns == stat.st_mtime_ns and node.size == stat.st_size:
+                continue
+            if node:
+                self._unlink(node)
+            node = self.nodes[rel_path] = self._parse(rel_path, file_path, stat)
+            self._link(node)
+            changed.add(rel_path)
+        self.corpus.commit()
+
+        # 自身变化的文档，以及链接指向变化文档的文档需要重新校验
+        affected = {path for path in changed if path in self.nodes}
+        for rel_path in changed:
+            affected.update(self._linkers.get(rel_path, ()))
+        for rel_path in affected:
+            self.problems[rel_path] = self._validate(self.nodes[rel_path])
+        self.stats['validated'] += len(affected)
+        self.modified = self.modified or bool(changed)
+        return affected
+
+    def _validate(self, node: DocumentNode) -> List[LinkProblem]:
+        problems = []
+        for edge in node.links:
+            target_path = self.target_of(edge)
+            if target_path is None:
+                # 不在图中但存在的文件（如根目录之外、被排除目录中的文档）只检查存在性
+                if (self.root / edge.path).is_file():
+                    continue
+                kind = MISSING_DOCUMENT
+                if edge.root_path and (self.root / edge.root_path).is_file():
+                    kind = ROOT_RELATIVE_LINK
+                problems.append(LinkProblem(node.path, kind, edge.text, edge.target, edge.line))
+                continue
+            if target_path != edge.path:
+                problems.append(LinkProblem(node.path, ROOT_RELATIVE_LINK, edge.text, edge.target, edge.line))
+            if edge.anchor and not anchor_exists(edge.anchor, self.nodes[target_path].anchors):
+                problems.append(LinkProblem(node.path, MISSING_ANCHOR, edge.text, edge.target, edge.line))
+        return problems
+
+    # ---- 查询 ----
+
+    def broken_links(self, source: Optional[str] = None) -> List[LinkProblem]:
+        """失效的链接（指定 source 时只返回该文档中的）"""
+        if source is not None:
+            return list(self.problems.get(source, ()))
+        return [problem for path in sorted(self.problems) for problem in self.problems[path]]
+
+    def incoming(self) -> Dict[str, Set[str]]:
+        """文档 -> 链接到它的其他文档"""
+        result: Dict[str, Set[str]] = {path: set() for path in self.nodes}
+        for node in self.nodes.values():
+            for edge in node.links:
+                target = self.target_of(edge)
+                if target is not None and target != node.path:
+                    result[target].add(node.path)
+        return result
+
+    def orphans(self) -> Set[str]:
+        """没有被其他文档链接的文档"""
+        return {path for path, sources in self.incoming().items() if not sources}
+
+    def reachable(self, entries: Iterable[str]) -> Set[str]:
+        """从入口文档沿链接能到达的文档"""
+        seen = {entry for entry in entries if entry in self.nodes}
+        queue = deque(seen)
+        while queue:
+            node = self.nodes[queue.popleft()]
+            for edge in node.links:
+                target = self.target_of(edge)
+                if target is not None and target not in seen:
+                    seen.add(target)
+                    queue.append(target)
+        return seen
+
+    def unreachable(self, entries: Iterable[str]) -> Set[str]:
+        """从入口文档沿链接无法到达的文档"""
+        return set(self.nodes) - self.reachable(entries)
+
+    # ---- 持久化 ----
+
+    @staticmethod
+    def default_cache_file(root: Path) -> Path:
+        """按根目录区分的默认缓存文件"""
+        digest = hashlib.sha1(str(Path(root).resolve()).encode('utf-8')).hexdigest()[:12]
+        return DEFAULT_CACHE_DIR / f"link-graph-{digest}.json"
+
+    def save(self, cache_file: Path):
+        """保存链接图和校验结果，下次运行只处理有变化的文件"""
+        cache_file = Path(cache_file)
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': LINK_GRAPH_VERSION,
+            'root': str(self.root.resolve()),
+            # 链接和问题按字段顺序存为列表，缓存文件更小，读写更快
+            'nodes': [
+                [node.path, node.mtime_ns, node.size, sorted(node.anchors),
+                 [list(vars(edge).values()) for edge in node.links]]
+                for node in self.nodes.values()
+            ],
+            'problems': {path: [list(vars(p).values()) for p in problems] for path, problems in self.problems.items() if problems},
+        }
+        temp_file = cache_file.with_suffix(cache_file.suffix + '.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(data, ensure_ascii=False))  # json.dump 逐块写入走的是纯Python编码器
+        os.replace(temp_file, cache_file)
+        self.modified = False
+
+    @classmethod
+    def load(cls, root: Path, cache_file: Path, corpus: Optional[DocumentCorpus] = None) -> 'LinkGraph':
+        """读取保存的链接图；缓存不存在、损坏、版本或根目录不符时返回空图"""
+        graph = cls(root, corpus)
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return graph
+        if data.get('version') != LINK_GRAPH_VERSION or data.get('root') != str(Path(root).resolve()):
+            return graph
+
+        try:
+            for path, mtime_ns, size, anchors, links in data['nodes']:
+                node = DocumentNode(path=path, mtime_ns=mtime_ns, size=size, anchors=set(anchors),
+                                    links=[LinkEdge(*edge) for edge in links])
+                graph.nodes[node.path] = node
+                graph.problems[node.path] = []
+            for path, problems in data.get('problems', {}).items():
+                if path in graph.nodes:
+                    graph.problems[path] = [LinkProblem(*p) for p in problems]
+        except (KeyError, TypeError, ValueError):
+            return cls(root, corpus)
+
+        for node in graph.nodes.values():
+            graph._link(node)
+        return graph
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_profiling.py
+@description: YYC³脚本性能剖析 - 按阶段和文档记录耗时、CPU时间、内存峰值和处理条目数，输出Chrome trace与最慢文档汇总
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+@dataclass
+class StageRecord:
+    """一次阶段（或单个文档）的测量结果"""
+    name: str
+    category: str  # stage 或 document
+    start: float = 0.0  # 相对剖析开始的秒数
+    wall: float = 0.0
+    cpu: float = 0.0
+    memory_peak: Optional[int] = None  # 阶段内相对进入时新增的tracemalloc峰值（字节），未测量时为None
+    items: Optional[int] = None
+    args: Dict = field(default_factory=dict)
+    depth: int = 0
+    thread: int = 0  # 线程序号：主线程为0，其他线程按首次记录的顺序编号
+
+
+class _NullRecord:
+    """未启用剖析时返回的记录，赋值会被忽略"""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+class Profiler:
+    """阶段剖析器：未启用时各接口几乎没有开销"""
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = True
+        self.records: List[StageRecord] = []
+        self._origin = 0.0
+        self._local = threading.local()
+        self._thread_lock = threading.Lock()
+        self._thread_names: Dict[int, str] = {}
+
+    def enable(self, trace_memory: bool = True):
+        """开始剖析"""
+        self.enabled = True
+        self.trace_memory = trace_memory
+        self.records = []
+        self._thread_names = {0: threading.main_thread().name}
+        self._origin = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        """停止剖析（保留已记录的结果）"""
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def _stack(self) -> List[List[int]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _thread_index(self) -> int:
+        # 线程序号只在本次剖析内有效（重新 enable 后重新编号）
+        index = getattr(self._local, 'index', None)
+        if index is None or index[0] is not self._thread_names:
+            thread = threading.current_thread()
+            with self._thread_lock:
+                if thread is threading.main_thread():
+                    index = 0
+                else:
+                    index = max(self._thread_names) + 1
+                self._thread_names[index] = thread.name
+            self._local.index = (self._thread_names, index)
+            return index
+        return index[1]
+
+    @contextmanager
+    def stage(self, name: str, items: Optional[int] = None, category: str = "stage",
+              **args) -> Iterator[StageRecord]:
+        """
+        测量一个阶段
+
+        Args:
+            name: 阶段名称
+            items: 处理的条目数，也可以在阶段内设置 record.items
+            category: 记录类别（stage 或 document）
+            args: 附加信息，写入trace事件的args
+        """
+        if not self.enabled:
+            yield _NULL_RECORD
+            return
+
+        stack = self._stack()
+        thread = self._thread_index()
+        # tracemalloc的峰值是进程级的，只在主线程中重置和读取，
+        # 工作线程中的记录不测内存（其分配计入主线程中外层阶段的峰值）
+        tracing = self.trace_memory and thread == 0 and tracemalloc.is_tracing()
+        if tracing:
+            # 先把当前峰值计入外层阶段，再为本阶段重置峰值
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        else:
+            current = 0
+        frame = [current, current]  # [进入时的内存, 阶段内峰值]
+        stack.append(frame)
+
+        record = StageRecord(name=name, category=category, items=items, args=args, depth=len(stack) - 1,
+                             thread=thread)
+        start_cpu = time.thread_time()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall = time.perf_counter() - start
+            record.cpu = time.thread_time() - start_cpu
+            record.start = start - self._origin
+            stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                record.memory_peak = max(0, peak - frame[0])
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], peak)
+            self.records.append(record)
+
+    def document(self, path, **args):
+        """测量单个文档的处理"""
+        return self.stage(str(path), category="document", **args)
+
+    def profiled(self, name: Optional[str] = None) -> Callable:
+        """装饰器：把函数调用作为一个阶段测量"""
+        def decorator(func):
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ---- 输出 ----
+
+    def chrome_trace(self) -> Dict:
+        """Chrome trace-event 格式（chrome://tracing 或 Perfetto 可直接打开）"""
+        pid = os.getpid()
+        # 每个线程一条轨道，同一轨道上的X事件才能正确嵌套
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": index, "args": {"name": name}}
+            for index, name in sorted(self._thread_names.items())
+        ]
+        for record in sorted(self.records, key=lambda r: (r.start, -r.wall)):
+            event_args = dict(record.args)
+            event_args["cpu_ms"] = round(record.cpu * 1000, 3)
+            if record.memory_peak is not None:
+                event_args["memory_peak_kb"] = round(record.memory_peak / 1024, 1)
+            if record.items is not None:
+                event_args["items"] = record.items
+            events.append({
+                "name": record.name,
+                "cat": record.category,
+                "ph": "X",
+                "ts": round(record.start * 1e6, 1),
+                "dur": round(record.wall * 1e6, 1),
+                "pid": pid,
+                "tid": record.thread,
+                "args": event_args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, output_file: Path):
+        """写出Chrome trace文件"""
+        output_file = Path(output_file)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+    def summary(self, top_n: int = 10) -> str:
+        """按阶段汇总，并列出最慢的 top_n 个文档"""
+        stages: Dict[str, Dict] = {}
+        documents = []
+        for record in self.records:
+            if record.category == "document":
+                documents.append(record)
+                continue
+            entry = stages.setdefault(record.name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "memory_peak": None,
+                                                   "items": None, "start": record.start, "depth": record.depth})
+            entry["calls"] += 1
+            entry["wall"] += record.wall
+            entry["cpu"] += record.cpu
+            if record.memory_peak is not None:
+                entry["memory_peak"] = max(entry["memory_peak"] or 0, record.memory_peak)
+            entry["start"] = min(entry["start"], record.start)
+            if record.items is not None:
+                entry["items"] = (entry["items"] or 0) + record.items
+
+        lines = [f"{'阶段':<40} {'次数':>6} {'耗时(s)':>10} {'CPU(s)':>10} {'峰值内存(MB)':>12} {'条目':>8}"]
+        for name, entry in sorted(stages.items(), key=lambda item: item[1]["start"]):
+            label = "  " * entry["depth"] + name
+            items = "" if entry["items"] is None else str(entry["items"])
+            memory = "-" if entry["memory_peak"] is None else f"{entry['memory_peak'] / (1024 * 1024):.2f}"
+            lines.append(f"{label:<40} {entry['calls']:>6} {entry['wall']:>10.3f} {entry['cpu']:>10.3f} "
+                         f"{memory:>12} {items:>8}")
+
+        if documents:
+            total = sum(record.wall for record in documents)
+            lines.append("")
+            lines.append(f"文档: {len(documents)} 个, 合计 {total:.3f}s, 平均 {total / len(documents) * 1000:.2f}ms")
+            threaded = sum(1 for record in documents if record.thread != 0)
+            if threaded and self.trace_memory:
+                lines.append(f"其中 {threaded} 个文档在工作线程中处理，不单独测量内存峰值（显示为 -）")
+            lines.append(f"最慢的 {min(top_n, len(documents))} 个文档:")
+            for record in sorted(documents, key=lambda r: r.wall, reverse=True)[:top_n]:
+                memory = "-" if record.memory_peak is None else f"{record.memory_peak / 1024:.1f}KB"
+                lines.append(f"  {record.wall * 1000:>9.2f}ms  {memory:>11}  {record.name}")
+        return "\n".join(lines)
+
+
+# 各脚本共用的剖析器
+profiler = Profiler()
+stage = profiler.stage
+document = profiler.document
+profiled = profiler.profiled
+
+
+def add_profile_arguments(parser):
+    """为命令行添加剖析参数"""
+    parser.add_argument('--profile-out', type=str,
+                        help='输出Chrome trace格式的剖析结果（如 trace.json），并打印最慢文档汇总')
+    parser.add_argument('--profile-top', type=int, default=10,
+                        help='剖析汇总中列出的最慢文档数')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='剖析时不跟踪内存峰值（tracemalloc开销较大）')
+
+
+@contextmanager
+def profiling(profile_out: Optional[str], top_n: int = 10, trace_memory: bool = True):
+    """profile_out 不为空时在上下文中启用剖析，结束后写出trace并打印汇总"""
+    if not profile_out:
+        yield profiler
+        return
+
+    profiler.enable(trace_memory=trace_memory)
+    try:
+        with profiler.stage("total"):
+            yield profiler
+    finally:
+        profiler.disable()
+        profiler.write_chrome_trace(Path(profile_out))
+        print()
+        print("=" * 80)
+        print("性能剖析")
+        print("=" * 80)
+        print(profiler.summary(top_n))
+        print(f"\n✓ 剖析结果已保存: {profile_out}")
+
+
+def profiling_from_args(args):
+    """根据 add_profile_arguments 添加的参数启用剖析"""
+    return profiling(args.profile_out, top_n=args.profile_top, trace_memory=not args.profile_no_memory)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_synthetic_corpus.py
+@description: YYC³合成文档语料生成器 - 按固定种子生成与YYC3-Cater文档闭环结构一致的中文文档库，供基准测试使用
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import json
+import random
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+# 生成器版本，生成逻辑变化时递增，使已生成的语料失效
+GENERATOR_VERSION = 1
+
+MANIFEST_NAME = ".yyc3-synthetic-corpus.json"
+
+# 与审核脚本一致的分类目录
+CATEGORIES = [
+    'YYC3-Cater-架构设计',
+    'YYC3-Cater-开发实施',
+    'YYC3-Cater-部署发布',
+    'YYC3-Cater-运维运营',
+    'YYC3-Cater-测试验证',
+    'YYC3-Cater-需求规划',
+    'YYC3-Cater-用户指南',
+    'YYC3-Cater-归类迭代',
+    'YYC3-Cater-模版规范'
+]
+
+DOC_TYPES = ['架构类', '技巧类']
+
+SUBJECTS = [
+    '订单', '支付', '菜单', '会员', '库存', '配送', '门店', '营销', '财务', '报表',
+    '厨房', '供应链', '数据', 'API', '微服务', '监控', '部署', '安全', '性能', '缓存',
+    '消息队列', '网关', '权限', '日志', '告警', '容器', '智能推荐', '用户'
+]
+
+TITLE_SUFFIXES = {
+    '架构类': ['架构设计文档', '详细设计文档', '技术方案', '接口设计文档', '实施计划', '设计规范', '需求规格说明书'],
+    '技巧类': ['开发技巧', '最佳实践', '配置技巧', '问题排查指南', '操作手册', '优化技巧', '部署指南'],
+}
+
+SECTION_TITLES = [
+    '概述', '核心概念', '架构设计', '实施步骤', '接口规范', '数据模型', '部署方案',
+    '测试验证', '监控告警', '性能优化', '安全设计', '注意事项', '最佳实践', '常见问题', '案例分析'
+]
+
+TECHNOLOGIES = [
+    'React', 'TypeScript', 'Next.js', 'Node.js', 'PostgreSQL', 'Redis', 'Docker', 'Kubernetes',
+    'Nginx', 'Prometheus', 'Grafana', 'Kafka', 'RabbitMQ', 'Elasticsearch', 'GitHub Actions'
+]
+
+QUALITIES = ['高可用', '高性能', '高安全', '高扩展', '高可维护', '可观测性', '一致性', '稳定性']
+
+# 与知识图谱概念模式相对应的术语
+CONCEPT_TERMS = [
+    '架构模式', '设计模式', '开发流程', '测试流程', '部署流程', '运维流程', 'API设计', '接口设计',
+    '数据架构', '业务架构', '技术架构', '性能保障', '安全保障', '质量保障', '微服务部署', '容器部署',
+    'CI/CD流水线', 'DevOps流水线', '监控系统', '告警系统', '日志系统', '需求管理', '用户管理',
+    '产品管理', '文档管理', '知识管理'
+]
+
+SENTENCE_TEMPLATES = [
+    '{subject}模块通过{tech}实现{concept}，确保系统的{quality}。',
+    '在{subject}场景中，团队采用{concept}来降低复杂度，并以{tech}作为核心组件。',
+    '为了满足{quality}要求，{subject}服务需要结合{concept}与{tech}统一治理。',
+    '{concept}是{subject}业务的关键环节，建议在迭代初期完成{tech}的选型与验证。',
+    '本节说明{subject}相关的{concept}约定，所有实现必须遵循YYC³「五高五标五化」理念。',
+    '上线前需要对{subject}进行{quality}评估，并通过{tech}输出可追踪的指标。',
+]
+
+CODE_SNIPPETS = {
+    'typescript': [
+        'export interface {name}Request {{',
+        '  id: string;',
+        '  storeId: string;',
+        '  createdAt: Date;',
+        '}}',
+        '',
+        'export async function handle{name}(req: {name}Request): Promise<void> {{',
+        '  await repository.save(req);',
+        '  logger.info("{name} handled", {{ id: req.id }});',
+        '}}',
+    ],
+    'python': [
+        'def process_{lower}(payload: dict) -> dict:',
+        '    """处理{name}请求"""',
+        '    result = service.execute(payload)',
+        '    metrics.increment("{lower}.processed")',
+        '    return result',
+    ],
+    'yaml': [
+        '{lower}:',
+        '  replicas: 3',
+        '  resources:',
+        '    limits:',
+        '      cpu: "500m"',
+        '      memory: "512Mi"',
+    ],
+    'bash': [
+        'docker build -t yyc3/{lower}:latest .',
+        'kubectl apply -f deploy/{lower}.yaml',
+        'kubectl rollout status deployment/{lower}',
+    ],
+}
+
+CODE_NAMES = ['Order', 'Payment', 'Menu', 'Member', 'Inventory', 'Delivery', 'Store', 'Report']
+
+
+@dataclass
+class CorpusSpec:
+    """合成语料参数"""
+    num_docs: int
+    seed: int = 20251228
+    link_density: float = 3.0  # 每个文档平均的文档间链接数
+    broken_link_ratio: float = 0.05  # 指向不存在文档的链接比例
+    sections: Tuple[int, int] = (4, 8)  # 二级章节数范围
+    code_block_ratio: float = 0.6  # 每个章节出现代码块的概率
+    table_ratio: float = 0.3  # 每个章节出现表格的概率
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['sections'] = list(self.sections)
+        data['generator_version'] = GENERATOR_VERSION
+        return data
+
+
+class SyntheticCorpusGenerator:
+    """合成语料生成器：同样的参数总是生成同样的文档库"""
+
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.paths: List[Path] = []  # 文档相对路径，按文档序号
+        self.titles: List[str] = []
+        self._plan()
+
+    def _plan(self):
+        """先确定所有文档的路径和标题，生成内容时才能引用其他文档"""
+        rng = random.Random(self.spec.seed)
+        counters: Dict[Tuple[str, str], int] = {}
+        slots = []
+        for _ in range(self.spec.num_docs):
+            category = rng.choice(CATEGORIES)
+            doc_type = DOC_TYPES[0] if rng.random() < 0.6 else DOC_TYPES[1]
+            counters[(category, doc_type)] = counters.get((category, doc_type), 0) + 1
+            slots.append((category, doc_type, counters[(category, doc_type)]))
+
+        for category, doc_type, number in slots:
+            width = max(2, len(str(counters[(category, doc_type)])))
+            topic = rng.choice(SUBJECTS) + rng.choice(TITLE_SUFFIXES[doc_type])
+            file_name = f"{number:0{width}d}-YYC3-Cater--{doc_type}-{topic}.md"
+            self.paths.append(Path(category) / doc_type / file_name)
+            self.titles.append(f"🔖 YYC³ {topic}")
+
+    def render(self, index: int) -> str:
+        """生成第 index 个文档的内容"""
+        spec = self.spec
+        rng = random.Random(spec.seed * 1_000_003 + index)
+        path = self.paths[index]
+        doc_type = path.parent.name
+        topic = self.titles[index].replace("🔖 YYC³ ", "")
+        subject = next((s for s in SUBJECTS if topic.startswith(s)), rng.choice(SUBJECTS))
+
+        def sentence() -> str:
+            return rng.choice(SENTENCE_TEMPLATES).format(
+                subject=rng.choice([subject, subject, rng.choice(SUBJECTS)]),
+                tech=rng.choice(TECHNOLOGIES),
+                concept=rng.choice(CONCEPT_TERMS),
+                quality=rng.choice(QUALITIES)
+            )
+
+        lines = [
+            "---",
+            "",
+            f"**@file**：YYC³-{topic}",
+            f"**@description**：YYC³餐饮行业智能化平台的{topic}，包含{rng.choice(CONCEPT_TERMS)}、"
+            f"{rng.choice(CONCEPT_TERMS)}等核心内容",
+            "**@author**：YYC³",
+            "**@version**：v1.0.0",
+            f"**@created**：2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "**@updated**：2025-12-28",
+            "**@status**：published",
+            f"**@tags**：{path.parts[0].replace('YYC3-Cater-', '')},{subject},YYC³,{rng.choice(CONCEPT_TERMS)}",
+            "",
+            "---",
+            f"# {self.titles[index]}",
+            "",
+            "> ***YanYuCloudCube***",
+            "> **标语**：言启象限 | 语枢未来",
+            "",
+            "---",
+            "",
+            "## 📋 文档信息",
+            "",
+            "| 属性 | 内容 |",
+            "|------|------|",
+            f"| **文档标题** | {self.titles[index]} |",
+            f"| **文档类型** | {doc_type}文档 |",
+            f"| **所属阶段** | {path.parts[0].replace('YYC3-Cater-', '')} |",
+            "| **版本号** | v1.0.0 |",
+            "",
+        ]
+
+        section_count = rng.randint(*spec.sections)
+        section_titles = rng.sample(SECTION_TITLES, min(section_count, len(SECTION_TITLES)))
+        inline_links = self._pick_links(rng)
+        per_section = max(1, -(-len(inline_links) // max(1, len(section_titles))))
+
+        for number, section in enumerate(section_titles, 1):
+            lines.append(f"## {number}. {section}")
+            lines.append("")
+            for sub in range(1, rng.randint(2, 4)):
+                lines.append(f"### {number}.{sub} {subject}{section}要点")
+                lines.append("")
+                lines.append("".join(sentence() for _ in range(rng.randint(2, 5))))
+                lines.append("")
+                for _ in range(rng.randint(2, 5)):
+                    lines.append(f"- **{rng.choice(QUALITIES)}**：{sentence()}")
+                lines.append("")
+
+            if rng.random() < spec.table_ratio:
+                lines.extend([
+                    "| 项目 | 说明 | 负责人 |",
+                    "|------|------|--------|",
+                ])
+                for _ in range(rng.randint(2, 6)):
+                    lines.append(f"| {rng.choice(CONCEPT_TERMS)} | {rng.choice(TECHNOLOGIES)} | YYC³ Team |")
+                lines.append("")
+
+            if rng.random() < spec.code_block_ratio:
+                lang = rng.choice(list(CODE_SNIPPETS))
+                name = rng.choice(CODE_NAMES)
+                lines.append(f"```{lang}")
+                lines.extend(l.format(name=name, lower=name.lower()) for l in CODE_SNIPPETS[lang])
+                lines.append("```")
+                lines.append("")
+
+            for target, text in inline_links[:per_section]:
+                lines.append(f"详细说明参见[{text}]({target})。")
+                lines.append("")
+            inline_links = inline_links[per_section:]
+
+        related = self._pick_links(rng, minimum=1)
+        if related:
+            lines.append("## 相关文档")
+            lines.append("")
+            for target, text in related:
+                lines.append(f"- [{text}]({target}) - {Path(target).parent.as_posix()}")
+            lines.append("")
+
+        lines.extend([
+            "---",
+            "",
+            '<div align="center">',
+            "",
+            "> 「***YanYuCloudCube***」",
+            "",
+            "</div>",
+            "",
+        ])
+        return "\n".join(lines)
+
+    def _pick_links(self, rng: random.Random, minimum: int = 0) -> List[Tuple[str, str]]:
+        """按链接密度随机挑选链接目标（根目录相对路径，与现有文档的写法一致）"""
+        density = self.spec.link_density / 2  # 正文与"相关文档"各占一半
+        if density <= 0:
+            return []
+        count = max(minimum, round(rng.expovariate(1 / density)))
+        links = []
+        for _ in range(count):
+            if rng.random() < self.spec.broken_link_ratio:
+                category = rng.choice(CATEGORIES)
+                doc_type = rng.choice(DOC_TYPES)
+                missing = f"99-YYC3-Cater--{doc_type}-{rng.choice(SUBJECTS)}废弃文档.md"
+                links.append(((Path(category) / doc_type / missing).as_posix(), "已废弃文档"))
+            else:
+                target = rng.randrange(len(self.paths))
+                links.append((self.paths[target].as_posix(), self.titles[target]))
+        return links
+
+    def generate(self, output_dir: Path) -> List[Path]:
+        """写出全部文档与语料清单，返回文档路径"""
+        output_dir = Path(output_dir)
+        for directory in {path.parent for path in self.paths}:
+            (output_dir / directory).mkdir(parents=True, exist_ok=True)
+
+        files = []
+        for index, path in enumerate(self.paths):
+            file_path = output_dir / path
+            file_path.write_text(self.render(index), encoding='utf-8')
+            files.append(file_path)
+
+        with open(output_dir / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+            json.dump({"spec": self.spec.to_dict(), "documents": len(files)}, f, ensure_ascii=False, indent=2)
+        return files
+
+
+def ensure_corpus(spec: CorpusSpec, output_dir: Path) -> bool:
+    """目录中没有同参数的语料时生成语料，返回是否重新生成"""
+    output_dir = Path(output_dir)
+    manifest = output_dir / MANIFEST_NAME
+    if manifest.exists():
+        with open(manifest, 'r', encoding='utf-8') as f:
+            if json.load(f).get("spec") == spec.to_dict():
+                return False
+
+    if output_dir.exists():
+        # 参数变化时只清理由生成器创建的分类目录
+        for category in CATEGORIES:
+            for doc_type in DOC_TYPES:
+                directory = output_dir / category / doc_type
+                if directory.exists():
+                    for md_file in directory.glob('*.md'):
+                        md_file.unlink()
+
+    SyntheticCorpusGenerator(spec).generate(output_dir)
+    return True
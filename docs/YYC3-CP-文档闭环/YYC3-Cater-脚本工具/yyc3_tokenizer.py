@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+@file: yyc3_tokenizer.py
+@description: YYC³共享分词器 - 中文按字二元组（bigram）加用户词典切分，英文按单词切分，去停用词并把词驻留为整数ID
+@author: YYC³
+@version: 1.0.0
+@created: 2026-10-16
+@copyright: Copyright (c) 2026 YYC³
+@license: MIT
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+# 中日韩统一表意文字（含扩展A和兼容区）
+CJK_CHARS = '㐀-䶿一-鿿豈-﫿'
+
+# 英文单词（可带数字，及 C++、C# 的后缀）或连续的中文
+TOKEN_RE = re.compile(rf'([A-Za-z][A-Za-z0-9]*[+#]*)|([{CJK_CHARS}]+)')
+
+# 中文虚词：在这些字处切开，不产生跨虚词的二元组
+STOP_CHARS = '的与及之和或'
+_STOP_CHAR_RE = re.compile(f'[{STOP_CHARS}]')
+
+# 默认停用词（英文常用虚词和中文通用词）
+DEFAULT_STOP_WORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of', 'on', 'or',
+    'the', 'this', 'to', 'with',
+    '一个', '我们', '可以', '进行', '通过', '以及', '如果', '需要', '这个', '包括', '相关', '其中',
+    '主要', '以下', '如下', '部分', '内容', '具体', '用于', '对于', '已经', '没有',
+})
+
+# 默认用户词典：餐饮业务和技术领域的多字词，与二元组一起作为词元
+DOMAIN_TERMS = (
+    '餐饮', '门店', '菜品', '菜单', '订单', '点餐', '外卖', '配送', '厨房', '后厨', '收银', '会员', '营销',
+    '优惠券', '库存', '供应链', '采购', '支付', '结算', '对账', '桌台', '预订', '排队', '评价',
+    '微服务', '数据库', '缓存', '消息队列', '负载均衡', '网关', '容器', '容器化', '编排', '监控', '告警', '日志',
+    '链路追踪', '高可用', '可扩展', '可维护', '高性能', '安全性', '权限', '认证', '鉴权', '加密',
+    '接口', '前端', '后端', '全栈', '移动端', '小程序', '中台', '数据中台', '知识图谱', '推荐系统',
+    '架构设计', '系统架构', '技术架构', '部署', '持续集成', '持续交付', '自动化测试', '单元测试',
+    '集成测试', '性能测试', '压力测试', '性能优化', '灰度发布', '回滚', '运维', '版本管理', '文档闭环',
+)
+
+
+def load_user_terms(path: Path) -> List[str]:
+    """读取用户词典文件：每行一个词，# 开头的行为注释"""
+    terms = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            term = line.strip()
+            if term and not term.startswith('#'):
+                terms.append(term)
+    return terms
+
+
+class Tokenizer:
+    """
+    中英文混合分词器
+
+    连续中文先在虚词处切开，每段产出全部相邻两字的二元组，以及从各位置开始命中的用户词典词（三字及以上）；
+    英文按字母数字串切分（不依赖 \\b，中英文紧挨着时也能切开）。
+    词元按首次出现驻留为整数ID，同一分词器产出的ID可以在文档之间直接比较。
+    """
+
+    def __init__(self, user_terms: Iterable[str] = DOMAIN_TERMS,
+                 stop_words: Iterable[str] = DEFAULT_STOP_WORDS,
+                 lowercase: bool = True, min_length: int = 2):
+        """
+        Args:
+            user_terms: 用户词典
+            stop_words: 停用词（英文词按小写比较）
+            lowercase: 英文词是否转为小写
+            min_length: 英文词的最小长度
+        """
+        self.lowercase = lowercase
+        self.min_length = min_length
+        self.stop_words: Set[str] = {word.lower() if lowercase else word for word in stop_words}
+        self.vocabulary: Dict[str, int] = {}
+        self.id_to_token: List[str] = []
+        # 用户词典按前两个字索引，只在二元组命中时才检查长词
+        self._terms_by_prefix: Dict[str, List[str]] = {}
+        self.add_terms(user_terms)
+
+    def add_terms(self, terms: Iterable[str]):
+        """向用户词典添加词（两字词本身就是二元组，无需登记）"""
+        for term in terms:
+            if len(term) > 2 and term not in self._terms_by_prefix.get(term[:2], ()):
+                self._terms_by_prefix.setdefault(term[:2], []).append(term)
+        for candidates in self._terms_by_prefix.values():
+            candidates.sort(key=len)
+
+    def _cjk_tokens(self, run: str, output: List[str]):
+        stop_words = self.stop_words
+        prefixes = self._terms_by_prefix
+        for segment in _STOP_CHAR_RE.split(run) if _STOP_CHAR_RE.search(run) else (run,):
+            if len(segment) < 2:
+                continue
+            bigrams = list(map(str.__add__, segment[:-1], segment[1:]))
+            if not prefixes or prefixes.keys().isdisjoint(bigrams):
+                output.extend(bigram for bigram in bigrams if bigram not in stop_words)
+                continue
+            # 有词典词时按位置依次产出，保持文本顺序
+            for index, bigram in enumerate(bigrams):
+                if bigram not in stop_words:
+                    output.append(bigram)
+                for term in prefixes.get(bigram, ()):
+                    if segment.startswith(term, index) and term not in stop_words:
+                        output.append(term)
+
+    def tokens(self, text: str) -> List[str]:
+        """按文本顺序返回全部词元（含重复）"""
+        output: List[str] = []
+        stop_words = self.stop_words
+        for latin, cjk in TOKEN_RE.findall(text):
+            if latin:
+                if self.lowercase:
+                    latin = latin.lower()
+                if len(latin) >= self.min_length and latin not in stop_words:
+                    output.append(latin)
+            else:
+                self._cjk_tokens(cjk, output)
+        return output
+
+    def token_set(self, text: str) -> Set[str]:
+        """文本中出现的词元集合"""
+        return set(self.tokens(text))
+
+    def latin_words(self, text: str) -> List[str]:
+        """只返回英文词（按文本顺序，含重复）"""
+        output = []
+        for latin, _ in TOKEN_RE.findall(text):
+            if latin:
+                if self.lowercase:
+                    latin = latin.lower()
+                if len(latin) >= self.min_length and latin not in self.stop_words:
+                    output.append(latin)
+        return output
+
+    def intern(self, token: str) -> int:
+        """词元的整数ID（首次出现时分配）"""
+        token_id = self.vocabulary.get(token)
+        if token_id is None:
+            token_id = self.vocabulary[token] = len(self.id_to_token)
+            self.id_to_token.append(token)
+        return token_id
+
+    def token(self, token_id: int) -> str:
+        """整数ID对应的词元"""
+        return self.id_to_token[token_id]
+
+    def lookup(self, token: str) -> Optional[int]:
+        """已驻留词元的ID，未出现过时返回None（不分配新ID）"""
+        return self.vocabulary.get(token)
+
+    def encode(self, text: str) -> List[int]:
+        """文本中出现的词元ID（去重，按首次出现的顺序）"""
+        vocabulary = self.vocabulary
+        ids = []
+        for token in dict.fromkeys(self.tokens(text)):
+            token_id = vocabulary.get(token)
+            if token_id is None:
+                token_id = self.intern(token)
+            ids.append(token_id)
+        return ids
+
+    def encode_many(self, texts: Iterable[str]) -> List[List[int]]:
+        """批量编码多个文本"""
+        return [self.encode(text) for text in texts]
+
+    def __len__(self) -> int:
+        return len(self.id_to_token)